@@ -6,8 +6,15 @@ layout (location = 2) in vec2 aTexCoords;
 out vec2 TexCoords;
 
 uniform mat4 model;
-uniform mat4 view;
-uniform mat4 projection;
+
+layout (std140) uniform FrameData
+{
+    mat4 view;
+    mat4 projection;
+    vec4 lightPos;
+    vec4 viewPos;
+    vec4 lightColor;
+};
 
 void main()
 {
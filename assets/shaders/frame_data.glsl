@@ -0,0 +1,10 @@
+// Per-frame camera and light state, filled once per frame by
+// core.uniform_buffer.FrameUniforms (std140 layout must match)
+layout (std140) uniform FrameData
+{
+    mat4 view;
+    mat4 projection;
+    vec4 lightPos;
+    vec4 viewPos;
+    vec4 lightColor;
+};
@@ -4,15 +4,22 @@ out vec4 FragColor;
 in vec3 FragPos;
 in vec3 Normal;
 in vec2 TexCoords;
+in vec3 VertexColor;
+#ifdef INSTANCED
+flat in vec3 InstanceColor;  // Per-instance objectColor
+#endif
 
+#ifdef TEXTURE_ARRAY
+uniform sampler2DArray texture_diffuse1;
+uniform float textureLayer;
+#else
 uniform sampler2D texture_diffuse1;
-uniform vec3 lightPos;
-uniform vec3 viewPos;
-uniform vec3 lightColor;
-uniform bool useTexture;
+#endif
 uniform vec3 objectColor;
 uniform float time;
 
+#include "frame_data.glsl"
+
 void main()
 {
     vec3 goldenLight = vec3(1.0, 0.8, 0.6);
@@ -22,25 +29,33 @@ void main()
     vec3 ambient = ambientStrength * goldenLight;
     
     vec3 norm = normalize(Normal);
-    vec3 lightDir = normalize(lightPos - FragPos);
+    vec3 lightDir = normalize(lightPos.xyz - FragPos);
     float diff = max(dot(norm, lightDir), 0.0);
     vec3 diffuse = diff * goldenLight;
     
     float specularStrength = 0.3;
-    vec3 viewDir = normalize(viewPos - FragPos);
+    vec3 viewDir = normalize(viewPos.xyz - FragPos);
     vec3 reflectDir = reflect(-lightDir, norm);
     float spec = pow(max(dot(viewDir, reflectDir), 0.0), 32.0);
     vec3 specular = specularStrength * spec * goldenLight;
     
-    vec3 result;
-    if(useTexture) {
-        vec4 textureColor = texture(texture_diffuse1, TexCoords);
-        result = (ambient + diffuse + specular) * textureColor.rgb;
-    } else {
-        // USE OBJECT COLOR from uniform
-        vec3 baseColor = objectColor * vec3(1.1, 1.0, 0.9);
-        result = (ambient + diffuse + specular) * baseColor;
-    }
+    // Material variant is chosen when the program is built (see ShaderVariants)
+#ifdef TEXTURED
+#ifdef TEXTURE_ARRAY
+    vec4 textureColor = texture(texture_diffuse1, vec3(TexCoords, textureLayer));
+#else
+    vec4 textureColor = texture(texture_diffuse1, TexCoords);
+#endif
+    vec3 result = (ambient + diffuse + specular) * textureColor.rgb * VertexColor;
+#else
+    // USE OBJECT COLOR from uniform (or from the instance)
+#ifdef INSTANCED
+    vec3 baseColor = InstanceColor * VertexColor * vec3(1.1, 1.0, 0.9);
+#else
+    vec3 baseColor = objectColor * VertexColor * vec3(1.1, 1.0, 0.9);
+#endif
+    vec3 result = (ambient + diffuse + specular) * baseColor;
+#endif
     
     FragColor = vec4(result, 1.0);
 }
\ No newline at end of file
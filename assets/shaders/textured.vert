@@ -2,20 +2,36 @@
 layout (location = 0) in vec3 aPos;
 layout (location = 1) in vec3 aNormal;
 layout (location = 2) in vec2 aTexCoords;
+layout (location = 3) in vec4 aColor;  // White unless the mesh's vertex format has colours
+#ifdef INSTANCED
+layout (location = 4) in mat4 aInstanceModel;  // Locations 4-7, one per column
+layout (location = 8) in vec4 aInstanceColor;
+#endif
 
 out vec3 FragPos;
 out vec3 Normal;
 out vec2 TexCoords;
+out vec3 VertexColor;
+#ifdef INSTANCED
+flat out vec3 InstanceColor;
+#endif
 
 uniform mat4 model;
-uniform mat4 view;
-uniform mat4 projection;
+
+#include "frame_data.glsl"
 
 void main()
 {
-    FragPos = vec3(model * vec4(aPos, 1.0));
-    Normal = mat3(transpose(inverse(model))) * aNormal;
+#ifdef INSTANCED
+    mat4 modelMatrix = aInstanceModel;
+    InstanceColor = aInstanceColor.rgb;
+#else
+    mat4 modelMatrix = model;
+#endif
+    FragPos = vec3(modelMatrix * vec4(aPos, 1.0));
+    Normal = mat3(transpose(inverse(modelMatrix))) * aNormal;
     TexCoords = aTexCoords;
+    VertexColor = aColor.rgb;
     
     gl_Position = projection * view * vec4(FragPos, 1.0);
 }
\ No newline at end of file
@@ -5,36 +5,39 @@ in vec3 FragPos;
 in vec3 Normal;
 in vec2 TexCoords;
 
-uniform vec3 lightPos;
-uniform vec3 viewPos;
-uniform vec3 lightColor;
 uniform float time;
+#ifdef TEXTURE_ARRAY
+uniform sampler2DArray texture0;
+uniform float textureLayer;
+#else
 uniform sampler2D texture0;
-uniform bool useTexture;
+#endif
+
+#include "frame_data.glsl"
 
 void main()
 {
     // Water base color - either from texture or hardcoded blue
-    vec3 waterBaseColor;
-    if (useTexture)
-    {
-        waterBaseColor = texture(texture0, TexCoords).rgb;
-    }
-    else
-    {
-        waterBaseColor = vec3(0.1, 0.6, 0.95); // Deep blue-cyan
-    }
+#ifdef WATER_TEXTURED
+#ifdef TEXTURE_ARRAY
+    vec3 waterBaseColor = texture(texture0, vec3(TexCoords, textureLayer)).rgb;
+#else
+    vec3 waterBaseColor = texture(texture0, TexCoords).rgb;
+#endif
+#else
+    vec3 waterBaseColor = vec3(0.1, 0.6, 0.95); // Deep blue-cyan
+#endif
     
     // Ambient light
     float ambient = 0.5;
     
     // Diffuse lighting
     vec3 norm = normalize(Normal);
-    vec3 lightDir = normalize(lightPos - FragPos);
+    vec3 lightDir = normalize(lightPos.xyz - FragPos);
     float diffuse = max(dot(norm, lightDir), 0.0) * 0.6;
     
     // Specular highlights for water reflections
-    vec3 viewDir = normalize(viewPos - FragPos);
+    vec3 viewDir = normalize(viewPos.xyz - FragPos);
     vec3 reflectDir = reflect(-lightDir, norm);
     float specular = pow(max(dot(viewDir, reflectDir), 0.0), 64.0) * 0.8;
     
@@ -42,7 +45,7 @@ void main()
     float wave_effect = sin(TexCoords.x * 3.0 + time * 0.5) * 0.05;
     
     // Combine all effects
-    vec3 result = waterBaseColor * (ambient + diffuse) + lightColor * specular;
+    vec3 result = waterBaseColor * (ambient + diffuse) + lightColor.rgb * specular;
     result += wave_effect * 0.1;
     
     FragColor = vec4(result, 0.85);  // Slightly transparent water
@@ -8,10 +8,10 @@ out vec3 Normal;
 out vec2 TexCoords;
 
 uniform mat4 model;
-uniform mat4 view;
-uniform mat4 projection;
 uniform float time;
 
+#include "frame_data.glsl"
+
 void main()
 {
     // Wave animation - increased amplitude for more wavy appearance
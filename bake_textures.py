@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Bake the procedural texture files in assets/textures.
+
+Every texture comes from a NumPy kernel in utils.procedural_textures and is
+baked on a process pool. Resolution and seed can be set for all textures
+or per texture:
+
+    python bake_textures.py                        # the default set at default sizes
+    python bake_textures.py rock snow --size 4096  # only rock and snow, 4096x4096
+    python bake_textures.py --size 2048 --size rock=4096 --seed grass=7
+
+A texture is skipped when its file is unchanged since the last bake and the
+size, seed and kernel code are the same (recorded in a manifest next to the
+images); --force bakes everything again.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import utils.procedural_textures
+from utils.atomic_write import atomic_write
+from utils.procedural_textures import ProceduralTextures
+from PIL import Image
+
+# The textures the old create_textures.py and create_mountain_textures.py scripts wrote
+DEFAULT_TEXTURES = ["grass", "road", "water", "concrete", "rock", "snow"]
+MANIFEST_NAME = ".bake_manifest.json"
+
+
+def parse_size(value):
+    """'2048' -> (2048, 2048), '2048x1024' -> (2048, 1024)."""
+    width, _, height = value.lower().partition("x")
+    return int(width), int(height or width)
+
+
+def per_texture(values, names, parse):
+    """Resolve repeated NAME=VALUE / VALUE options into {name: parsed value}."""
+    settings = {}
+    # Global values first, so per-texture ones win whatever the order on the command line
+    for value in sorted(values, key=lambda value: "=" in value):
+        name, _, setting = value.rpartition("=")
+        if name and name not in names:
+            raise SystemExit(f"❌ {name} is not being baked")
+        for target in ([name] if name else names):
+            settings[target] = parse(setting)
+    return settings
+
+
+def kernel_fingerprint():
+    """Hash of the kernel module, so editing a generator bakes its textures again."""
+    with open(utils.procedural_textures.__file__, 'rb') as file:
+        return hashlib.sha1(file.read()).hexdigest()
+
+
+def load_manifest(output_dir):
+    try:
+        with open(os.path.join(output_dir, MANIFEST_NAME)) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(output_dir, manifest):
+    with atomic_write(os.path.join(output_dir, MANIFEST_NAME), 'w') as file:
+        json.dump(manifest, file, indent=2, sort_keys=True)
+
+
+def is_up_to_date(entry, inputs, path):
+    """True if path was written by a bake with the same inputs and has not been touched since."""
+    if entry is None or entry.get("inputs") != inputs:
+        return False
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return False
+    return entry.get("size") == stat.st_size and entry.get("mtime_ns") == stat.st_mtime_ns
+
+
+def bake_one(name, width, height, seed, path):
+    """Generate one texture and write it to path (runs in a worker process)."""
+    start = time.perf_counter()
+    pixels = ProceduralTextures.generate(name, width, height, seed)
+    with atomic_write(path) as file:
+        Image.fromarray(pixels).save(file, format="PNG")
+    return time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bake procedural textures into image files.")
+    parser.add_argument("names", nargs="*", metavar="TEXTURE",
+                        help=f"textures to bake (default: {' '.join(DEFAULT_TEXTURES)}; "
+                             f"available: {' '.join(ProceduralTextures.GENERATORS)})")
+    parser.add_argument("--size", action="append", default=[], metavar="[NAME=]WxH",
+                        help="resolution, for every texture or just NAME (repeatable)")
+    parser.add_argument("--seed", action="append", default=[], metavar="[NAME=]SEED",
+                        help="random seed, for every random texture or just NAME (repeatable, default 0)")
+    parser.add_argument("--output", default="assets/textures", help="output directory")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--force", action="store_true", help="bake even if the output is up to date")
+    args = parser.parse_args(argv)
+    
+    names = args.names or DEFAULT_TEXTURES
+    unknown = [name for name in names if name not in ProceduralTextures.GENERATORS]
+    if unknown:
+        raise SystemExit(f"❌ Unknown textures: {' '.join(unknown)}")
+    sizes = per_texture(args.size, names, parse_size)
+    seeds = per_texture(args.seed, names, int)
+    for value in args.seed:
+        name = value.rpartition("=")[0]
+        if name and not ProceduralTextures.takes_seed(name):
+            raise SystemExit(f"❌ {name} is not random and takes no seed")
+    
+    os.makedirs(args.output, exist_ok=True)
+    manifest = load_manifest(args.output)
+    fingerprint = kernel_fingerprint()
+    
+    jobs = []
+    for name in names:
+        _, default_width, default_height = ProceduralTextures.GENERATORS[name]
+        width, height = sizes.get(name, (default_width, default_height))
+        seed = seeds.get(name, 0) if ProceduralTextures.takes_seed(name) else None
+        path = os.path.join(args.output, f"{name}.png")
+        inputs = {"width": width, "height": height, "seed": seed, "kernels": fingerprint}
+        if not args.force and is_up_to_date(manifest.get(name), inputs, path):
+            print(f"   {name}.png ({width}x{height}) up to date")
+            continue
+        jobs.append((name, width, height, seed, path, inputs))
+    
+    if not jobs:
+        print("✅ All textures up to date")
+        return
+    
+    start = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=max(1, min(args.jobs, len(jobs)))) as pool:
+            futures = [(job, pool.submit(bake_one, *job[:5])) for job in jobs]
+            for (name, width, height, seed, path, inputs), future in futures:
+                seconds = future.result()
+                stat = os.stat(path)
+                manifest[name] = {"inputs": inputs, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+                seeded = "" if seed is None else f", seed {seed}"
+                print(f"   {name}.png ({width}x{height}{seeded}) baked in {seconds * 1000:.0f} ms")
+    finally:
+        # Keep the textures that did finish when one of them fails
+        save_manifest(args.output, manifest)
+    
+    print(f"✅ Baked {len(jobs)} textures into {args.output} in "
+          f"{(time.perf_counter() - start) * 1000:.0f} ms")
+
+if __name__ == "__main__":
+    main()
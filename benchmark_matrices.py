@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: cost of turning a glm matrix into data for glUniformMatrix4fv.
+
+Compares the old element-by-element conversion with the matrix interop
+helpers in utils.transformations. Runs without an OpenGL context.
+"""
+
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from utils.transformations import glm_to_array, matrix_bytes, create_model_matrix
+
+ITERATIONS = 20000
+
+
+def legacy_glm_to_array(matrix):
+    """The previous conversion: 16 Python-level element copies into a new array."""
+    arr = np.zeros(16, dtype=np.float32)
+    for i in range(4):
+        for j in range(4):
+            arr[i*4 + j] = matrix[i][j]
+    return arr
+
+
+def per_matrix_us(func, matrix):
+    """Average microseconds per call."""
+    return timeit.timeit(lambda: func(matrix), number=ITERATIONS) / ITERATIONS * 1e6
+
+
+def main():
+    matrix = create_model_matrix(position=(1.0, 2.0, 3.0), rotation=(10.0, 20.0, 30.0), scale=(2.0, 2.0, 2.0))
+    
+    # All paths must produce the same column-major data
+    expected = legacy_glm_to_array(matrix)
+    assert np.array_equal(glm_to_array(matrix), expected)
+    assert np.array_equal(np.frombuffer(matrix_bytes(matrix), dtype=np.float32), expected)
+    
+    legacy = per_matrix_us(legacy_glm_to_array, matrix)
+    print(f"Per-matrix conversion cost ({ITERATIONS} iterations):")
+    print(f"  legacy element loop      : {legacy:7.3f} us")
+    for label, func in (("glm_to_array", glm_to_array), ("matrix_bytes (set_mat4)", matrix_bytes)):
+        cost = per_matrix_us(func, matrix)
+        print(f"  {label:<25}: {cost:7.3f} us  ({legacy / cost:.1f}x faster)")
+    
+    build = per_matrix_us(lambda m: create_model_matrix(position=(1.0, 2.0, 3.0)), matrix)
+    print(f"  create_model_matrix      : {build:7.3f} us  (no conversion step)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark: wall time spent loading the scene's textures.
+
+"before" decodes and uploads each texture in turn on the main thread, the
+way objects used to load them. "after" decodes every texture on a thread
+pool first (TextureRegistry.prefetch) and only uploads on the main thread.
+Uploads need an OpenGL context; without one (e.g. no display) only the
+decoding part is compared.
+"""
+
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from core.texture import Texture, TextureRegistry, decode_texture_file, collect_texture_paths
+from objects.terrain import Terrain
+from objects.house import AdvancedHouse
+from objects.roof import PyramidRoof
+from objects.bridge import Bridge
+from objects.road import Road
+from objects.car import ProceduralCar
+from objects.water import Water
+from objects.advanced_mountain import AdvancedMountain
+from objects.advanced_tree import AdvancedTree
+from objects.log import Log
+from objects.christmas_tree import ChristmasTree
+from objects.clouds import CloudSystem
+from objects.smoke import SmokeSystem
+
+SCENE_CLASSES = (Terrain, AdvancedHouse, PyramidRoof, Bridge, Road, ProceduralCar, Water,
+                 AdvancedMountain, AdvancedTree, Log, ChristmasTree, CloudSystem, SmokeSystem)
+
+
+def create_hidden_context():
+    """Create an invisible window so textures can be uploaded; None if unavailable."""
+    try:
+        import glfw
+        if not glfw.init():
+            return None
+        glfw.window_hint(glfw.VISIBLE, glfw.FALSE)
+        glfw.window_hint(glfw.CONTEXT_VERSION_MAJOR, 3)
+        glfw.window_hint(glfw.CONTEXT_VERSION_MINOR, 3)
+        glfw.window_hint(glfw.OPENGL_PROFILE, glfw.OPENGL_CORE_PROFILE)
+        glfw.window_hint(glfw.OPENGL_FORWARD_COMPAT, True)
+        window = glfw.create_window(64, 64, "benchmark", None, None)
+        if not window:
+            glfw.terminate()
+            return None
+        glfw.make_context_current(window)
+        return window
+    except Exception:
+        return None
+
+
+def time_sequential(paths, upload):
+    """Decode (and upload) each texture in turn on this thread."""
+    start = time.perf_counter()
+    for path in paths:
+        pixels = decode_texture_file(path)
+        if upload:
+            Texture(image=pixels).delete()
+    return time.perf_counter() - start
+
+
+def time_prefetched(paths, upload):
+    """Decode on the thread pool, then upload on this thread."""
+    start = time.perf_counter()
+    TextureRegistry.prefetch(paths)
+    if upload:
+        for path in paths:
+            TextureRegistry.release(TextureRegistry.acquire(path))
+    TextureRegistry.release_all()
+    return time.perf_counter() - start
+
+
+def main():
+    paths = [path for path in collect_texture_paths(SCENE_CLASSES) if os.path.exists(path)]
+    print(f"Scene textures found: {len(paths)} (threads available: {os.cpu_count()})")
+    
+    window = create_hidden_context()
+    upload = window is not None
+    if not upload:
+        print("No OpenGL context available - timing decoding only")
+    
+    # Warm the OS file cache so both runs read from memory
+    for path in paths:
+        decode_texture_file(path)
+    
+    before = time_sequential(paths, upload)
+    after = time_prefetched(paths, upload)
+    
+    label = "decode + upload" if upload else "decode"
+    print(f"Texture loading wall time ({label}):")
+    print(f"  before (sequential, main thread): {before * 1000:8.1f} ms")
+    print(f"  after  (parallel decode)        : {after * 1000:8.1f} ms  ({before / after:.2f}x)")
+    
+    if window is not None:
+        import glfw
+        glfw.destroy_window(window)
+        glfw.terminate()
+
+if __name__ == "__main__":
+    main()
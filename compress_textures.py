@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Bake the images in assets/textures to BC1/BC3 block-compressed mip chains.
+
+The application loads these instead of the PNGs when the GPU supports S3TC
+(see TEXTURE_COMPRESSION in config.py), so textures are uploaded with
+glCompressedTexImage2D and take 4-6x less memory and upload bandwidth.
+Encoding is pure NumPy (utils.block_compression) and runs on a process
+pool; textures whose entry is still valid for the source image are skipped.
+
+    python compress_textures.py                    # every image in assets/textures
+    python compress_textures.py assets/textures/grass.png --output /tmp/bc
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from config import COMPRESSED_TEXTURE_DIR, TEXTURE_CACHE_DIR
+from core.texture_cache import CompressedTextureCache, TextureCache
+from core.texture import decode_texture_file, mip_chain_bytes
+from utils.block_compression import decompress
+
+
+def compress_one(path, output_dir, force):
+    """Bake one image (runs in a worker process); returns None if it was up to date."""
+    raw_cache = TextureCache(TEXTURE_CACHE_DIR) if TEXTURE_CACHE_DIR else None
+    cache = CompressedTextureCache(output_dir, raw_cache)
+    if not force and cache.load(path) is not None:
+        return None
+    
+    start = time.perf_counter()
+    image = cache.build(path)
+    seconds = time.perf_counter() - start
+    
+    # Quality of level 0 against the source pixels
+    pixels = decode_texture_file(path)
+    decoded = decompress(image[0], image.width, image.height, image.format)
+    error = np.mean((pixels.astype(np.float32) - decoded[..., :pixels.shape[2]]) ** 2)
+    psnr = 10 * np.log10(255 ** 2 / error) if error > 0 else float("inf")
+    raw_bytes = mip_chain_bytes(image.width, image.height, image.channels)
+    return image.format, image.width, image.height, image.size_bytes, raw_bytes, psnr, seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bake textures to BC1/BC3 compressed mip chains.")
+    parser.add_argument("images", nargs="*", help="image files (default: every PNG/JPG in assets/textures)")
+    parser.add_argument("--output", default=COMPRESSED_TEXTURE_DIR, help="directory for the compressed entries")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--force", action="store_true", help="encode even if an entry is up to date")
+    args = parser.parse_args()
+    
+    images = args.images or sorted(glob.glob("assets/textures/*.png") + glob.glob("assets/textures/*.jpg"))
+    if not images:
+        print("❌ No images to compress")
+        return
+    
+    start = time.perf_counter()
+    compressed = 0
+    with ProcessPoolExecutor(max_workers=max(1, min(args.jobs, len(images)))) as pool:
+        futures = [(path, pool.submit(compress_one, path, args.output, args.force)) for path in images]
+        for path, future in futures:
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"❌ {path}: {e}")
+                continue
+            if result is None:
+                print(f"   {path} up to date")
+                continue
+            
+            format, width, height, size, raw_bytes, psnr, seconds = result
+            compressed += 1
+            print(f"   {path}: {format.upper()} {width}x{height}, {size / 1024:.0f} KB "
+                  f"({raw_bytes / size:.1f}x smaller), PSNR {psnr:.1f} dB, {seconds * 1000:.0f} ms")
+    
+    print(f"✅ Compressed {compressed} of {len(images)} textures into {args.output} in "
+          f"{time.perf_counter() - start:.1f} s")
+
+if __name__ == "__main__":
+    main()
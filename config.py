@@ -2,6 +2,8 @@
 Configuration settings.
 """
 
+import os
+
 # Window
 WINDOW_WIDTH = 1200
 WINDOW_HEIGHT = 800
@@ -26,3 +28,55 @@ CAMERA_SPEED = 5.0
 FOV = 45.0
 NEAR_PLANE = 0.1
 FAR_PLANE = 100.0
+
+# Record the draws of objects that never move (terrain, road, bridge, house, mountains, trees, logs)
+# once and submit them with glMultiDrawElementsIndirect, or a tight loop without GL 4.3
+STATIC_DRAW_LIST = True
+
+# Draw mountains, trees, Christmas tree cones and car wheels with simplified meshes when they are
+# small on screen (levels are generated at startup)
+MESH_LOD = True
+
+# Shade the mountains with normals averaged from their slopes instead of the flat up normal
+# they were designed with (brighter, more shaded slopes)
+SMOOTH_MOUNTAIN_NORMALS = False
+
+# Christmas trees in the forest left of the river; drawn instanced, so tens of thousands are cheap
+CHRISTMAS_TREE_COUNT = int(os.environ.get("RIVERVIEW_CHRISTMAS_TREES", 100))
+
+# Skip mountains, trees, Christmas tree parts, cars, logs and clouds outside the view frustum
+FRUSTUM_CULLING = True
+
+# Directory for cached shader program binaries; None compiles from source every launch
+SHADER_CACHE_DIR = os.environ.get("RIVERVIEW_SHADER_CACHE")
+
+# Directory for decoded textures with pre-built mip chains; None decodes the PNGs every launch
+TEXTURE_CACHE_DIR = os.environ.get("RIVERVIEW_TEXTURE_CACHE")
+
+# Directory for generated mesh vertices, indices and LOD levels; None regenerates them every launch
+# (identical meshes are still only generated once per launch)
+MESH_CACHE_DIR = os.environ.get("RIVERVIEW_MESH_CACHE")
+
+# Use BC1/BC3 textures baked by compress_textures.py when the GPU supports S3TC; textures
+# without a baked entry are uploaded uncompressed
+TEXTURE_COMPRESSION = True
+COMPRESSED_TEXTURE_DIR = os.environ.get("RIVERVIEW_COMPRESSED_TEXTURES", "assets/textures/compressed")
+
+# Pack same-sized textures into GL_TEXTURE_2D_ARRAY layers (fewer texture binds per frame)
+TEXTURE_ARRAYS = True
+
+# GPU memory for textures in MB; over it, least recently used textures lose mip levels or
+# are unloaded until needed again. None keeps every texture resident at full resolution
+TEXTURE_BUDGET_MB = os.environ.get("RIVERVIEW_TEXTURE_BUDGET_MB")
+
+# Threads decoding textures at startup; None picks a default, 0 decodes each texture on first use
+TEXTURE_DECODE_THREADS = None
+
+# Benchmark flythrough (main.py --benchmark): simulated seconds per frame and unmeasured frames at the start
+BENCHMARK_TIMESTEP = 1.0 / 60.0
+BENCHMARK_WARMUP_FRAMES = 30
+
+# Debug
+RENDER_STATS = False  # Print per-frame render statistics
+RENDER_STATS_INTERVAL = 120  # Frames averaged per report
+GPU_RESOURCE_DEBUG = False  # List GL objects leaked at shutdown and GPU allocations made during frames
@@ -1,20 +1,39 @@
 #!/usr/bin/env python3
 """
 Main entry point.
+
+    python main.py                                                # fly around interactively
+    python main.py --record assets/camera_paths/mine.json         # ... and save the camera path
+    python main.py --benchmark assets/camera_paths/flythrough.json --output benchmark.json
 """
 
+import argparse
 import sys
 import os
 
 # Add src to path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
+from config import BENCHMARK_TIMESTEP, BENCHMARK_WARMUP_FRAMES
 from core.application import Application
+from core.benchmark import Benchmark
+from core.camera_path import CameraPath
 
 def main():
+    parser = argparse.ArgumentParser(description="Riverside landscape 3D scene.")
+    parser.add_argument("--benchmark", metavar="PATH",
+                        help="fly along a recorded or scripted camera path and write frame timings")
+    parser.add_argument("--output", default="benchmark.json", help="JSON file for the benchmark results")
+    parser.add_argument("--record", metavar="PATH", help="save the camera path flown to PATH on exit")
+    args = parser.parse_args()
+    
     try:
-        app = Application()
-        app.run()
+        benchmark = None
+        if args.benchmark:
+            benchmark = Benchmark(CameraPath.load(args.benchmark), BENCHMARK_TIMESTEP, BENCHMARK_WARMUP_FRAMES)
+        app = Application(benchmark=benchmark, benchmark_output=args.output, record_path=args.record)
+        if not app.run():
+            return 1
     except Exception as e:
         print(f"Error: {e}")
         import traceback
@@ -23,4 +42,4 @@ def main():
     return 0
 
 if __name__ == "__main__":
-    sys.exit(main())
\ No newline at end of file
+    sys.exit(main())
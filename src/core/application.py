@@ -9,8 +9,16 @@ import random
 import math
 import glm
 from config import *
-from core.shader import Shader
+from core.shader import ShaderVariants
+from core.shader_cache import ProgramBinaryCache
 from core.camera import Camera
+from core.gpu_resources import GpuResources
+from core.texture import Texture, TextureRegistry, collect_texture_paths, s3tc_supported
+from core.texture_cache import CompressedTextureCache, TextureCache
+from core.texture_array import build_texture_arrays
+from core.texture_residency import TextureResidency
+from core.uniform_buffer import FrameUniforms
+from rendering.vertex_format import set_default_color
 from objects.terrain import Terrain
 from objects.house import AdvancedHouse
 from objects.roof import PyramidRoof
@@ -22,17 +30,31 @@ from objects.log import Log
 from objects.water import Water
 from objects.mountain import Mountain
 from objects.advanced_mountain import AdvancedMountain
-from objects.christmas_tree import ChristmasTree
+from objects.christmas_tree import ChristmasForest, ChristmasTree
 from objects.clouds import CloudSystem
 from objects.smoke import SmokeSystem
 from objects.ship import Ship
-from utils.transformations import create_projection_matrix, create_projection_matrix_from_camera
+from rendering.buffer_arena import BufferArena
+from rendering.lod import LodMesh
+from rendering.mesh import Mesh
+from rendering.mesh_cache import MeshCache
+from rendering.mesh_tools import MeshIndexingReport
+from rendering.static_draw_list import StaticDrawList
+from utils.procedural_textures import ProceduralTextures
+from utils.transformations import create_projection_matrix
 
 class Application:
-    def __init__(self):
+    def __init__(self, benchmark=None, benchmark_output=None, record_path=None):
+        """benchmark: a core.benchmark.Benchmark to run instead of the interactive loop, with its
+        results written to benchmark_output; record_path: file to save the camera path flown to."""
+        self.benchmark = benchmark
+        self.benchmark_output = benchmark_output
+        self.record_path = record_path
         self.window = None
         self.running = True
         self.shader = None
+        self.water_shader = None
+        self.frame_uniforms = None
         self.terrain = None
         self.house = None
         self.roof = None
@@ -44,10 +66,15 @@ class Application:
         self.logs = []
         self.water = None
         self.mountains = []
-        self.christmas_trees = []
+        self.christmas_forest = None
         self.cloud_system = None
         self.smoke_system = None
         self.ship = None
+        self.static_draws = None
+        
+        # House and roof positions (the smoke system's chimney matches them)
+        self.house_position = (5.0, -0.25, 0.0)
+        self.roof_position = (5.0, 0.55, 0.0)
         
         # Mouse handling
         self.first_mouse = True
@@ -55,20 +82,38 @@ class Application:
         self.last_y = WINDOW_HEIGHT / 2
         self.last_frame = 0.0
         
+        # Time of the frame being drawn (simulated in benchmark mode)
+        self.current_time = 0.0
+        
         # Track pressed keys
         self.keys_pressed = set()
         
+        # Frames accumulated for the next render stats report
+        self.stats_frames = 0
+        
+        # Frustum of the frame being drawn (None with culling off) and its object counts
+        self.frustum = None
+        self.objects_drawn = 0
+        self.objects_culled = 0
+        self.stats_drawn = 0
+        self.stats_culled = 0
+        
+        
     def run(self):
-        """Main application loop."""
+        """Main application loop. Returns False if initialization failed or a benchmark measured nothing."""
         print("Starting application...")
         if not self._initialize():
             print("Initialization failed!")
-            return
+            return False
         
         print("Entering main loop...")
         self._main_loop()
+        success = True
+        if self.benchmark:
+            success = self._write_benchmark()
         self._shutdown()
         print("Application closed successfully.")
+        return success
     
     def _initialize(self):
         """Initialize GLFW and OpenGL."""
@@ -105,19 +150,77 @@ class Application:
         gl.glEnable(gl.GL_BLEND)
         gl.glBlendFunc(gl.GL_SRC_ALPHA, gl.GL_ONE_MINUS_SRC_ALPHA)
         gl.glClearColor(*BACKGROUND_COLOR)
+        set_default_color()
+        
+        # Simplified mesh levels are only generated with MESH_LOD on
+        LodMesh.enabled = MESH_LOD
+        AdvancedMountain.smooth_normals = SMOOTH_MOUNTAIN_NORMALS
+        # Procedural meshes are generated once per launch, or once per MESH_CACHE_DIR
+        Mesh.cache = MeshCache(MESH_CACHE_DIR)
+        GpuResources.debug = GPU_RESOURCE_DEBUG
+        
+        if self.benchmark:
+            # Same scene every run; don't wait for vsync so frame times are the real cost
+            random.seed(0)
+            np.random.seed(0)
+            glfw.swap_interval(0)
         
         # Load shaders and objects
         try:
-            # Load main shader for most objects
-            self.shader = Shader("assets/shaders/textured.vert", "assets/shaders/textured.frag")
+            # Optional on-disk cache of linked programs (skips recompiling on later launches)
+            binary_cache = None
+            if SHADER_CACHE_DIR:
+                binary_cache = ProgramBinaryCache(SHADER_CACHE_DIR)
+                if not binary_cache.is_supported():
+                    print("⚠️  Program binaries not supported by driver, compiling shaders from source")
+                    binary_cache = None
+            
+            # Load main shader for most objects (textured/untextured variants)
+            self.shader = ShaderVariants("assets/shaders/textured.vert", "assets/shaders/textured.frag", binary_cache)
             print(f"Main shader loaded: program {self.shader.program_id}")
             
             # Load WATER SHADER - separate from main shader
-            self.water_shader = Shader("assets/shaders/water.vert", "assets/shaders/water.frag")
+            self.water_shader = ShaderVariants("assets/shaders/water.vert", "assets/shaders/water.frag", binary_cache,
+                                               textured_define="WATER_TEXTURED", sampler_name="texture0")
             print(f"Water shader loaded: program {self.water_shader.program_id}")
             
+            # Per-frame camera/light block shared by both programs
+            self.frame_uniforms = FrameUniforms()
+            self.frame_uniforms.bind_to(self.shader)
+            self.frame_uniforms.bind_to(self.water_shader)
+            
+            # Decoded textures and mip chains kept on disk between launches
+            if TEXTURE_CACHE_DIR:
+                Texture.cache = TextureCache(TEXTURE_CACHE_DIR)
+                ProceduralTextures.cache_dir = TEXTURE_CACHE_DIR
+            # Block-compressed textures baked offline, where the GPU can sample them
+            if TEXTURE_COMPRESSION and COMPRESSED_TEXTURE_DIR:
+                if s3tc_supported():
+                    Texture.compressed_cache = CompressedTextureCache(COMPRESSED_TEXTURE_DIR)
+                else:
+                    print("⚠️  S3TC texture compression not supported, uploading textures uncompressed")
+            if TEXTURE_BUDGET_MB:
+                TextureResidency.budget_bytes = int(float(TEXTURE_BUDGET_MB) * 1024 * 1024)
+            
+            # Decode every texture the scene uses up front, in parallel
+            scene_classes = (Terrain, AdvancedHouse, PyramidRoof, Bridge, Road, ProceduralCar, Water,
+                             AdvancedMountain, AdvancedTree, Log, ChristmasTree, CloudSystem, SmokeSystem)
+            texture_paths = collect_texture_paths(scene_classes)
+            if TEXTURE_DECODE_THREADS != 0:
+                TextureRegistry.prefetch(texture_paths, TEXTURE_DECODE_THREADS)
+            
+            # Pack same-sized textures into array layers so draws switch layers instead of binds
+            if TEXTURE_ARRAYS and build_texture_arrays(texture_paths):
+                self.shader.enable_texture_arrays()
+                self.water_shader.enable_texture_arrays()
+            
+            # The Christmas forest draws with the instanced variants of the main shader
+            self.shader.enable_instancing()
+            
             # Create objects
-            self.camera = Camera()
+            self.camera = Camera(WINDOW_WIDTH / WINDOW_HEIGHT, NEAR_PLANE, FAR_PLANE)
+            # The framebuffer can differ from the requested window size (HiDPI, window managers)
+            self.camera.set_viewport(*glfw.get_framebuffer_size(self.window))
             self.terrain = Terrain(self.shader) 
             self.house = AdvancedHouse(self.shader)
             self.roof = PyramidRoof(self.shader)
@@ -189,22 +292,21 @@ class Application:
                 log_y = 0.5  # At middle of tree
                 log_pos = (tree_pos[0], log_y, tree_pos[2])
                 self.logs.append((log, log_pos, 0.0))
+            for tree, tree_pos in zip(self.trees, tree_positions):
+                tree.position = tree_pos
             
             # Create Christmas tree forest filling empty GROUND on left side of river
-            self.christmas_trees = []
             # Fill the flat ground areas between mountains and river on left side
             random.seed(42)  # For consistent placement
+            positions, scales = [], []
             
             # Ground area between left mountains and river (X: -8 to -11, Z: -10 to 8)
-            for i in range(100):
+            for i in range(CHRISTMAS_TREE_COUNT):
                 x = -8.5 - random.uniform(0, 3)  # Between mountains and river (X: -8.5 to -11.5)
                 z = -10.0 + random.uniform(-5, 15)  # Safe ground area (Z: -15 to 5)
-                tree = ChristmasTree(self.shader)
-                self.christmas_trees.append({
-                    'tree': tree,
-                    'position': (x, -0.25, z),
-                    'scale': 0.4 + random.uniform(0, 0.9)  # Random height scale 0.4 to 1.3
-                })
+                positions.append((x, -0.25, z))
+                scales.append(0.4 + random.uniform(0, 0.9))  # Random height scale 0.4 to 1.3
+            self.christmas_forest = ChristmasForest(self.shader, positions, scales)
             
             # Create cloud system for dynamic sky
             self.cloud_system = CloudSystem(self.shader, num_clouds=8)
@@ -214,6 +316,10 @@ class Application:
             
             # Create ship on the river (river center is at X=-3.0, Y slightly above water)
             self.ship = Ship(self.shader, position=(-3.0, 0.1, 0.0))
+            
+            # Objects that never move are recorded once and submitted together every frame
+            if STATIC_DRAW_LIST:
+                self._build_static_draws()
                 
         except Exception as e:
             print(f"Initialization error: {e}")
@@ -221,28 +327,106 @@ class Application:
             traceback.print_exc()
             return False
         
+        TextureRegistry.report()
+        MeshIndexingReport.report()
+        LodMesh.report()
+        BufferArena.report()
+        GpuResources.report()
+        if Texture.cache is not None:
+            print(f"✅ Texture cache: {Texture.cache.hits} hits, {Texture.cache.misses} misses")
+        if Mesh.cache.cache_dir:
+            print(f"✅ Mesh cache: {Mesh.cache.hits} hits, {Mesh.cache.misses} misses")
+        if Texture.compressed_cache is not None and Texture.compressed_cache.hits:
+            print(f"✅ Compressed textures: {Texture.compressed_cache.hits} BC1/BC3 loaded, "
+                  f"{Texture.compressed_cache.misses} not baked")
+        TextureResidency.report()
         print("Application initialized successfully!")
         print("Controls: WASD, Mouse, Scroll, Space/Shift, ESC")
         return True
     
     def _main_loop(self):
         """Main rendering loop."""
+        if self.record_path:
+            self.camera.start_recording()
+        start_time = glfw.get_time()
+        benchmark = self.benchmark
+        
         while not glfw.window_should_close(self.window) and self.running:
-            # Time calculation
-            current_frame = glfw.get_time()
-            delta_time = current_frame - self.last_frame
-            self.last_frame = current_frame
+            if benchmark:
+                if benchmark.finished:
+                    break
+                benchmark.begin_frame()
             
-            # Process continuous keyboard input
-            self._process_continuous_input(delta_time)
+                # Fixed simulated time step and a scripted camera, so every run draws the same frames
+                current_frame = benchmark.time
+                delta_time = benchmark.delta_time
+                self.camera.follow(benchmark.path, current_frame)
+            else:
+                # Time calculation
+                current_frame = glfw.get_time()
+                delta_time = current_frame - self.last_frame
+                self.last_frame = current_frame
+                
+                # Process continuous keyboard input
+                self._process_continuous_input(delta_time)
+                self.camera.record_pose(current_frame - start_time)
+            self.current_time = current_frame
+            self._mark("input")
             
             # Clear and render
             gl.glClear(gl.GL_COLOR_BUFFER_BIT | gl.GL_DEPTH_BUFFER_BIT)
+            GpuResources.begin_frame()
             self._render(delta_time)
+            GpuResources.end_frame()
+            TextureResidency.end_frame()
+            self._mark("residency")
+            
+            if RENDER_STATS:
+                self._report_render_stats()
             
             # Swap buffers and poll events
             glfw.swap_buffers(self.window)
             glfw.poll_events()
+            
+            if benchmark:
+                # Wait for the GPU so the frame time includes its work
+                gl.glFinish()
+                benchmark.mark("present")
+                benchmark.end_frame()
+    
+    def _mark(self, phase):
+        """End a benchmark phase of the current frame."""
+        if self.benchmark:
+            self.benchmark.mark(phase)
+    
+    def _write_benchmark(self):
+        """Write the benchmark timings along with what they were measured on. Returns False if no frame was measured."""
+        metadata = {
+            "renderer": gl.glGetString(gl.GL_RENDERER).decode(),
+            "gl_version": gl.glGetString(gl.GL_VERSION).decode(),
+            "window": [WINDOW_WIDTH, WINDOW_HEIGHT],
+            "frustum_culling": FRUSTUM_CULLING,
+            "texture_arrays": TEXTURE_ARRAYS,
+            # BC1/BC3 textures actually loaded; None when S3TC is unsupported or TEXTURE_COMPRESSION is off
+            "compressed_textures_loaded": Texture.compressed_cache.hits if Texture.compressed_cache is not None else None,
+            "texture_budget_mb": TEXTURE_BUDGET_MB,
+            "mesh_lod": MESH_LOD,
+            "gpu_allocations_during_frames": GpuResources.frame_allocations,
+            # Triangles of the LOD-managed meshes per frame, as drawn and at full detail (warmup included)
+            "lod_triangles_per_frame": {
+                "drawn": round(LodMesh.triangles / max(self.benchmark.frame, 1)),
+                "full_detail": round(LodMesh.full_triangles / max(self.benchmark.frame, 1)),
+            },
+        }
+        results = self.benchmark.write(self.benchmark_output, metadata)
+        frame_time = results["frame_time"]
+        if frame_time is None:
+            print("❌ Benchmark ended before any frame was measured")
+            return False
+        print(f"✅ Benchmark: {results['frames']} frames, min {frame_time['min_ms']:.2f} ms, "
+              f"avg {frame_time['avg_ms']:.2f} ms, p95 {frame_time['p95_ms']:.2f} ms, "
+              f"p99 {frame_time['p99_ms']:.2f} ms; results written to {self.benchmark_output}")
+        return True
     
     def _process_continuous_input(self, delta_time):
         """Process continuous keyboard input for smooth movement."""
@@ -262,19 +446,37 @@ class Application:
         if glfw.KEY_LEFT_SHIFT in self.keys_pressed:
             self.camera.process_keyboard("DOWN", delta_time)
     
+    def _build_static_draws(self):
+        """Record the draws of the mountains, terrain, road, bridge, house, roof, trees and logs."""
+        self.static_draws = StaticDrawList(self.shader)
+        for mountain in self.mountains:
+            self.static_draws.record(mountain)
+        self.static_draws.record(self.terrain)
+        self.static_draws.record(self.road)
+        self.static_draws.record(self.bridge)
+        self.static_draws.record(self.house, position=self.house_position)
+        self.static_draws.record(self.roof, position=self.roof_position)
+        for tree in self.trees:
+            self.static_draws.record(tree)
+        for log, log_pos, log_rot in self.logs:
+            self.static_draws.record(log, log_pos, log_rot)
+        self.static_draws.build()
+        
+        submission = "glMultiDrawElementsIndirect" if self.static_draws.multi_draw_indirect else "draw loop"
+        print(f"✅ Static draw list: {len(self.static_draws)} draws in {len(self.static_draws.groups)} groups "
+              f"({submission})")
+    
     def _render(self, delta_time):
         """Render the scene with proper depth ordering."""
         if not self.shader:
             return
             
-        # Create matrices using camera
+        # Camera matrices, rebuilt by the camera only when it has moved or the window was resized
         view = self.camera.get_view_matrix_array()
-        projection = create_projection_matrix_from_camera(
-            self.camera, WINDOW_WIDTH/WINDOW_HEIGHT, NEAR_PLANE, FAR_PLANE
-        )
+        projection = self.camera.get_projection_matrix_array()
         
         # Lighting setup
-        current_time = glfw.get_time()
+        current_time = self.current_time
         light_x = 5.0 * np.cos(current_time * 0.1)
         light_y = 8.0
         light_z = 5.0 * np.sin(current_time * 0.1)
@@ -282,6 +484,18 @@ class Application:
         
         view_pos = (self.camera.position.x, self.camera.position.y, self.camera.position.z)
         
+        # Upload camera and light state once for every program
+        self.frame_uniforms.update_frame(view, projection, light_pos, view_pos)
+        
+        # Objects whose bounds are outside the view frustum are skipped below
+        frustum = None
+        if FRUSTUM_CULLING:
+            frustum = self.camera.get_frustum()
+        self.frustum = frustum
+        
+        # Levels of detail are picked from the distance to the camera
+        LodMesh.set_view(view_pos, self.camera.zoom)
+        
         # Update animated objects
         for car in self.cars:
             car.update(delta_time)
@@ -292,6 +506,7 @@ class Application:
             self.smoke_system.update(delta_time)
         if self.ship:
             self.ship.update(delta_time)
+        self._mark("update")
         
         # Set time uniform for main shader
         self.shader.use()
@@ -301,93 +516,101 @@ class Application:
         
         # 0. Draw clouds (sky) - render first so they appear in background
         if self.cloud_system:
-            self.cloud_system.draw(view, projection, light_pos, view_pos)
+            self.cloud_system.draw(frustum)
         
-        # 1. Draw advanced mountains (terrain generation with noise)
-        for mountain in self.mountains:
-            mountain.draw(view, projection, light_pos, view_pos)
+        # 1-2, 4, 6. Everything that never moves (mountains, terrain, road, bridge, house, roof,
+        # trees and logs) in a few submissions
+        if self.static_draws:
+            self.static_draws.draw(frustum, self.camera.generation)
+        else:
+            # 1. Draw advanced mountains (terrain generation with noise)
+            for mountain in self.mountains:
+                if frustum is None or frustum.is_visible(mountain.world_bounds()):
+                    mountain.draw()
         
-        # 2. Draw terrain (ground and river channel) - uses main shader
-        self.terrain.draw(view, projection, light_pos, view_pos)
+            # 2. Draw terrain (ground and river channel) - uses main shader
+            self.terrain.draw()
         
         # 3. Draw water - uses WATER SHADER (different from terrain!)
-        self.water.draw(view, projection, light_pos, view_pos)
+        self.water.draw()
         
         # 3.5 Draw ship on the river
         if self.ship:
-            self.ship.draw(view, projection, light_pos, view_pos)
+            self.ship.draw()
         
         # 4. Draw other objects - use main shader
-        self.road.draw(view, projection, light_pos, view_pos)
-        self.bridge.draw(view, projection, light_pos, view_pos)
-        self.house.draw(view, projection, light_pos, view_pos, position=(5.0, -0.25, 0.0))
+        if not self.static_draws:
+            self.road.draw()
+            self.bridge.draw()
+            self.house.draw(position=self.house_position)
         
-        # Draw pyramid roof (positioned above house)
-        self.roof.draw(view, projection, light_pos, view_pos, position=(5.0, 0.55, 0.0))
+            # Draw pyramid roof (positioned above house)
+            self.roof.draw(position=self.roof_position)
         
         # 5. Draw procedural cars on the road
         for car in self.cars:
-            car.draw(view, projection, light_pos, view_pos)
-        
-        # 6. Draw trees
-        tree_positions = [
-            (6.0, 0.0, 2.0),
-            (7.0, 0.0, -1.0),
-            (4.0, 0.0, 3.0),
-            (5.5, 0.0, -2.5),
-            (3.5, 0.0, -1.5)
-        ]
-        
-        for i, tree in enumerate(self.trees):
-            if i < len(tree_positions):
-                tree.position = tree_positions[i]
-                tree.draw(view, projection, light_pos, view_pos)
-        
-        # 6.5 Draw logs around trees
-        for log, log_pos, log_rot in self.logs:
-            log.draw(view, projection, light_pos, view_pos, log_pos, log_rot)
+            if frustum is None or frustum.is_visible(car.world_bounds()):
+                car.draw()
         
-        # 7. Draw Christmas tree forest on left side of river
-        self.shader.use()
-        self.shader.set_mat4("view", view)
-        self.shader.set_mat4("projection", projection)
-        self.shader.set_vec3("lightPos", light_pos)
-        self.shader.set_vec3("viewPos", view_pos)
-        self.shader.set_vec3("lightColor", (1.0, 1.0, 1.0))
-        
-        # Bind texture once for all trees (major optimization)
-        texture_bound = False
-        if self.christmas_trees and self.christmas_trees[0]['tree'].tree_texture:
-            self.christmas_trees[0]['tree'].tree_texture.bind(0)
-            self.shader.set_sampler("texture_diffuse1", 0)
-            self.shader.set_bool("useTexture", True)
-            texture_bound = True
-        
-        for tree_data in self.christmas_trees:
-            tree = tree_data['tree']
-            pos = tree_data['position']
-            scale = tree_data['scale']
-            
-            for part in tree.tree_parts:
-                # Create model matrix with scale
-                part_pos = (
-                    pos[0] + part['position'][0] * scale,
-                    pos[1] + part['position'][1] * scale,
-                    pos[2] + part['position'][2] * scale
-                )
-                model = glm.translate(glm.mat4(1.0), glm.vec3(part_pos[0], part_pos[1], part_pos[2]))
-                model = glm.scale(model, glm.vec3(scale, scale, scale))
-                
-                self.shader.set_mat4("model", model)
-                self.shader.set_vec3("objectColor", part['color'])
-                part['mesh'].draw(self.shader)
+        if not self.static_draws:
+            # 6. Draw trees
+            for tree in self.trees:
+                if frustum is None or frustum.is_visible(tree.world_bounds()):
+                    tree.draw()
         
-        if not texture_bound:
-            self.shader.set_bool("useTexture", False)
+            # 6.5 Draw logs around trees
+            for log, log_pos, log_rot in self.logs:
+                if frustum is None or frustum.is_visible(log.world_bounds(log_pos)):
+                    log.draw(log_pos, log_rot)
+        
+        # 7. Draw Christmas tree forest on left side of river (one instanced draw per part)
+        if self.christmas_forest:
+            self.christmas_forest.draw(frustum, self.camera.generation)
         
         # 8. Draw smoke from chimney
         if self.smoke_system:
-            self.smoke_system.draw(view, projection, light_pos, view_pos)
+            self.smoke_system.draw()
+    
+        self._mark("draw")
+        
+        if frustum is not None:
+            self.objects_drawn = frustum.drawn
+            self.objects_culled = frustum.culled
+            self.stats_drawn += frustum.drawn
+            self.stats_culled += frustum.culled
+    
+    def _report_render_stats(self):
+        """Print per-frame render statistics averaged over RENDER_STATS_INTERVAL frames."""
+        self.stats_frames += 1
+        if self.stats_frames < RENDER_STATS_INTERVAL:
+            return
+        
+        frames = self.stats_frames
+        for label, shader in (("main", self.shader), ("water", self.water_shader)):
+            print(f"[stats] {label} shader per frame: "
+                  f"{shader.uploads / frames:.0f} uniform uploads, "
+                  f"{shader.skips / frames:.0f} unchanged skipped, "
+                  f"{shader.inactive / frames:.0f} inactive skipped, "
+                  f"{shader.gl_calls_saved() / frames:.0f} GL calls saved")
+            shader.reset_stats()
+        
+        print(f"[stats] textures per frame: {Texture.bind_requests / frames:.0f} bind requests, "
+              f"{Texture.binds / frames:.0f} glBindTexture calls")
+        Texture.reset_bind_stats()
+        TextureResidency.report("[stats] texture residency")
+        GpuResources.report("[stats] GPU resources")
+        
+        print(f"[stats] LOD meshes per frame: {LodMesh.triangles / frames:.0f} triangles drawn, "
+              f"{LodMesh.full_triangles / frames:.0f} at full detail")
+        LodMesh.reset_stats()
+        
+        if FRUSTUM_CULLING:
+            print(f"[stats] frustum culling per frame: {self.stats_drawn / frames:.0f} objects drawn, "
+                  f"{self.stats_culled / frames:.0f} culled")
+            self.stats_drawn = 0
+            self.stats_culled = 0
+        
+        self.stats_frames = 0
     
     def _shutdown(self):
         """Cleanup resources."""
@@ -413,6 +636,22 @@ class Application:
             print("\nTo use this position, copy these values to the Camera initialization")
             print("="*60 + "\n")
         
+        if self.camera and self.camera.recording is not None:
+            self.camera.recording.save(self.record_path)
+            print(f"✅ Camera path recorded: {len(self.camera.recording.keyframes)} poses, "
+                  f"{self.camera.recording.duration:.1f} s, saved to {self.record_path}")
+        
+        # Free GL objects while the context is still current; whatever the owners leave is a leak
+        TextureRegistry.release_all()
+        if self.static_draws is not None:
+            self.static_draws.delete()
+        if self.christmas_forest is not None:
+            self.christmas_forest.delete()
+        if self.frame_uniforms is not None:
+            self.frame_uniforms.delete()
+        BufferArena.release_all()
+        GpuResources.shutdown()
+        
         if self.window:
             glfw.destroy_window(self.window)
         glfw.terminate()
@@ -451,4 +690,6 @@ class Application:
     
     def _framebuffer_size_callback(self, window, width, height):
         """Handle window resize."""
-        gl.glViewport(0, 0, width, height)
\ No newline at end of file
+        gl.glViewport(0, 0, width, height)
+        if self.camera:
+            self.camera.set_viewport(width, height)
\ No newline at end of file
@@ -0,0 +1,108 @@
+"""
+Deterministic benchmark flythrough: plays a camera path with a fixed timestep and records frame timings.
+"""
+
+import json
+import os
+import platform
+import time
+import numpy as np
+
+
+class Benchmark:
+    """Frame and per-phase timings of one run along a CameraPath.
+    
+    Simulated time advances by exactly timestep per frame, whatever the
+    real frame time, so every run renders the same frames and animations.
+    The first warmup_frames frames are drawn at the start of the path with
+    the animations stopped (shader variants, texture uploads and caches
+    settle there) and are not measured. The run is finished once the
+    simulated time passes the end of the path.
+    """
+    
+    # Phases of a frame, in the order they run (see Application._main_loop)
+    PHASES = ("input", "update", "draw", "residency", "present")
+    
+    def __init__(self, path, timestep=1.0 / 60.0, warmup_frames=30):
+        self.path = path
+        self.timestep = timestep
+        self.warmup_frames = warmup_frames
+        self.frame = 0
+        self.frame_times = []
+        self.phase_times = {phase: [] for phase in self.PHASES}
+        self._frame_start = None
+        self._last_mark = None
+        self._phases = {}
+    
+    @property
+    def measuring(self):
+        return self.frame >= self.warmup_frames
+    
+    @property
+    def time(self):
+        """Simulated time of the current frame along the path."""
+        return max(0, self.frame - self.warmup_frames) * self.timestep
+    
+    @property
+    def delta_time(self):
+        """Simulated time step of the current frame; animations hold still during warmup."""
+        return self.timestep if self.frame > self.warmup_frames else 0.0
+    
+    @property
+    def finished(self):
+        return self.time > self.path.duration
+    
+    def begin_frame(self):
+        self._frame_start = self._last_mark = time.perf_counter()
+        self._phases = {}
+    
+    def mark(self, phase):
+        """End a phase: the time since the previous mark (or frame start) is charged to it."""
+        now = time.perf_counter()
+        self._phases[phase] = self._phases.get(phase, 0.0) + now - self._last_mark
+        self._last_mark = now
+    
+    def end_frame(self):
+        if self.measuring:
+            self.frame_times.append(time.perf_counter() - self._frame_start)
+            for phase in self.PHASES:
+                self.phase_times[phase].append(self._phases.get(phase, 0.0))
+        self.frame += 1
+    
+    @staticmethod
+    def _summary(seconds):
+        milliseconds = np.asarray(seconds, dtype=np.float64) * 1000.0
+        if not len(milliseconds):
+            return None
+        return {
+            "min_ms": round(float(milliseconds.min()), 3),
+            "avg_ms": round(float(milliseconds.mean()), 3),
+            "p95_ms": round(float(np.percentile(milliseconds, 95)), 3),
+            "p99_ms": round(float(np.percentile(milliseconds, 99)), 3),
+            "max_ms": round(float(milliseconds.max()), 3),
+        }
+    
+    def results(self, metadata=None):
+        """Timings as a JSON-ready dict; metadata (renderer, settings, ...) is stored alongside."""
+        total = sum(self.frame_times)
+        return {
+            "frames": len(self.frame_times),
+            "warmup_frames": self.warmup_frames,
+            "timestep": self.timestep,
+            "path_duration": self.path.duration,
+            "wall_seconds": round(total, 3),
+            "fps": round(len(self.frame_times) / total, 2) if total > 0 else None,
+            "frame_time": self._summary(self.frame_times),
+            "phases": {phase: self._summary(times) for phase, times in self.phase_times.items()},
+            "metadata": dict(metadata or {}, python=platform.python_version()),
+        }
+    
+    def write(self, filepath, metadata=None):
+        """Write results() to filepath and return them."""
+        results = self.results(metadata)
+        directory = os.path.dirname(filepath)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(filepath, 'w') as file:
+            json.dump(results, file, indent=2)
+        return results
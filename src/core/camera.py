@@ -3,10 +3,35 @@ Camera class for 3D navigation with mouse look.
 """
 
 import glm
-import numpy as np
+from core.camera_path import CameraPath
+from utils.bounds import Frustum
+from utils.transformations import glm_to_array
 
 class Camera:
-    def __init__(self):
+    """First-person camera that owns its view, projection and view-projection matrices.
+    
+    The matrices are rebuilt on first use after the position, orientation,
+    zoom, clip planes or viewport change, and generation counts those
+    changes, so per-frame work that only depends on the camera (culling,
+    cached uploads) can be skipped while it stays the same. Assign
+    position, front, up and zoom as a whole (+= is fine) rather than
+    changing their components in place, or the change goes unnoticed.
+    """
+    
+    def __init__(self, aspect_ratio=1.5, near_plane=0.1, far_plane=100.0):
+        # Change tracking: bumped on every change that affects the matrices
+        self.generation = 0
+        self._view = None
+        self._projection = None
+        self._view_projection = None
+        self._view_array = None
+        self._projection_array = None
+        self._frustum_planes = None
+        
+        self.aspect_ratio = aspect_ratio
+        self.near_plane = near_plane
+        self.far_plane = far_plane
+        
         # Camera attributes
         self.position = glm.vec3(6.44, 1.74, 16.67)  # Captured debug position
         self.front = glm.vec3(-0.33, 0.14, -0.93)  # Captured debug front
@@ -23,17 +48,134 @@ class Camera:
         self.mouse_sensitivity = 0.1
         self.zoom = 45.0
         
+        # CameraPath being recorded by record_pose(), None when not recording
+        self.recording = None
+        
         # Update camera vectors
         self._update_camera_vectors()
     
+    def _view_changed(self):
+        self._view = None
+        self._view_projection = None
+        self.generation += 1
+    
+    def _projection_changed(self):
+        self._projection = None
+        self._view_projection = None
+        self.generation += 1
+    
+    @property
+    def position(self):
+        return self._position
+    
+    @position.setter
+    def position(self, value):
+        self._position = glm.vec3(value)
+        self._view_changed()
+    
+    @property
+    def front(self):
+        return self._front
+    
+    @front.setter
+    def front(self, value):
+        self._front = glm.vec3(value)
+        self._view_changed()
+    
+    @property
+    def up(self):
+        return self._up
+    
+    @up.setter
+    def up(self, value):
+        self._up = glm.vec3(value)
+        self._view_changed()
+    
+    @property
+    def zoom(self):
+        return self._zoom
+    
+    @zoom.setter
+    def zoom(self, value):
+        self._zoom = value
+        self._projection_changed()
+    
+    def set_viewport(self, width, height):
+        """Follow the framebuffer size; a minimized window (zero height) keeps the old aspect."""
+        if height > 0 and width / height != self.aspect_ratio:
+            self.aspect_ratio = width / height
+            self._projection_changed()
+    
+    def set_clip_planes(self, near_plane, far_plane):
+        if (near_plane, far_plane) != (self.near_plane, self.far_plane):
+            self.near_plane = near_plane
+            self.far_plane = far_plane
+            self._projection_changed()
+    
+    def _update_matrices(self):
+        """Rebuild whichever matrices are out of date."""
+        if self._view is None:
+            self._view = glm.lookAt(self._position, self._position + self._front, self._up)
+            self._view_array = glm_to_array(self._view)
+        if self._projection is None:
+            self._projection = glm.perspective(glm.radians(self._zoom), self.aspect_ratio,
+                                               self.near_plane, self.far_plane)
+            self._projection_array = glm_to_array(self._projection)
+        if self._view_projection is None:
+            self._view_projection = self._projection * self._view
+            self._frustum_planes = Frustum.from_matrix(self._view_projection).planes
+    
     def get_view_matrix(self):
         """Return the view matrix."""
-        return glm.lookAt(self.position, self.position + self.front, self.up)
+        self._update_matrices()
+        return self._view
     
     def get_view_matrix_array(self):
         """Return view matrix as numpy array for OpenGL."""
-        view = self.get_view_matrix()
-        return self._glm_to_array(view)
+        self._update_matrices()
+        return self._view_array
+    
+    def get_projection_matrix(self):
+        """Return the perspective projection matrix for the current zoom and viewport."""
+        self._update_matrices()
+        return self._projection
+    
+    def get_projection_matrix_array(self):
+        """Return projection matrix as numpy array for OpenGL."""
+        self._update_matrices()
+        return self._projection_array
+    
+    def get_view_projection_matrix(self):
+        """Return projection * view."""
+        self._update_matrices()
+        return self._view_projection
+    
+    def get_frustum(self):
+        """Return the world-space view frustum, for culling; its counters start at zero."""
+        self._update_matrices()
+        return Frustum(self._frustum_planes)
+    
+    def set_pose(self, position, yaw, pitch, zoom=None):
+        """Place the camera at position looking along yaw/pitch (degrees)."""
+        self.position = glm.vec3(*position)
+        self.yaw = yaw
+        self.pitch = pitch
+        if zoom is not None:
+            self.zoom = zoom
+        self._update_camera_vectors()
+    
+    def start_recording(self):
+        """Start recording poses into a new CameraPath."""
+        self.recording = CameraPath()
+    
+    def record_pose(self, time):
+        """Append the current pose at time (seconds) to the recording, if any."""
+        if self.recording is not None:
+            self.recording.record(time, self)
+    
+    def follow(self, path, time):
+        """Move to the pose of a CameraPath at time."""
+        self.set_pose(*path.sample(time))
     
     def process_keyboard(self, direction, delta_time):
         """Process keyboard input for camera movement."""
@@ -91,11 +233,4 @@ class Camera:
         # Re-calculate right and up vectors
         self.right = glm.normalize(glm.cross(self.front, self.world_up))
         self.up = glm.normalize(glm.cross(self.right, self.front))
-    
-    def _glm_to_array(self, matrix):
-        """Convert glm matrix to numpy array."""
-        arr = np.zeros(16, dtype=np.float32)
-        for i in range(4):
-            for j in range(4):
-                arr[i*4 + j] = matrix[i][j]
-        return arr
\ No newline at end of file
+    
\ No newline at end of file
@@ -0,0 +1,102 @@
+"""
+Timestamped camera poses: recorded while flying around, or scripted by hand, and played back as a spline.
+"""
+
+import bisect
+import json
+import os
+
+
+class CameraPath:
+    """A list of camera keyframes (time, position, yaw, pitch, zoom) sorted by time.
+    
+    Positions are interpolated with a Catmull-Rom spline through the
+    keyframes and the angles linearly, so a handful of scripted keyframes
+    give a smooth flythrough and a dense recording plays back as recorded.
+    Yaw is not wrapped to [0, 360), so a recorded turn never takes the long
+    way round.
+    """
+    
+    VERSION = 1
+    
+    def __init__(self, keyframes=None):
+        self.keyframes = []
+        for keyframe in keyframes or []:
+            self.add(**keyframe)
+    
+    @property
+    def duration(self):
+        return self.keyframes[-1]["time"] if self.keyframes else 0.0
+    
+    def add(self, time, position, yaw, pitch, zoom=45.0):
+        """Append a keyframe; time must not go backwards."""
+        if self.keyframes and time < self.keyframes[-1]["time"]:
+            raise Exception(f"Camera keyframe at {time:.3f} s is earlier than the previous one")
+        self.keyframes.append({
+            "time": float(time),
+            "position": [float(value) for value in position],
+            "yaw": float(yaw),
+            "pitch": float(pitch),
+            "zoom": float(zoom),
+        })
+    
+    def record(self, time, camera):
+        """Append the current pose of camera."""
+        self.add(time, (camera.position.x, camera.position.y, camera.position.z),
+                 camera.yaw, camera.pitch, camera.zoom)
+    
+    def sample(self, time):
+        """Pose at time as (position, yaw, pitch, zoom); clamps outside the path."""
+        if not self.keyframes:
+            raise Exception("Camera path has no keyframes")
+        times = [keyframe["time"] for keyframe in self.keyframes]
+        index = bisect.bisect_right(times, time) - 1
+        if index < 0:
+            return self._pose(self.keyframes[0])
+        if index >= len(self.keyframes) - 1:
+            return self._pose(self.keyframes[-1])
+        
+        start, end = self.keyframes[index], self.keyframes[index + 1]
+        span = end["time"] - start["time"]
+        t = (time - start["time"]) / span if span > 0 else 1.0
+        
+        # Neighbours for the spline tangents; the ends repeat themselves
+        before = self.keyframes[max(0, index - 1)]
+        after = self.keyframes[min(len(self.keyframes) - 1, index + 2)]
+        position = [_catmull_rom(p0, p1, p2, p3, t) for p0, p1, p2, p3 in
+                    zip(before["position"], start["position"], end["position"], after["position"])]
+        
+        def lerp(key):
+            return start[key] + (end[key] - start[key]) * t
+        
+        return position, lerp("yaw"), lerp("pitch"), lerp("zoom")
+    
+    @staticmethod
+    def _pose(keyframe):
+        return list(keyframe["position"]), keyframe["yaw"], keyframe["pitch"], keyframe["zoom"]
+    
+    def save(self, filepath):
+        directory = os.path.dirname(filepath)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(filepath, 'w') as file:
+            json.dump({"version": self.VERSION, "keyframes": self.keyframes}, file, indent=1)
+    
+    @classmethod
+    def load(cls, filepath):
+        """Read a path written by save() or by hand; keyframes may leave out zoom."""
+        with open(filepath) as file:
+            data = json.load(file)
+        if data.get("version") != cls.VERSION:
+            raise Exception(f"Unsupported camera path version in {filepath}: {data.get('version')}")
+        path = cls(data["keyframes"])
+        if not path.keyframes:
+            raise Exception(f"Camera path {filepath} has no keyframes")
+        return path
+
+
+def _catmull_rom(p0, p1, p2, p3, t):
+    """Point between p1 and p2 at t in [0, 1] on a uniform Catmull-Rom spline."""
+    t2 = t * t
+    t3 = t2 * t
+    return 0.5 * ((2 * p1) + (p2 - p0) * t + (2 * p0 - 5 * p1 + 4 * p2 - p3) * t2 + (3 * p1 - p0 - 3 * p2 + p3) * t3)
@@ -0,0 +1,163 @@
+"""
+Ownership of GL objects: every buffer, texture and vertex array is created and deleted through GpuResources.
+
+GL objects are freed by whoever created them (delete() methods), or at
+shutdown while the context is still current, never from __del__: the
+garbage collector may run at any time, in any thread, with no context.
+GpuResources counts what is alive, handles and bytes per kind. In debug
+mode it also remembers where each object was created, so whatever is
+still alive at shutdown can be reported as a leak and GPU allocations
+made while a frame is drawn are reported where they happen.
+"""
+
+import traceback
+import OpenGL.GL as gl
+
+BUFFER = "buffer"
+TEXTURE = "texture"
+VERTEX_ARRAY = "vertex array"
+
+_GENERATE = {
+    BUFFER: lambda: gl.glGenBuffers(1),
+    TEXTURE: lambda: gl.glGenTextures(1),
+    VERTEX_ARRAY: lambda: gl.glGenVertexArrays(1),
+}
+_DELETE = {
+    BUFFER: lambda handle: gl.glDeleteBuffers(1, [handle]),
+    TEXTURE: lambda handle: gl.glDeleteTextures(1, [handle]),
+    VERTEX_ARRAY: lambda handle: gl.glDeleteVertexArrays(1, [handle]),
+}
+
+
+def _creation_site():
+    """'file:line in function' of the first caller outside the resource code."""
+    for frame in reversed(traceback.extract_stack()[:-2]):
+        if not frame.filename.endswith(("gpu_resources.py", "buffer_arena.py", "mesh.py")):
+            return f"{frame.filename}:{frame.lineno} in {frame.name}"
+    return "unknown"
+
+
+class GpuResources:
+    """Registry of the live GL buffers, textures and vertex arrays.
+    
+    Between begin_frame() and end_frame() every GPU allocation (a new GL
+    object, or a mesh range in a BufferArena) is counted in
+    frame_allocations; a scene that is fully loaded makes none. Texture
+    reloads by TextureResidency are streaming, not leaks, and pass
+    streamed=True.
+    """
+    
+    # Remember creation sites, report each per-frame allocation site once and list leaks at shutdown
+    debug = False
+    
+    # (kind, handle) -> [label, bytes, creation site or None]
+    _live = {}
+    _in_frame = False
+    _reported_sites = set()
+    
+    # Allocations made between begin_frame() and end_frame() since startup
+    frame_allocations = 0
+    
+    @classmethod
+    def create(cls, kind, label, streamed=False):
+        """Generate one GL object of kind (BUFFER, TEXTURE or VERTEX_ARRAY) and return its handle."""
+        handle = int(_GENERATE[kind]())
+        site = _creation_site() if cls.debug else None
+        cls._live[(kind, handle)] = [label, 0, site]
+        if not streamed:
+            cls.allocated(f"{kind} {label}", site)
+        return handle
+    
+    @classmethod
+    def create_buffer(cls, label):
+        return cls.create(BUFFER, label)
+    
+    @classmethod
+    def create_texture(cls, label, streamed=False):
+        return cls.create(TEXTURE, label, streamed)
+    
+    @classmethod
+    def create_vertex_array(cls, label):
+        return cls.create(VERTEX_ARRAY, label)
+    
+    @classmethod
+    def set_size(cls, kind, handle, size_bytes):
+        """Record the GPU memory behind a handle after its storage was (re)specified."""
+        entry = cls._live.get((kind, int(handle)))
+        if entry is not None:
+            entry[1] = int(size_bytes)
+    
+    @classmethod
+    def delete(cls, kind, handle):
+        """Delete a GL object created by create(); None and 0 are ignored."""
+        if not handle:
+            return
+        if cls._live.pop((kind, int(handle)), None) is None:
+            raise Exception(f"GL {kind} {handle} was not created through GpuResources or is already deleted")
+        _DELETE[kind](handle)
+    
+    @classmethod
+    def delete_buffer(cls, handle):
+        cls.delete(BUFFER, handle)
+    
+    @classmethod
+    def delete_texture(cls, handle):
+        cls.delete(TEXTURE, handle)
+    
+    @classmethod
+    def delete_vertex_array(cls, handle):
+        cls.delete(VERTEX_ARRAY, handle)
+    
+    @classmethod
+    def allocated(cls, what, site=None):
+        """Note a GPU allocation; counted (and in debug mode reported) when made during a frame."""
+        if not cls._in_frame:
+            return
+        cls.frame_allocations += 1
+        if cls.debug:
+            site = site or _creation_site()
+            if site not in cls._reported_sites:
+                cls._reported_sites.add(site)
+                print(f"⚠️  GPU allocation during a frame: {what} at {site}")
+    
+    @classmethod
+    def begin_frame(cls):
+        cls._in_frame = True
+    
+    @classmethod
+    def end_frame(cls):
+        cls._in_frame = False
+    
+    @classmethod
+    def live(cls):
+        """{kind: (count, bytes)} of the GL objects alive now."""
+        totals = {kind: [0, 0] for kind in _GENERATE}
+        for (kind, _), (_, size_bytes, _) in cls._live.items():
+            totals[kind][0] += 1
+            totals[kind][1] += size_bytes
+        return {kind: tuple(total) for kind, total in totals.items()}
+    
+    @classmethod
+    def report(cls, prefix="✅ GPU resources"):
+        """Print the live buffers, textures and vertex arrays with their memory."""
+        megabytes = 1024 * 1024
+        live = cls.live()
+        parts = [f"{live[BUFFER][0]} buffers ({live[BUFFER][1] / megabytes:.1f} MB)",
+                 f"{live[TEXTURE][0]} textures ({live[TEXTURE][1] / megabytes:.1f} MB)",
+                 f"{live[VERTEX_ARRAY][0]} vertex arrays"]
+        if cls.frame_allocations:
+            parts.append(f"{cls.frame_allocations} allocated during frames")
+        print(f"{prefix}: {', '.join(parts)}")
+    
+    @classmethod
+    def shutdown(cls):
+        """Delete every GL object still alive; they are leaks, listed in debug mode. Returns how many."""
+        leaks = list(cls._live.items())
+        if leaks:
+            print(f"⚠️  {len(leaks)} GL objects still alive at shutdown, deleting them")
+            if cls.debug:
+                for (kind, handle), (label, size_bytes, site) in leaks:
+                    print(f"   {kind} {handle} ({label}, {size_bytes} bytes) created at {site}")
+        for (kind, handle), _ in leaks:
+            cls.delete(kind, handle)
+        return len(leaks)
@@ -4,20 +4,98 @@ Shader class for loading, compiling, and managing OpenGL shaders.
 
 import OpenGL.GL as gl
 import os
-import numpy as np
 import glm
+import re
+from collections import namedtuple
+from utils.transformations import matrix_bytes
+
+# One entry of a program's uniform table, read once after linking
+UniformInfo = namedtuple("UniformInfo", ["location", "type", "size"])
+
+INCLUDE_PATTERN = re.compile(r'^\s*#\s*include\s+"([^"]+)"\s*$')
+
+def preprocess_shader_source(source, defines=None, base_dir=".", _included=None, _source_index=0):
+    """Expand #include "file" lines and inject #define lines after #version.
+    
+    Includes are resolved relative to the including file and each file is
+    pasted at most once. defines is an iterable of names or a dict of
+    name -> value. #line directives keep compiler error messages pointing at
+    the original files (source 0 is the top-level file, includes count up).
+    """
+    included = [] if _included is None else _included
+    lines = []
+    for line_number, line in enumerate(source.splitlines(), start=1):
+        match = INCLUDE_PATTERN.match(line)
+        if not match:
+            lines.append(line)
+            continue
+        
+        include_path = os.path.normpath(os.path.join(base_dir, match.group(1)))
+        if include_path in included:
+            continue
+        included.append(include_path)
+        try:
+            with open(include_path, 'r') as file:
+                include_source = file.read()
+        except Exception as e:
+            raise Exception(f"Failed to include shader file {include_path}: {e}")
+        
+        include_index = len(included)
+        lines.append(f"#line 1 {include_index}")
+        lines.append(preprocess_shader_source(
+            include_source, None, os.path.dirname(include_path), included, include_index))
+        lines.append(f"#line {line_number + 1} {_source_index}")
+    
+    if defines and lines and lines[0].lstrip().startswith("#version"):
+        if isinstance(defines, dict):
+            define_lines = [f"#define {name} {value}" for name, value in sorted(defines.items())]
+        else:
+            define_lines = [f"#define {name}" for name in sorted(defines)]
+        lines[1:1] = define_lines + [f"#line 2 {_source_index}"]
+    
+    return "\n".join(lines)
 
 class Shader:
-    def __init__(self, vertex_path, fragment_path):
-        """Load and compile shaders from files."""
+    # Program currently bound with glUseProgram (shared by all shaders)
+    _current_program = None
+    
+    def __init__(self, vertex_path, fragment_path, binary_cache=None, defines=None):
+        """Load and compile shaders from files.
+        
+        binary_cache is an optional ProgramBinaryCache; when given, a cached
+        program binary is used instead of compiling from source if possible.
+        defines selects a variant of the sources (see preprocess_shader_source).
+        """
         self.program_id = None
+        self.binary_cache = binary_cache
+        self.defines = defines
+        self.uniforms = {}
+        self._uniform_values = {}
+        
+        # Uniform statistics (see reset_stats)
+        self.uploads = 0
+        self.skips = 0
+        self.inactive = 0
+        
         self._compile_shader(vertex_path, fragment_path)
     
     def _compile_shader(self, vertex_path, fragment_path):
         """Compile vertex and fragment shaders and link them into a program."""
         # Read shader source code
-        vertex_code = self._load_shader_file(vertex_path)
-        fragment_code = self._load_shader_file(fragment_path)
+        vertex_code = preprocess_shader_source(
+            self._load_shader_file(vertex_path), self.defines, os.path.dirname(vertex_path))
+        fragment_code = preprocess_shader_source(
+            self._load_shader_file(fragment_path), self.defines, os.path.dirname(fragment_path))
+        
+        # Try the program binary cache before compiling from source
+        cache_key = None
+        if self.binary_cache is not None:
+            cache_key = self.binary_cache.key(vertex_code, fragment_code)
+            self.program_id = self.binary_cache.load(cache_key)
+            if self.program_id is not None:
+                self._load_uniform_table()
+                print(f"Shader program {self.program_id} loaded from binary cache")
+                return
         
         # Compile shaders
         vertex_shader = self._compile_shader_part(gl.GL_VERTEX_SHADER, vertex_code)
@@ -27,6 +105,8 @@ class Shader:
         self.program_id = gl.glCreateProgram()
         gl.glAttachShader(self.program_id, vertex_shader)
         gl.glAttachShader(self.program_id, fragment_shader)
+        if cache_key is not None:
+            self.binary_cache.prepare(self.program_id)
         gl.glLinkProgram(self.program_id)
         
         # Check for linking errors
@@ -38,7 +118,33 @@ class Shader:
         gl.glDeleteShader(vertex_shader)
         gl.glDeleteShader(fragment_shader)
         
-        print(f"Shader program {self.program_id} compiled successfully!")
+        if cache_key is not None:
+            self.binary_cache.store(cache_key, self.program_id)
+        
+        self._load_uniform_table()
+        
+        variant = f" [{', '.join(sorted(self.defines))}]" if self.defines else ""
+        print(f"Shader program {self.program_id}{variant} compiled successfully!")
+    
+    def _load_uniform_table(self):
+        """Read every active uniform of the linked program into the location table."""
+        self.uniforms = {}
+        self._uniform_values = {}
+        
+        count = gl.glGetProgramiv(self.program_id, gl.GL_ACTIVE_UNIFORMS)
+        for index in range(count):
+            name, size, uniform_type = gl.glGetActiveUniform(self.program_id, index)
+            name = name.decode() if isinstance(name, bytes) else name
+            location = gl.glGetUniformLocation(self.program_id, name)
+            if location < 0:
+                # Members of uniform blocks have no location
+                continue
+            
+            info = UniformInfo(int(location), int(uniform_type), int(size))
+            self.uniforms[name] = info
+            # Arrays are reported as "name[0]"; allow lookups by the bare name too
+            if name.endswith("[0]"):
+                self.uniforms[name[:-3]] = info
     
     def _load_shader_file(self, filepath):
         """Load shader source code from file."""
@@ -62,45 +168,253 @@ class Shader:
         
         return shader_id
     
+    def bind_uniform_block(self, block_name, binding):
+        """Attach a named uniform block of this program to a binding point."""
+        block_index = gl.glGetUniformBlockIndex(self.program_id, block_name)
+        if block_index == gl.GL_INVALID_INDEX:
+            return False
+        
+        gl.glUniformBlockBinding(self.program_id, block_index, binding)
+        return True
+    
+    def _changed_location(self, name, value):
+        """Return the location to upload to, or None if the upload can be skipped.
+        
+        A uniform is skipped when the program does not use it (GL would ignore
+        the call) or when its shadow copy already holds the same value.
+        """
+        info = self.uniforms.get(name)
+        if info is None:
+            self.inactive += 1
+            return None
+        
+        if self._uniform_values.get(name) == value:
+            self.skips += 1
+            return None
+        
+        self._uniform_values[name] = value
+        self.uploads += 1
+        return info.location
+    
     def use(self):
         """Activate this shader program."""
-        gl.glUseProgram(self.program_id)
+        if Shader._current_program != self.program_id:
+            gl.glUseProgram(self.program_id)
+            Shader._current_program = self.program_id
     
     def set_bool(self, name, value):
         """Set a boolean uniform."""
-        gl.glUniform1i(gl.glGetUniformLocation(self.program_id, name), int(value))
+        location = self._changed_location(name, int(bool(value)))
+        if location is not None:
+            gl.glUniform1i(location, int(bool(value)))
     
     def set_int(self, name, value):
         """Set an integer uniform."""
-        gl.glUniform1i(gl.glGetUniformLocation(self.program_id, name), value)
+        location = self._changed_location(name, int(value))
+        if location is not None:
+            gl.glUniform1i(location, int(value))
     
     def set_float(self, name, value):
         """Set a float uniform."""
-        gl.glUniform1f(gl.glGetUniformLocation(self.program_id, name), value)
+        location = self._changed_location(name, float(value))
+        if location is not None:
+            gl.glUniform1f(location, float(value))
     
     def set_vec3(self, name, value):
         """Set a vec3 uniform."""
-        gl.glUniform3f(gl.glGetUniformLocation(self.program_id, name), value[0], value[1], value[2])
+        vec = (float(value[0]), float(value[1]), float(value[2]))
+        location = self._changed_location(name, vec)
+        if location is not None:
+            gl.glUniform3f(location, vec[0], vec[1], vec[2])
     
     def set_mat4(self, name, value):
         """Set a mat4 uniform."""
-        # Convert to numpy array for PyOpenGL
-        if isinstance(value, np.ndarray):
-            matrix_array = value
+        # Raw column-major bytes: compared against the shadow copy and
+        # handed to GL as-is, with no per-element conversion
+        data = matrix_bytes(value)
+        location = self._changed_location(name, data)
+        if location is not None:
+            gl.glUniformMatrix4fv(location, 1, gl.GL_FALSE, data)
+    
+    def set_sampler(self, name, texture_unit):
+        """Set a sampler uniform to point to a texture unit."""
+        self.set_int(name, texture_unit)
+    
+    def gl_calls_saved(self):
+        """Number of GL calls avoided since the last reset.
+        
+        Without the cache every set_* call cost a glGetUniformLocation plus
+        an upload; now only changed values of active uniforms reach GL.
+        """
+        return self.uploads + 2 * (self.skips + self.inactive)
+    
+    def reset_stats(self):
+        """Reset the uniform upload/skip counters."""
+        self.uploads = 0
+        self.skips = 0
+        self.inactive = 0
+
+
+class ShaderVariants:
+    """A family of programs built from one vertex/fragment pair with different #defines.
+    
+    Programs are compiled on first request and cached by their set of
+    defines. Objects hold a ShaderVariants where they used to hold a Shader:
+    set_* calls go to the selected program and are remembered, so that
+    switching program with set_textured() carries model, colour and sampler
+    state over instead of each object re-sending it. This replaces the old
+    per-fragment branch on a "useTexture" uniform.
+    """
+    
+    # Added to the textured define for layers of a TextureArray
+    TEXTURE_ARRAY_DEFINE = "TEXTURE_ARRAY"
+    # Added to any variant while instanced drawing is on (per-instance model and colour)
+    INSTANCED_DEFINE = "INSTANCED"
+    
+    def __init__(self, vertex_path, fragment_path, binary_cache=None, textured_define="TEXTURED",
+                 sampler_name="texture_diffuse1"):
+        self.vertex_path = vertex_path
+        self.fragment_path = fragment_path
+        self.binary_cache = binary_cache
+        self.textured_define = textured_define
+        self.sampler_name = sampler_name
+        self.programs = {}
+        self._blocks = {}
+        self._state = {}
+        self.instanced = False
+        self.current_defines = frozenset()
+        
+        # Build both material variants up front; enable_texture_arrays() and
+        # enable_instancing() do the same for the others, so nothing compiles mid-frame
+        self.get(textured_define)
+        self.current = self.get()
+    
+    def get(self, *defines):
+        """Return the program for a set of defines, compiling it if needed."""
+        key = frozenset(defines)
+        program = self.programs.get(key)
+        if program is None:
+            program = Shader(self.vertex_path, self.fragment_path, self.binary_cache, key)
+            for block_name, binding in self._blocks.items():
+                program.bind_uniform_block(block_name, binding)
+            self.programs[key] = program
+        return program
+    
+    def select(self, *defines):
+        """Make the program for a set of defines current."""
+        if self.instanced:
+            defines += (self.INSTANCED_DEFINE,)
+        program = self.get(*defines)
+        if program is self.current:
+            return program
+        
+        self.current = program
+        self.current_defines = frozenset(defines)
+        program.use()
+        # Bring the new program up to date; its shadow copies skip values it already has
+        for name, (setter, value) in self._state.items():
+            getattr(program, setter)(name, value)
+        return program
+    
+    def set_textured(self, textured):
+        """Select the textured or untextured material variant."""
+        if textured:
+            return self.select(self.textured_define)
+        return self.select()
+    
+    def use_texture(self, texture, texture_unit=0):
+        """Bind texture and select the textured variant that samples it.
+        
+        Layers of a TextureArray select the TEXTURE_ARRAY variant and set
+        textureLayer, so moving between layers of one array needs no bind.
+        """
+        texture.bind(texture_unit)
+        layer = getattr(texture, "layer", None)
+        if layer is None:
+            self.select(self.textured_define)
         else:
-            # Manual conversion for glm matrices
-            matrix_array = np.zeros(16, dtype=np.float32)
-            for i in range(4):
-                for j in range(4):
-                    matrix_array[i*4 + j] = value[i][j]
-        
-        gl.glUniformMatrix4fv(
-            gl.glGetUniformLocation(self.program_id, name), 
-            1, 
-            gl.GL_FALSE, 
-            matrix_array
-        )
+            self.select(self.textured_define, self.TEXTURE_ARRAY_DEFINE)
+            self.set_float("textureLayer", layer)
+        self.set_sampler(self.sampler_name, texture_unit)
+    
+    def set_instanced(self, instanced):
+        """Switch the selected material variant to its instanced version or back."""
+        if instanced == self.instanced:
+            return self.current
+        self.instanced = instanced
+        return self.select(*(self.current_defines - {self.INSTANCED_DEFINE}))
+    
+    def enable_texture_arrays(self):
+        """Compile the TextureArray variant now rather than on its first draw."""
+        self.get(self.textured_define, self.TEXTURE_ARRAY_DEFINE)
+    
+    def enable_instancing(self):
+        """Compile the instanced version of every variant built so far rather than on its first draw.
+        
+        Call after enable_texture_arrays() so the TextureArray variant gets one too.
+        """
+        for defines in list(self.programs):
+            self.get(*defines, self.INSTANCED_DEFINE)
+    
+    @property
+    def program_id(self):
+        return self.current.program_id
+    
+    def use(self):
+        """Activate the selected program."""
+        self.current.use()
+    
+    def bind_uniform_block(self, block_name, binding):
+        """Attach a uniform block to a binding point in every variant."""
+        self._blocks[block_name] = binding
+        bound = [program.bind_uniform_block(block_name, binding) for program in self.programs.values()]
+        return any(bound)
+    
+    def _set(self, setter, name, value):
+        self._state[name] = (setter, value)
+        getattr(self.current, setter)(name, value)
+    
+    def set_bool(self, name, value):
+        """Set a boolean uniform."""
+        self._set("set_bool", name, value)
+    
+    def set_int(self, name, value):
+        """Set an integer uniform."""
+        self._set("set_int", name, value)
+    
+    def set_float(self, name, value):
+        """Set a float uniform."""
+        self._set("set_float", name, value)
+    
+    def set_vec3(self, name, value):
+        """Set a vec3 uniform."""
+        self._set("set_vec3", name, value)
+    
+    def set_mat4(self, name, value):
+        """Set a mat4 uniform."""
+        self._set("set_mat4", name, matrix_bytes(value))
     
     def set_sampler(self, name, texture_unit):
         """Set a sampler uniform to point to a texture unit."""
-        gl.glUniform1i(gl.glGetUniformLocation(self.program_id, name), texture_unit)
\ No newline at end of file
+        self._set("set_int", name, texture_unit)
+    
+    @property
+    def uploads(self):
+        return sum(program.uploads for program in self.programs.values())
+    
+    @property
+    def skips(self):
+        return sum(program.skips for program in self.programs.values())
+    
+    @property
+    def inactive(self):
+        return sum(program.inactive for program in self.programs.values())
+    
+    def gl_calls_saved(self):
+        """Number of GL calls avoided by all variants since the last reset."""
+        return sum(program.gl_calls_saved() for program in self.programs.values())
+    
+    def reset_stats(self):
+        """Reset the uniform counters of all variants."""
+        for program in self.programs.values():
+            program.reset_stats()
@@ -0,0 +1,136 @@
+"""
+On-disk cache of linked shader program binaries.
+"""
+
+import OpenGL.GL as gl
+import ctypes
+import hashlib
+import os
+import struct
+from utils.atomic_write import atomic_write
+
+
+class ProgramBinaryCache:
+    """Stores glGetProgramBinary output so later launches can skip compiling.
+    
+    Entries are keyed by a hash of the shader sources plus the driver's
+    vendor, renderer and version strings, so a driver update or source
+    change simply misses. Binaries the driver rejects are deleted and the
+    caller falls back to compiling from source.
+    """
+    
+    MAGIC = b"RVPB"
+    HEADER = struct.Struct("<4sII")  # magic, binary format, binary length
+    
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+        self._supported = None
+        self._driver_id = None
+    
+    def is_supported(self):
+        """Check whether the context can save and restore program binaries."""
+        if self._supported is None:
+            try:
+                self._supported = (
+                    bool(gl.glGetProgramBinary) and bool(gl.glProgramBinary)
+                    and gl.glGetIntegerv(gl.GL_NUM_PROGRAM_BINARY_FORMATS) > 0
+                )
+            except Exception:
+                self._supported = False
+        return self._supported
+    
+    def key(self, *sources):
+        """Hash shader sources together with the driver identification."""
+        if self._driver_id is None:
+            self._driver_id = b"\0".join(
+                gl.glGetString(name) or b"" for name in (gl.GL_VENDOR, gl.GL_RENDERER, gl.GL_VERSION)
+            )
+        
+        digest = hashlib.sha256(self._driver_id)
+        for source in sources:
+            digest.update(b"\0")
+            digest.update(source.encode())
+        return digest.hexdigest()
+    
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.bin")
+    
+    def load(self, key):
+        """Return a linked program restored from the cache, or None on a miss."""
+        if not self.is_supported():
+            return None
+        
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as file:
+                magic, binary_format, length = self.HEADER.unpack(file.read(self.HEADER.size))
+                binary = file.read(length)
+        except (OSError, struct.error):
+            self.misses += 1
+            return None
+        
+        program_id = None
+        if magic == self.MAGIC and len(binary) == length:
+            try:
+                program_id = gl.glCreateProgram()
+                gl.glProgramBinary(program_id, binary_format, binary, length)
+                if not gl.glGetProgramiv(program_id, gl.GL_LINK_STATUS):
+                    gl.glDeleteProgram(program_id)
+                    program_id = None
+            except Exception:
+                program_id = None
+        
+        if program_id is None:
+            # Stale or corrupt entry: drop it so the next run re-caches
+            self.invalidate(key)
+            self.misses += 1
+            return None
+        
+        self.hits += 1
+        return program_id
+    
+    def prepare(self, program_id):
+        """Ask the driver to keep the binary of a program about to be linked."""
+        if self.is_supported():
+            gl.glProgramParameteri(program_id, gl.GL_PROGRAM_BINARY_RETRIEVABLE_HINT, gl.GL_TRUE)
+    
+    def store(self, key, program_id):
+        """Save the binary of a linked program."""
+        if not self.is_supported():
+            return False
+        
+        try:
+            size = gl.glGetProgramiv(program_id, gl.GL_PROGRAM_BINARY_LENGTH)
+            if size <= 0:
+                return False
+            
+            length = gl.GLsizei(0)
+            binary_format = gl.GLenum(0)
+            buffer = (ctypes.c_ubyte * size)()
+            gl.glGetProgramBinary(program_id, size, ctypes.byref(length), ctypes.byref(binary_format), buffer)
+            binary = bytes(buffer)[:length.value]
+            
+            with atomic_write(self._path(key)) as file:
+                file.write(self.HEADER.pack(self.MAGIC, binary_format.value, len(binary)))
+                file.write(binary)
+            return True
+        except Exception as e:
+            print(f"⚠️  Could not cache shader program binary: {e}")
+            return False
+    
+    def invalidate(self, key):
+        """Remove a cached entry."""
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+    
+    def clear(self):
+        """Remove every cached program binary."""
+        if not os.path.isdir(self.cache_dir):
+            return
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".bin"):
+                os.remove(os.path.join(self.cache_dir, name))
@@ -5,68 +5,447 @@ Texture loading and management class.
 import OpenGL.GL as gl
 from PIL import Image
 import numpy as np
+import time
+from concurrent.futures import ThreadPoolExecutor
+from OpenGL.GL.EXT.texture_compression_s3tc import (GL_COMPRESSED_RGB_S3TC_DXT1_EXT,
+                                                    GL_COMPRESSED_RGBA_S3TC_DXT5_EXT)
+from core.gpu_resources import TEXTURE, GpuResources
+from core.texture_residency import TextureResidency
+from utils.block_compression import CompressedImage, compressed_size
+
+# GL internal format of each block-compressed format in utils.block_compression
+COMPRESSED_FORMATS = {
+    "bc1": GL_COMPRESSED_RGB_S3TC_DXT1_EXT,
+    "bc3": GL_COMPRESSED_RGBA_S3TC_DXT5_EXT,
+}
+
+def decode_texture_file(filepath):
+    """Decode an image file into upload-ready RGB pixels (height x width x 3 uint8).
+    
+    Pure CPU work with no GL calls, so it can run on worker threads (PIL
+    releases the GIL while decoding).
+    """
+    # Load image
+    image = Image.open(filepath)
+    
+    # Convert RGBA to RGB if it has an alpha channel
+    if image.mode == 'RGBA':
+        # Create a white background
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        # Paste the image on the white background using the alpha channel as mask
+        background.paste(image, mask=image.split()[3])
+        image = background
+    elif image.mode != 'RGB':
+        image = image.convert('RGB')
+    
+    image = image.transpose(Image.FLIP_TOP_BOTTOM)
+    return np.array(image, dtype=np.uint8)
+
+def load_texture_pixels(filepath):
+    """Pixels for a texture file: a baked compressed chain when Texture.compressed_cache has
+    one, the cached mip chain when Texture.cache is set, else a fresh decode.
+    
+    Like decode_texture_file, safe to call from worker threads.
+    """
+    if Texture.compressed_cache is not None:
+        image = Texture.compressed_cache.load_baked(filepath)
+        if image is not None:
+            return image
+    if Texture.cache is not None:
+        return Texture.cache.load_or_build(filepath)
+    return decode_texture_file(filepath)
+
+def mip_chain_bytes(width, height, channels, mipmaps=True, compression=None):
+    """Bytes used by an image and, with mipmaps, every level down to 1x1.
+    
+    compression is a block format ("bc1", "bc3") for compressed textures.
+    """
+    def level_bytes(width, height):
+        return compressed_size(width, height, compression) if compression else width * height * channels
+    
+    size = level_bytes(width, height)
+    while mipmaps and (width > 1 or height > 1):
+        width, height = max(1, width // 2), max(1, height // 2)
+        size += level_bytes(width, height)
+    return size
+
+def s3tc_supported():
+    """Whether the current context can sample S3TC (BC1-BC3) compressed textures."""
+    count = gl.glGetIntegerv(gl.GL_NUM_EXTENSIONS)
+    extensions = {gl.glGetStringi(gl.GL_EXTENSIONS, index) for index in range(count)}
+    return b"GL_EXT_texture_compression_s3tc" in extensions
+
+def full_mip_chain(pixels):
+    """Mip levels for pixels as returned by load_texture_pixels (a chain already, or one image)."""
+    if isinstance(pixels, (list, CompressedImage)):
+        return pixels
+    from core.texture_cache import build_mip_chain
+    return build_mip_chain(np.asarray(pixels, dtype=np.uint8))
+
+def collect_texture_paths(object_classes):
+    """Gather the image files named in the TEXTURE_PATHS dicts of object classes."""
+    paths = []
+    for object_class in object_classes:
+        for path in getattr(object_class, "TEXTURE_PATHS", {}).values():
+            if path not in paths:
+                paths.append(path)
+    return paths
 
 class Texture:
-    def __init__(self, filepath):
+    target = gl.GL_TEXTURE_2D
+    
+    # Optional core.texture_cache.TextureCache used when loading files
+    cache = None
+    # Optional core.texture_cache.CompressedTextureCache, only set when the context supports S3TC
+    compressed_cache = None
+    
+    # (unit, target) -> texture id currently bound, so repeated binds are skipped
+    _bound = {}
+    # Bind statistics (see reset_bind_stats)
+    bind_requests = 0
+    binds = 0
+    
+    def __init__(self, filepath=None, image=None, wrap=gl.GL_REPEAT, min_filter=gl.GL_LINEAR,
+                 mag_filter=gl.GL_LINEAR, mipmaps=True):
+        """Load a texture from filepath, or upload a PIL image or pixel array.
+        
+        Images are uploaded as they are (RGB or RGBA, first row at the
+        bottom), which is how the procedural textures are generated and
+        what decode_texture_file returns. image may also be a list of mip
+        levels (level 0 first), as returned by TextureCache.
+        """
         self.texture_id = None
-        self._load_texture(filepath)
+        self.width = 0
+        self.height = 0
+        self.channels = 0
+        self.compression = None  # "bc1" / "bc3" when uploaded block-compressed
+        self.mipmaps = mipmaps
+        self._sampler = (wrap, min_filter, mag_filter)
+        self.registry_key = None  # Set when owned by TextureRegistry
+        
+        # Where reload() gets the pixels again after TextureResidency lowered or unloaded the texture
+        self.source = filepath
+        self.generator = None  # Set by TextureRegistry.acquire_generated
+        self.base_level = 0  # Mip levels currently dropped to save memory
+        
+        if image is not None:
+            self._upload(image)
+            if filepath:
+                print(f"✅ Texture loaded: {filepath} ({self.width}x{self.height}, pre-decoded)")
+        else:
+            self._load_texture(filepath)
     
     def _load_texture(self, filepath):
         """Load texture from file."""
         try:
             print(f"Loading texture: {filepath}")
+            self._upload(load_texture_pixels(filepath))
             
-            # Load image
-            image = Image.open(filepath)
-            
-            # Convert RGBA to RGB if it has an alpha channel
-            if image.mode == 'RGBA':
-                print(f"Converting RGBA to RGB (removing transparency)")
-                # Create a white background
-                background = Image.new('RGB', image.size, (255, 255, 255))
-                # Paste the image on the white background using the alpha channel as mask
-                background.paste(image, mask=image.split()[3])
-                image = background
-            elif image.mode != 'RGB':
-                image = image.convert('RGB')
-            
-            image = image.transpose(Image.FLIP_TOP_BOTTOM)
-            img_data = np.array(image, dtype=np.uint8)
-            
-            # Generate texture
-            self.texture_id = gl.glGenTextures(1)
-            gl.glBindTexture(gl.GL_TEXTURE_2D, self.texture_id)
-            
-            # Set texture parameters
-            gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_WRAP_S, gl.GL_REPEAT)
-            gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_WRAP_T, gl.GL_REPEAT)
-            gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MIN_FILTER, gl.GL_LINEAR)
-            gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MAG_FILTER, gl.GL_LINEAR)
-            
-            # Always use RGB format now (no transparency)
-            format = gl.GL_RGB
-            
-            # Upload texture data
-            gl.glTexImage2D(gl.GL_TEXTURE_2D, 0, format, image.width, image.height, 
-                          0, format, gl.GL_UNSIGNED_BYTE, img_data)
-            gl.glGenerateMipmap(gl.GL_TEXTURE_2D)
-            
-            print(f"✅ Texture loaded: {filepath} ({image.width}x{image.height})")
+            print(f"✅ Texture loaded: {filepath} ({self.width}x{self.height})")
             
         except Exception as e:
             print(f"❌ Failed to load texture {filepath}: {e}")
             raise
     
+    def _upload(self, image, streamed=False):
+        """Create the GL texture from an RGB or RGBA image, pixel array, mip chain or CompressedImage.
+        
+        streamed marks a reload by TextureResidency, expected while frames are drawn.
+        """
+        wrap, min_filter, mag_filter = self._sampler
+        
+        # Generate texture
+        self.texture_id = GpuResources.create_texture(self.source or "generated", streamed)
+        gl.glBindTexture(gl.GL_TEXTURE_2D, self.texture_id)
+        Texture._bound.clear()
+        
+        # Set texture parameters
+        gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_WRAP_S, wrap)
+        gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_WRAP_T, wrap)
+        gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MIN_FILTER, min_filter)
+        gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MAG_FILTER, mag_filter)
+        
+        if isinstance(image, CompressedImage):
+            self._upload_compressed(image)
+        else:
+            self._upload_pixels(image if isinstance(image, list) else [image])
+        if self.base_level == 0:
+            self.full_size_bytes = self.size_bytes
+        GpuResources.set_size(TEXTURE, self.texture_id, self.size_bytes)
+        TextureResidency.track(self)
+    
+    def _upload_pixels(self, levels):
+        """Upload raw RGB/RGBA levels (level 0 first), generating the rest of the chain if needed."""
+        img_data = np.asarray(levels[0], dtype=np.uint8)
+        height, width, channels = img_data.shape
+        format = gl.GL_RGBA if channels == 4 else gl.GL_RGB
+        
+        # Rows are tightly packed (RGB rows are not always a multiple of 4 bytes)
+        gl.glPixelStorei(gl.GL_UNPACK_ALIGNMENT, 1)
+        
+        # Upload texture data
+        gl.glTexImage2D(gl.GL_TEXTURE_2D, 0, format, width, height,
+                      0, format, gl.GL_UNSIGNED_BYTE, img_data)
+        if self.mipmaps and len(levels) > 1:
+            # Pre-built mip chain: upload level by level instead of generating on the driver
+            for level, level_data in enumerate(levels[1:], start=1):
+                level_height, level_width = level_data.shape[:2]
+                gl.glTexImage2D(gl.GL_TEXTURE_2D, level, format, level_width, level_height,
+                              0, format, gl.GL_UNSIGNED_BYTE, np.asarray(level_data))
+            gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MAX_LEVEL, len(levels) - 1)
+        elif self.mipmaps:
+            gl.glGenerateMipmap(gl.GL_TEXTURE_2D)
+        gl.glPixelStorei(gl.GL_UNPACK_ALIGNMENT, 4)
+        
+        self.width = width
+        self.height = height
+        self.channels = channels
+        self.compression = None
+    
+    def _upload_compressed(self, image):
+        """Upload pre-encoded BC blocks level by level; the driver never sees raw pixels."""
+        level_count = len(image) if self.mipmaps else 1
+        for level in range(level_count):
+            level_width, level_height = image.level_size(level)
+            gl.glCompressedTexImage2D(gl.GL_TEXTURE_2D, level, COMPRESSED_FORMATS[image.format],
+                                      level_width, level_height, 0, np.asarray(image[level]))
+        gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MAX_LEVEL, level_count - 1)
+        
+        self.width = image.width
+        self.height = image.height
+        self.channels = image.channels
+        self.compression = image.format
+    
+    @property
+    def size_bytes(self):
+        """GPU memory used, including the mip chain."""
+        return mip_chain_bytes(self.width, self.height, self.channels, self.mipmaps, self.compression)
+    
+    def can_reload(self):
+        """Whether the pixels can be fetched again after the GL texture is freed."""
+        return self.source is not None or self.generator is not None
+    
+    def _source_levels(self):
+        """The full-resolution mip chain, from the file or the generator."""
+        if self.source is not None:
+            return full_mip_chain(load_texture_pixels(self.source))
+        if self.generator is not None:
+            return full_mip_chain(np.asarray(self.generator(), dtype=np.uint8))
+        raise Exception("Texture has no file or generator to reload from")
+    
+    def reload(self, base_level=0):
+        """Re-create the GL texture from its source without its first base_level mip levels."""
+        levels = self._source_levels()
+        self.base_level = min(base_level, len(levels) - 1)
+        self._free()
+        self._upload(levels[self.base_level:], streamed=True)
+    
+    def unload(self):
+        """Free the GL texture but keep the object; the next bind() reloads it."""
+        self._free()
+    
     def bind(self, texture_unit=0):
-        """Bind texture to texture unit."""
-        if self.texture_id:
+        """Bind texture to texture unit (skipped if it is already bound there)."""
+        Texture.bind_requests += 1
+        TextureResidency.touch(self)
+        if self.texture_id and Texture._bound.get((texture_unit, self.target)) != self.texture_id:
             gl.glActiveTexture(gl.GL_TEXTURE0 + texture_unit)
-            gl.glBindTexture(gl.GL_TEXTURE_2D, self.texture_id)
+            gl.glBindTexture(self.target, self.texture_id)
+            Texture._bound[(texture_unit, self.target)] = self.texture_id
+            Texture.binds += 1
+    
+    @classmethod
+    def reset_bind_stats(cls):
+        """Reset the bind counters."""
+        cls.bind_requests = 0
+        cls.binds = 0
+    
+    def _free(self):
+        if self.texture_id:
+            GpuResources.delete_texture(self.texture_id)
+            Texture._bound.clear()
+            self.texture_id = None
+    
+    def delete(self):
+        """Free the GL texture now."""
+        self._free()
+        TextureResidency.untrack(self)
+
+
+class TextureRegistry:
+    """Process-wide cache of shared textures with reference counting.
+    
+    Textures are keyed by source (file path or generator name) plus sampler
+    settings, so every object asking for the same image gets the same GL
+    texture. Each acquire must be paired with a release; the texture is
+    deleted when its last reference is released. Failed loads are
+    remembered and raise again without touching the disk.
+    """
+    
+    _entries = {}  # key -> [texture, refcount]
+    _failures = {}  # key -> exception, so missing files are not retried per object
+    _decoded = {}  # file path -> image decoded by prefetch, waiting for upload
+    _requests = 0
+    _loads = 0
+    _load_seconds = 0.0
     
-    def __del__(self):
-        """Clean up texture."""
-        if hasattr(self, 'texture_id') and self.texture_id:
+    @staticmethod
+    def _key(source, wrap, min_filter, mag_filter, mipmaps):
+        return (source, int(wrap), int(min_filter), int(mag_filter), bool(mipmaps))
+    
+    @classmethod
+    def acquire(cls, filepath, wrap=gl.GL_REPEAT, min_filter=gl.GL_LINEAR,
+                mag_filter=gl.GL_LINEAR, mipmaps=True):
+        """Return the shared texture for an image file, loading it on first use.
+        
+        Raises like Texture() when the file cannot be loaded.
+        """
+        key = cls._key(filepath, wrap, min_filter, mag_filter, mipmaps)
+        return cls._acquire(key, lambda: Texture(filepath, cls._decoded.pop(filepath, None), wrap=wrap,
+                                                 min_filter=min_filter, mag_filter=mag_filter, mipmaps=mipmaps))
+    
+    @classmethod
+    def acquire_generated(cls, name, generator, wrap=gl.GL_REPEAT, min_filter=gl.GL_LINEAR,
+                          mag_filter=gl.GL_LINEAR, mipmaps=True):
+        """Return the shared texture for a procedural image.
+        
+        generator() returns a PIL image or pixel array and only runs on the
+        first request.
+        """
+        key = cls._key(f"generated:{name}", wrap, min_filter, mag_filter, mipmaps)
+        
+        def load():
+            texture = Texture(image=generator(), wrap=wrap, min_filter=min_filter,
+                              mag_filter=mag_filter, mipmaps=mipmaps)
+            texture.generator = generator
+            return texture
+        return cls._acquire(key, load)
+    
+    @classmethod
+    def _acquire(cls, key, load):
+        if key in cls._failures:
+            raise cls._failures[key]
+        
+        cls._requests += 1
+        entry = cls._entries.get(key)
+        if entry is None:
+            start = time.perf_counter()
             try:
-                gl.glDeleteTextures(1, [self.texture_id])
-            except:
-                pass
\ No newline at end of file
+                texture = load()
+            except Exception as e:
+                cls._failures[key] = e
+                raise
+            finally:
+                cls._load_seconds += time.perf_counter() - start
+            texture.registry_key = key
+            entry = [texture, 0]
+            cls._entries[key] = entry
+            cls._loads += 1
+        
+        entry[1] += 1
+        return entry[0]
+    
+    @classmethod
+    def register(cls, filepath, texture):
+        """Add a texture built elsewhere (e.g. a TextureArray layer) as the entry for filepath.
+        
+        Later acquire() calls with default sampler settings return it.
+        """
+        key = cls._key(filepath, gl.GL_REPEAT, gl.GL_LINEAR, gl.GL_LINEAR, True)
+        texture.registry_key = key
+        cls._entries[key] = [texture, 0]
+        cls._loads += 1
+    
+    @classmethod
+    def is_loaded(cls, filepath):
+        """Whether filepath already has a registered texture."""
+        return any(key[0] == filepath for key in cls._entries)
+    
+    @classmethod
+    def take_pixels(cls, filepath):
+        """Pixels for filepath: the prefetched result if there is one, otherwise loaded now."""
+        pixels = cls._decoded.pop(filepath, None)
+        return pixels if pixels is not None else load_texture_pixels(filepath)
+    
+    @classmethod
+    def prefetched(cls, filepath, pixels):
+        """Hand decoded pixels back so the next acquire() uploads them without decoding again."""
+        cls._decoded[filepath] = pixels
+    
+    @classmethod
+    def prefetch(cls, filepaths, max_workers=None):
+        """Decode image files on a thread pool ahead of acquire().
+        
+        Only decoding runs in parallel; the GL upload still happens on the
+        calling thread when an object acquires the texture. Files that fail
+        to decode are listed here, skipped, and reported by acquire() as
+        usual. Returns the wall time spent, in seconds.
+        """
+        start = time.perf_counter()
+        loaded = {key[0] for key in cls._entries}
+        pending = [path for path in dict.fromkeys(filepaths) if path not in loaded and path not in cls._decoded]
+        decoded = 0
+        failed = []
+        if pending:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                futures = [(path, pool.submit(load_texture_pixels, path)) for path in pending]
+                for path, future in futures:
+                    try:
+                        cls._decoded[path] = future.result()
+                        decoded += 1
+                    except Exception as e:
+                        failed.append((path, e))
+        
+        elapsed = time.perf_counter() - start
+        print(f"✅ Decoded {decoded} of {len(pending)} textures in parallel ({elapsed * 1000:.0f} ms)")
+        for path, error in failed:
+            print(f"⚠️  Could not decode {path}: {error}")
+        return elapsed
+    
+    @classmethod
+    def release(cls, texture):
+        """Drop one reference; the texture is deleted with its last reference."""
+        key = getattr(texture, "registry_key", None)
+        entry = cls._entries.get(key)
+        if entry is None or entry[0] is not texture:
+            return
+        
+        entry[1] -= 1
+        if entry[1] <= 0:
+            del cls._entries[key]
+            texture.delete()
+    
+    @classmethod
+    def release_all(cls):
+        """Delete every registered texture (e.g. before the GL context goes away)."""
+        for texture, _ in cls._entries.values():
+            texture.delete()
+        cls._entries.clear()
+        cls._failures.clear()
+        cls._decoded.clear()
+    
+    @classmethod
+    def refcount(cls, texture):
+        """Number of live references to a registered texture."""
+        entry = cls._entries.get(getattr(texture, "registry_key", None))
+        return entry[1] if entry is not None and entry[0] is texture else 0
+    
+    @classmethod
+    def duplicate_loads(cls):
+        """Requests served from the registry instead of creating a new texture."""
+        return cls._requests - cls._loads
+    
+    @classmethod
+    def saved_bytes(cls):
+        """GPU memory that per-object copies of the live textures would have used."""
+        return sum(texture.size_bytes * max(refs - 1, 0) for texture, refs in cls._entries.values())
+    
+    @classmethod
+    def report(cls):
+        """Print how much loading and memory sharing has saved."""
+        resident = sum(texture.size_bytes for texture, _ in cls._entries.values())
+        print(f"✅ Texture registry: {len(cls._entries)} textures for {cls._requests} requests, "
+              f"{cls.duplicate_loads()} duplicate loads avoided, "
+              f"{resident / (1024 * 1024):.1f} MB resident, "
+              f"{cls.saved_bytes() / (1024 * 1024):.1f} MB VRAM saved, "
+              f"{cls._load_seconds * 1000:.0f} ms loading on the main thread")
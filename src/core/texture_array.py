@@ -0,0 +1,193 @@
+"""
+Texture arrays: equally sized textures packed as layers of one GL_TEXTURE_2D_ARRAY.
+"""
+
+import OpenGL.GL as gl
+import numpy as np
+import time
+from core.gpu_resources import TEXTURE, GpuResources
+from core.texture import COMPRESSED_FORMATS, Texture, TextureRegistry, full_mip_chain, load_texture_pixels
+from core.texture_residency import TextureResidency
+from utils.block_compression import CompressedImage
+
+
+class TextureArray(Texture):
+    """A GL_TEXTURE_2D_ARRAY whose layers are images of the same size and format.
+    
+    Objects sample a layer by index, so drawing with any texture of the
+    array needs no new bind. Arrays are used rather than atlases because
+    the scene's textures tile with GL_REPEAT, which an atlas cannot do.
+    """
+    
+    target = gl.GL_TEXTURE_2D_ARRAY
+    
+    def __init__(self, layers, wrap=gl.GL_REPEAT, min_filter=gl.GL_LINEAR,
+                 mag_filter=gl.GL_LINEAR, mipmaps=True, sources=None):
+        """Upload layers: pixel arrays, mip chains (lists of levels) or CompressedImages, all the same shape.
+        
+        sources are the layers' image files, needed to reload the array
+        after TextureResidency lowered or unloaded it.
+        """
+        self.texture_id = None
+        self.mipmaps = mipmaps
+        self.registry_key = None
+        self.layer_count = len(layers)
+        self._live_layers = self.layer_count
+        self._sampler = (wrap, min_filter, mag_filter)
+        self.sources = sources
+        self.source = None
+        self.generator = None
+        self.base_level = 0
+        self._upload_layers([layer if isinstance(layer, (list, CompressedImage)) else [layer] for layer in layers])
+        
+    def _upload_layers(self, chains, streamed=False):
+        """Create the GL array from one mip chain (or single level) per layer (streamed: see Texture._upload)."""
+        level_count = min(len(chain) for chain in chains) if self.mipmaps else 1
+        compressed = isinstance(chains[0], CompressedImage)
+        self.height, self.width, self.channels = chains[0].shape if compressed else np.shape(chains[0][0])
+        self.compression = chains[0].format if compressed else None
+        format = gl.GL_RGBA if self.channels == 4 else gl.GL_RGB
+        wrap, min_filter, mag_filter = self._sampler
+        
+        self.texture_id = GpuResources.create_texture(f"array of {self.layer_count} layers", streamed)
+        gl.glBindTexture(gl.GL_TEXTURE_2D_ARRAY, self.texture_id)
+        Texture._bound.clear()
+        
+        gl.glTexParameteri(gl.GL_TEXTURE_2D_ARRAY, gl.GL_TEXTURE_WRAP_S, wrap)
+        gl.glTexParameteri(gl.GL_TEXTURE_2D_ARRAY, gl.GL_TEXTURE_WRAP_T, wrap)
+        gl.glTexParameteri(gl.GL_TEXTURE_2D_ARRAY, gl.GL_TEXTURE_MIN_FILTER, min_filter)
+        gl.glTexParameteri(gl.GL_TEXTURE_2D_ARRAY, gl.GL_TEXTURE_MAG_FILTER, mag_filter)
+        
+        if compressed:
+            # Blocks of all layers back to back make one level of the compressed array
+            for level in range(level_count):
+                level_width, level_height = chains[0].level_size(level)
+                data = np.concatenate([np.asarray(chain[level]) for chain in chains])
+                gl.glCompressedTexImage3D(gl.GL_TEXTURE_2D_ARRAY, level, COMPRESSED_FORMATS[self.compression],
+                                          level_width, level_height, self.layer_count, 0, data)
+            gl.glTexParameteri(gl.GL_TEXTURE_2D_ARRAY, gl.GL_TEXTURE_MAX_LEVEL, level_count - 1)
+            self._track_upload()
+            return
+        
+        gl.glPixelStorei(gl.GL_UNPACK_ALIGNMENT, 1)
+        for level in range(level_count):
+            level_height, level_width = np.shape(chains[0][level])[:2]
+            gl.glTexImage3D(gl.GL_TEXTURE_2D_ARRAY, level, format, level_width, level_height,
+                            self.layer_count, 0, format, gl.GL_UNSIGNED_BYTE, None)
+            for index, chain in enumerate(chains):
+                gl.glTexSubImage3D(gl.GL_TEXTURE_2D_ARRAY, level, 0, 0, index, level_width, level_height, 1,
+                                   format, gl.GL_UNSIGNED_BYTE, np.asarray(chain[level], dtype=np.uint8))
+        
+        if self.mipmaps and level_count > 1:
+            gl.glTexParameteri(gl.GL_TEXTURE_2D_ARRAY, gl.GL_TEXTURE_MAX_LEVEL, level_count - 1)
+        elif self.mipmaps:
+            gl.glGenerateMipmap(gl.GL_TEXTURE_2D_ARRAY)
+        gl.glPixelStorei(gl.GL_UNPACK_ALIGNMENT, 4)
+        self._track_upload()
+        
+    def _track_upload(self):
+        if self.base_level == 0:
+            self.full_size_bytes = self.size_bytes
+        GpuResources.set_size(TEXTURE, self.texture_id, self.size_bytes)
+        TextureResidency.track(self)
+    
+    @property
+    def size_bytes(self):
+        """Approximate GPU memory used by all layers, including mip chains."""
+        return super().size_bytes * self.layer_count
+    
+    def can_reload(self):
+        return self.sources is not None
+    
+    def reload(self, base_level=0):
+        """Re-create the array from the layers' files without their first base_level mip levels."""
+        chains = [full_mip_chain(load_texture_pixels(path)) for path in self.sources]
+        self.base_level = min(base_level, min(len(chain) for chain in chains) - 1)
+        self._free()
+        self._upload_layers([chain[self.base_level:] for chain in chains], streamed=True)
+    
+    def layer(self, index):
+        """Handle for one layer, usable wherever a Texture is expected."""
+        return TextureLayer(self, index)
+    
+    def _release_layer(self):
+        """Called when a layer handle is deleted; the array goes with its last layer."""
+        self._live_layers -= 1
+        if self._live_layers <= 0:
+            self.delete()
+
+
+class TextureLayer:
+    """One layer of a TextureArray.
+    
+    bind() binds the whole array; shaders pick the layer from the
+    textureLayer uniform (see ShaderVariants.use_texture).
+    """
+    
+    def __init__(self, array, layer):
+        self.array = array
+        self.layer = layer
+        self.registry_key = None
+        self.width = array.width
+        self.height = array.height
+        self.channels = array.channels
+    
+    @property
+    def texture_id(self):
+        return self.array.texture_id
+    
+    @property
+    def size_bytes(self):
+        return self.array.size_bytes // self.array.layer_count
+    
+    def bind(self, texture_unit=0):
+        """Bind the array this layer belongs to."""
+        self.array.bind(texture_unit)
+    
+    def delete(self):
+        """Drop this layer; the array is freed once all its layers are."""
+        if self.array is not None:
+            self.array._release_layer()
+            self.array = None
+
+
+def build_texture_arrays(filepaths, min_layers=2):
+    """Pack texture files of the same size and format into TextureArrays.
+    
+    Each layer is registered with TextureRegistry under its file path, so
+    objects keep acquiring textures by path as before. Files that fail to
+    load or have no same-sized partner are left for normal loading.
+    Returns the arrays created.
+    """
+    groups = {}
+    for path in dict.fromkeys(filepaths):
+        if TextureRegistry.is_loaded(path):
+            continue
+        try:
+            pixels = TextureRegistry.take_pixels(path)
+        except Exception:
+            continue
+        if isinstance(pixels, CompressedImage):
+            # Compressed layers only share an array with layers in the same block format
+            key = (pixels.format, pixels.shape)
+        else:
+            key = (None, np.shape(pixels[0] if isinstance(pixels, list) else pixels))
+        groups.setdefault(key, []).append((path, pixels))
+    
+    arrays = []
+    for (compression, shape), members in groups.items():
+        if len(members) < min_layers:
+            for path, pixels in members:
+                TextureRegistry.prefetched(path, pixels)
+            continue
+        
+        start = time.perf_counter()
+        array = TextureArray([pixels for _, pixels in members], sources=[path for path, _ in members])
+        for index, (path, _) in enumerate(members):
+            TextureRegistry.register(path, array.layer(index))
+        arrays.append(array)
+        kind = f" {compression.upper()}" if compression else ""
+        print(f"✅ Texture array {shape[1]}x{shape[0]}{kind}: {len(members)} layers "
+              f"({', '.join(path.rsplit('/', 1)[-1] for path, _ in members)}) "
+              f"uploaded in {(time.perf_counter() - start) * 1000:.0f} ms")
+    return arrays
@@ -0,0 +1,212 @@
+"""
+On-disk cache of decoded textures with their full mip chains, raw or block-compressed.
+"""
+
+import hashlib
+import os
+import struct
+import numpy as np
+from core.texture import decode_texture_file
+from utils.atomic_write import atomic_write
+from utils.block_compression import CompressedImage, compress_chain, compressed_size
+
+
+def build_mip_chain(pixels):
+    """Return [level0, level1, ...] down to 1x1, each a 2x2 box filter of the previous level."""
+    levels = [np.ascontiguousarray(pixels, dtype=np.uint8)]
+    while levels[-1].shape[0] > 1 or levels[-1].shape[1] > 1:
+        level = levels[-1]
+        height, width, channels = level.shape
+        fy = 2 if height > 1 else 1
+        fx = 2 if width > 1 else 1
+        new_height, new_width = height // fy, width // fx
+        
+        # Odd sizes drop their last row/column, like a plain box filter
+        blocks = level[:new_height * fy, :new_width * fx].astype(np.uint32)
+        blocks = blocks.reshape(new_height, fy, new_width, fx, channels).sum(axis=(1, 3))
+        count = fy * fx
+        levels.append(((blocks + count // 2) // count).astype(np.uint8))
+    return levels
+
+
+class TextureCache:
+    """Decoded, pre-flipped pixel data and mip levels stored next to each other in one file.
+    
+    File layout: a fixed header, then every mip level's rows back to back
+    (level 0 first, no padding), so each level can be np.memmap-ed and handed
+    straight to glTexImage2D. An entry is valid while the source file's
+    modification time and size match; if only the time changed, the stored
+    content hash decides.
+    """
+    
+    MAGIC = b"RVTX"
+    VERSION = 1
+    EXTENSION = ".rvtx"
+    # magic, version, width, height, channels, levels, source mtime_ns, source size, source sha1
+    HEADER = struct.Struct("<4sIIIIIqQ20s")
+    
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+    
+    def _path(self, filepath):
+        name = os.path.splitext(os.path.basename(filepath))[0]
+        digest = hashlib.sha1(os.path.abspath(filepath).encode()).hexdigest()[:12]
+        return os.path.join(self.cache_dir, f"{name}-{digest}{self.EXTENSION}")
+    
+    @staticmethod
+    def _file_hash(filepath):
+        with open(filepath, 'rb') as file:
+            return hashlib.sha1(file.read()).digest()
+    
+    def _read_header(self, filepath):
+        """Header of the entry for filepath, or None if not cached or stale."""
+        path = self._path(filepath)
+        try:
+            source = os.stat(filepath)
+            with open(path, 'rb') as file:
+                header = self.HEADER.unpack(file.read(self.HEADER.size))
+        except (OSError, struct.error):
+            return None
+        
+        magic, version, width, height, channels, level_count, mtime_ns, size, sha1 = header
+        if magic != self.MAGIC or version != self.VERSION or size != source.st_size:
+            return None
+        if mtime_ns != source.st_mtime_ns:
+            # Touched or checked out again: only the content counts
+            if sha1 != self._file_hash(filepath):
+                return None
+            with open(path, 'r+b') as file:
+                file.write(self.HEADER.pack(magic, version, width, height, channels, level_count,
+                                            source.st_mtime_ns, size, sha1))
+        return header
+    
+    def load(self, filepath):
+        """Return the memory-mapped mip levels for filepath, or None if not cached or stale."""
+        header = self._read_header(filepath)
+        if header is None:
+            return None
+        _, _, width, height, channels, level_count, _, _, _ = header
+        path = self._path(filepath)
+        
+        levels = []
+        offset = self.HEADER.size
+        try:
+            for level in range(level_count):
+                shape = (max(1, height >> level), max(1, width >> level), channels)
+                levels.append(np.memmap(path, dtype=np.uint8, mode='r', offset=offset, shape=shape))
+                offset += shape[0] * shape[1] * channels
+        except (OSError, ValueError):
+            # Truncated file
+            return None
+        return levels
+    
+    def store(self, filepath, levels):
+        """Write the mip levels of filepath to the cache."""
+        source = os.stat(filepath)
+        height, width, channels = np.shape(levels[0]) if isinstance(levels, list) else levels.shape
+        with atomic_write(self._path(filepath)) as file:
+            file.write(self.HEADER.pack(self.MAGIC, self.VERSION, width, height, channels, len(levels),
+                                        source.st_mtime_ns, source.st_size, self._file_hash(filepath)))
+            for level in levels:
+                file.write(level.tobytes())
+    
+    def load_or_build(self, filepath):
+        """Return the mip levels for filepath, decoding and caching them on a miss.
+        
+        Safe to call from worker threads (no GL calls).
+        """
+        levels = self.load(filepath)
+        if levels is not None:
+            self.hits += 1
+            return levels
+        
+        levels = build_mip_chain(decode_texture_file(filepath))
+        self.misses += 1
+        try:
+            self.store(filepath, levels)
+        except OSError as e:
+            print(f"⚠️  Could not cache texture {filepath}: {e}")
+        return levels
+    
+    def clear(self):
+        """Remove every cached texture."""
+        if not os.path.isdir(self.cache_dir):
+            return
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(self.EXTENSION):
+                os.remove(os.path.join(self.cache_dir, name))
+
+
+class CompressedTextureCache(TextureCache):
+    """Like TextureCache, but each mip level is stored as BC1 (RGB) or BC3 (RGBA) blocks.
+    
+    Same header, with channels telling the two formats apart. Entries are
+    keyed by the texture path as the scene names it (relative to the
+    project), so baked directories can be copied to other machines.
+    Encoding is slow in NumPy, so entries are baked offline by
+    compress_textures.py; load() only reads them.
+    """
+    
+    MAGIC = b"RVBC"
+    EXTENSION = ".rvbc"
+    
+    def __init__(self, cache_dir, raw_cache=None):
+        super().__init__(cache_dir)
+        # Where load_or_build gets uncompressed mip chains from (None decodes the file)
+        self.raw_cache = raw_cache
+    
+    def _path(self, filepath):
+        name = os.path.splitext(os.path.basename(filepath))[0]
+        digest = hashlib.sha1(os.path.normpath(filepath).replace(os.sep, "/").encode()).hexdigest()[:12]
+        return os.path.join(self.cache_dir, f"{name}-{digest}{self.EXTENSION}")
+    
+    def load(self, filepath):
+        """Return the memory-mapped CompressedImage for filepath, or None if not cached or stale."""
+        header = self._read_header(filepath)
+        if header is None:
+            return None
+        _, _, width, height, channels, level_count, _, _, _ = header
+        path = self._path(filepath)
+        format = "bc3" if channels == 4 else "bc1"
+        
+        levels = []
+        offset = self.HEADER.size
+        try:
+            for level in range(level_count):
+                size = compressed_size(max(1, width >> level), max(1, height >> level), format)
+                levels.append(np.memmap(path, dtype=np.uint8, mode='r', offset=offset, shape=(size,)))
+                offset += size
+        except (OSError, ValueError):
+            return None
+        return CompressedImage(format, width, height, levels)
+    
+    def load_baked(self, filepath):
+        """Return the baked entry for filepath or None, counting hits and misses (never encodes)."""
+        image = self.load(filepath)
+        if image is None:
+            if os.path.exists(filepath):
+                self.misses += 1
+        else:
+            self.hits += 1
+        return image
+    
+    def load_or_build(self, filepath):
+        """Return the compressed mip chain for filepath, encoding and caching it on a miss."""
+        image = self.load(filepath)
+        if image is not None:
+            self.hits += 1
+            return image
+        return self.build(filepath)
+    
+    def build(self, filepath):
+        """Encode filepath's mip chain and store it, replacing any existing entry."""
+        if self.raw_cache is not None:
+            levels = self.raw_cache.load_or_build(filepath)
+        else:
+            levels = build_mip_chain(decode_texture_file(filepath))
+        image = compress_chain(levels)
+        self.misses += 1
+        self.store(filepath, image)
+        return image
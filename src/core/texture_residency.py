@@ -0,0 +1,154 @@
+"""
+GPU texture memory budget: least-recently-bound textures drop mip levels or are unloaded.
+"""
+
+import weakref
+
+
+class TextureResidency:
+    """Tracks every live texture and keeps their GPU memory under budget_bytes.
+    
+    Textures report each bind through touch(). Once per frame end_frame()
+    checks the resident bytes (mip chains included) against the budget and,
+    least recently bound first:
+    
+    1. unloads textures that have not been bound for idle_frames frames,
+    2. re-uploads the others without their largest mip level (a quarter of
+       the memory per step), at most max_dropped_levels times.
+    
+    An unloaded texture is reloaded from its file (or generator) the next
+    time it is bound; a lowered one gets its full resolution back once it is
+    in use and there is room again. Reloads are cheapest with the texture
+    cache enabled, which keeps the mip chains memory-mapped on disk.
+    """
+    
+    # None disables eviction; textures are still counted
+    budget_bytes = None
+    idle_frames = 300
+    max_dropped_levels = 2
+    
+    _textures = weakref.WeakSet()
+    _clock = 0  # Bind counter used to order textures by last use
+    frame = 0
+    
+    # Statistics since startup
+    unloads = 0
+    demotions = 0
+    promotions = 0
+    reloads = 0
+    _warned = False
+    
+    @classmethod
+    def track(cls, texture):
+        """Start accounting a texture that now has GPU storage."""
+        if not hasattr(texture, "last_used"):
+            texture.last_used = 0
+            texture.last_frame = cls.frame
+            texture.lowest_level = None  # base_level at which the mip chain ran out, once known
+        cls._textures.add(texture)
+    
+    @classmethod
+    def untrack(cls, texture):
+        """Stop accounting a texture that was deleted for good."""
+        cls._textures.discard(texture)
+    
+    @classmethod
+    def touch(cls, texture):
+        """Record a bind; reloads the texture first if it was unloaded."""
+        if texture.texture_id is None and texture.can_reload():
+            texture.reload(texture.base_level)
+            cls.reloads += 1
+        cls._clock += 1
+        texture.last_used = cls._clock
+        texture.last_frame = cls.frame
+    
+    @classmethod
+    def resident_bytes(cls):
+        return sum(texture.size_bytes for texture in cls._textures if texture.texture_id)
+    
+    @classmethod
+    def end_frame(cls):
+        """Apply the budget after a frame has been drawn."""
+        if cls.budget_bytes is not None:
+            cls._enforce()
+        cls.frame += 1
+    
+    @classmethod
+    def _enforce(cls):
+        candidates = sorted((texture for texture in cls._textures if texture.texture_id and texture.can_reload()),
+                            key=lambda texture: texture.last_used)
+        over = cls.resident_bytes() - cls.budget_bytes
+        
+        # Textures nobody has drawn with for a while go first
+        for texture in candidates:
+            if over <= 0:
+                break
+            if cls.frame - texture.last_frame >= cls.idle_frames:
+                over -= texture.size_bytes
+                texture.unload()
+                cls.unloads += 1
+        
+        # Then lower the resolution of the rest, one mip level per texture and round
+        while over > 0:
+            lowered = False
+            for texture in candidates:
+                if over <= 0:
+                    break
+                if (texture.texture_id and texture.base_level < cls.max_dropped_levels
+                        and texture.base_level != texture.lowest_level):
+                    before_level, before = texture.base_level, texture.size_bytes
+                    texture.reload(texture.base_level + 1)
+                    if texture.base_level <= before_level and texture.size_bytes >= before:
+                        # Too few mip levels to drop another one (2x2 and smaller)
+                        texture.lowest_level = texture.base_level
+                        continue
+                    over -= before - texture.size_bytes
+                    cls.demotions += 1
+                    lowered = True
+            if not lowered:
+                break
+        
+        if over > 0:
+            if not cls._warned:
+                print(f"⚠️  Texture budget exceeded by {over / (1024 * 1024):.1f} MB "
+                      f"with every texture at its lowest allowed resolution")
+                cls._warned = True
+            return
+        
+        # Room to spare: give one lowered texture drawn this frame its full resolution back
+        in_use = [texture for texture in candidates
+                  if texture.texture_id and texture.base_level > 0 and texture.last_frame == cls.frame]
+        for texture in sorted(in_use, key=lambda texture: -texture.last_used):
+            if texture.full_size_bytes - texture.size_bytes <= -over:
+                texture.reload(0)
+                cls.promotions += 1
+                break
+    
+    @classmethod
+    def stats(cls):
+        """Residency numbers for sizing deployments."""
+        textures = list(cls._textures)
+        return {
+            "budget_bytes": cls.budget_bytes,
+            "resident_bytes": cls.resident_bytes(),
+            "full_resolution_bytes": sum(texture.full_size_bytes for texture in textures),
+            "textures": len(textures),
+            "resident": sum(1 for texture in textures if texture.texture_id),
+            "lowered": sum(1 for texture in textures if texture.texture_id and texture.base_level > 0),
+            "unloaded": sum(1 for texture in textures if not texture.texture_id),
+            "unloads": cls.unloads,
+            "demotions": cls.demotions,
+            "promotions": cls.promotions,
+            "reloads": cls.reloads,
+        }
+    
+    @classmethod
+    def report(cls, prefix="✅ Texture residency"):
+        stats = cls.stats()
+        megabytes = 1024 * 1024
+        budget = "no budget" if stats["budget_bytes"] is None else f"budget {stats['budget_bytes'] / megabytes:.1f} MB"
+        print(f"{prefix}: {stats['resident_bytes'] / megabytes:.1f} MB resident "
+              f"({stats['full_resolution_bytes'] / megabytes:.1f} MB at full resolution, {budget}), "
+              f"{stats['resident']} of {stats['textures']} textures resident, {stats['lowered']} lowered, "
+              f"{stats['unloaded']} unloaded; {stats['unloads']} unloads, {stats['demotions']} mip drops, "
+              f"{stats['promotions']} restores, {stats['reloads']} reloads on bind")
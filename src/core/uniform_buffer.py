@@ -0,0 +1,74 @@
+"""
+Uniform buffer objects shared by all shader programs.
+"""
+
+import OpenGL.GL as gl
+import numpy as np
+from core.gpu_resources import BUFFER, GpuResources
+
+
+class UniformBuffer:
+    """A uniform buffer object attached to a fixed binding point."""
+    
+    def __init__(self, size, binding):
+        """Allocate a buffer of size bytes and attach it to a binding point."""
+        self.size = size
+        self.binding = binding
+        self._last_data = None
+        
+        self.ubo_id = GpuResources.create_buffer(f"uniform block {binding}")
+        gl.glBindBuffer(gl.GL_UNIFORM_BUFFER, self.ubo_id)
+        gl.glBufferData(gl.GL_UNIFORM_BUFFER, size, None, gl.GL_DYNAMIC_DRAW)
+        GpuResources.set_size(BUFFER, self.ubo_id, size)
+        gl.glBindBuffer(gl.GL_UNIFORM_BUFFER, 0)
+        
+        gl.glBindBufferBase(gl.GL_UNIFORM_BUFFER, binding, self.ubo_id)
+    
+    def update(self, data):
+        """Upload data (a float32 array) unless it matches the last upload."""
+        data_bytes = data.tobytes()
+        if data_bytes == self._last_data:
+            return False
+        
+        gl.glBindBuffer(gl.GL_UNIFORM_BUFFER, self.ubo_id)
+        gl.glBufferSubData(gl.GL_UNIFORM_BUFFER, 0, len(data_bytes), data)
+        gl.glBindBuffer(gl.GL_UNIFORM_BUFFER, 0)
+        self._last_data = data_bytes
+        return True
+    
+    def delete(self):
+        """Free the buffer."""
+        GpuResources.delete_buffer(self.ubo_id)
+        self.ubo_id = None
+
+
+class FrameUniforms(UniformBuffer):
+    """Per-frame camera and light state, read by shaders as the FrameData block.
+    
+    std140 layout (must match assets/shaders):
+        mat4 view;          offset 0
+        mat4 projection;    offset 64
+        vec4 lightPos;      offset 128
+        vec4 viewPos;       offset 144
+        vec4 lightColor;    offset 160
+    """
+    
+    BLOCK_NAME = "FrameData"
+    BINDING = 0
+    
+    def __init__(self):
+        self.data = np.zeros(44, dtype=np.float32)
+        super().__init__(self.data.nbytes, self.BINDING)
+    
+    def bind_to(self, shader):
+        """Connect a shader's FrameData block to this buffer."""
+        return shader.bind_uniform_block(self.BLOCK_NAME, self.binding)
+    
+    def update_frame(self, view, projection, light_pos, view_pos, light_color=(1.0, 1.0, 1.0)):
+        """Fill the block for the current frame and upload it once."""
+        self.data[0:16] = view
+        self.data[16:32] = projection
+        self.data[32:35] = light_pos
+        self.data[36:39] = view_pos
+        self.data[40:43] = light_color
+        return self.update(self.data)
@@ -5,12 +5,22 @@ Advanced mountain generation using pure Python noise functions.
 import numpy as np
 import math
 import random
+from rendering.lod import LodMesh
 from rendering.mesh import Mesh
-from core.texture import Texture
+from rendering.mesh_cache import Geometry
+from rendering.vertex_format import COMPACT_FORMAT
+from core.texture import TextureRegistry
 from utils.transformations import create_model_matrix
 
 
 class AdvancedMountain:
+    TEXTURE_PATHS = {
+        "hill": "assets/textures/hill_texture.png",
+    }
+    
+    # Recompute the normals from the slopes instead of keeping the constant up normal
+    smooth_normals = False
+    
     def __init__(self, shader, position=(0, 0, 0), size=12.0, max_height=8.0, seed=42):
         self.shader = shader
         self.position = position
@@ -18,13 +28,14 @@ class AdvancedMountain:
         self.max_height = max_height
         self.seed = seed
         self.texture = None
+        self.lod_level = 0
         
         random.seed(seed)
         np.random.seed(seed)
         
         # Load hill texture
         try:
-            self.texture = Texture("assets/textures/hill_texture.png")
+            self.texture = TextureRegistry.acquire(self.TEXTURE_PATHS["hill"])
             print("✅ Hill texture loaded")
         except:
             print("⚠️  Hill texture not found, using fallback color")
@@ -69,8 +80,15 @@ class AdvancedMountain:
     def _generate_advanced_mountain(self):
         """Generate the mountain mesh."""
         print("Building advanced mountain...")
-        width, depth = 40, 40
+        # The heightmap has no random part, so mountains of the same size share one entry whatever their seed
+        vertices = Geometry(self._generate_vertices, 40, 40, state=(self.size, self.max_height))
+        self.mountain_mesh = Mesh.indexed(vertices, texture=self.texture, smooth_normals=self.smooth_normals,
+                                          name="AdvancedMountain", vertex_format=COMPACT_FORMAT)
+        self.mountain_lod = LodMesh.generate(self.mountain_mesh, name="AdvancedMountain")
+        print("✅ Advanced mountain generated!")
         
+    def _generate_vertices(self, width, depth):
+        """Triangle soup of the heightmap (a function of size and max_height, so it can be cached)."""
         heightmap = self._generate_heightmap(width, depth)
         
         vertices = []
@@ -89,7 +107,7 @@ class AdvancedMountain:
                 x10 = ((j + 1) / (width - 1) - 0.5) * self.size
                 z10 = ((i + 1) / (depth - 1) - 0.5) * self.size
                 
-                # Simple normal
+                # Up normal: only its side is kept, Mesh.indexed smooths the normals
                 normal = [0.0, 1.0, 0.0]
                 
                 # Triangle 1
@@ -102,21 +120,21 @@ class AdvancedMountain:
                 vertices.extend([x10, h11, z10, normal[0], normal[1], normal[2], ((j+1)/width)*tex_repeat, ((i+1)/depth)*tex_repeat])
                 vertices.extend([x00, h01, z10, normal[0], normal[1], normal[2], (j/width)*tex_repeat, ((i+1)/depth)*tex_repeat])
         
-        self.mountain_mesh = Mesh(np.array(vertices, dtype=np.float32), texture=self.texture)
-        print("✅ Advanced mountain generated!")
+        return np.array(vertices, dtype=np.float32)
+    
+    def world_bounds(self):
+        """World-space bounding box of the mountain."""
+        return self.mountain_mesh.bounds.translated(self.position)
     
-    def draw(self, view, projection, light_pos, view_pos):
+    def draw(self):
         """Draw the mountain."""
         self.shader.use()
-        self.shader.set_mat4("view", view)
-        self.shader.set_mat4("projection", projection)
-        self.shader.set_vec3("lightPos", light_pos)
-        self.shader.set_vec3("viewPos", view_pos)
-        self.shader.set_vec3("lightColor", (1.0, 1.0, 1.0))
         
         model = create_model_matrix(position=self.position)
         self.shader.set_mat4("model", model)
         self.shader.set_vec3("objectColor", (0.6, 0.5, 0.3))
-        self.shader.set_bool("useTexture", self.texture is not None)
+        self.shader.set_textured(self.texture is not None)
         
-        self.mountain_mesh.draw(self.shader)
\ No newline at end of file
+        center = np.add(self.position, self.mountain_mesh.bounding_sphere.center)
+        self.lod_level = self.mountain_lod.select(center, self.lod_level)
+        self.mountain_lod.draw(self.shader, self.lod_level)
\ No newline at end of file
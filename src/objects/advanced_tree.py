@@ -5,27 +5,38 @@ Advanced tree generation with procedural trunks and branching foliage.
 import numpy as np
 import math
 import random
+from rendering.lod import LodMesh
 from rendering.mesh import Mesh
-from core.texture import Texture
+from rendering.mesh_cache import Geometry
+from rendering.vertex_format import COMPACT_FORMAT
+from core.texture import TextureRegistry
 from utils.transformations import create_model_matrix
 
 
 class AdvancedTree:
     """Procedurally generated tree with trunk branches and complex foliage."""
     
+    TEXTURE_PATHS = {
+        "leaf": "assets/textures/leafs.png",
+    }
+    
+    # Random numbers the foliage draws: four per sphere, 3 + cluster spheres in each of the 5 clusters
+    FOLIAGE_RANDOM_DRAWS = 4 * sum(3 + cluster for cluster in range(5))
+    
     def __init__(self, shader, position=(0, 0, 0), height=3.0, seed=42):
         self.shader = shader
         self.position = position
         self.height = height
         self.seed = seed
         self.leaf_texture = None
+        self.lod_level = 0
         
         random.seed(seed)
         np.random.seed(seed)
         
         # Load leaf texture (optional)
         try:
-            self.leaf_texture = Texture("assets/textures/leafs.png")
+            self.leaf_texture = TextureRegistry.acquire(self.TEXTURE_PATHS["leaf"])
             print("✅ Leaf texture loaded")
         except:
             self.leaf_texture = None
@@ -80,7 +91,8 @@ class AdvancedTree:
         return vertices
     
     def _generate_foliage(self):
-        """Generate complex foliage clusters."""
+        """Generate complex foliage clusters (a function of height and seed only, so it can be cached)."""
+        rng = random.Random(self.seed)
         vertices = []
         foliage_clusters = 5
         
@@ -95,15 +107,15 @@ class AdvancedTree:
             num_spheres = 3 + cluster_idx
             for sphere_idx in range(num_spheres):
                 # Random offset from trunk
-                angle = random.random() * 2 * math.pi
-                distance = (0.15 + random.random() * 0.25) * self.height
+                angle = rng.random() * 2 * math.pi
+                distance = (0.15 + rng.random() * 0.25) * self.height
                 
                 sphere_x = math.cos(angle) * distance
                 sphere_z = math.sin(angle) * distance
-                sphere_center_y = cluster_z + random.random() * (self.height * 0.15)
+                sphere_center_y = cluster_z + rng.random() * (self.height * 0.15)
                 
                 # Foliage sphere radius - REDUCED
-                sphere_radius = self.height * (0.12 + random.random() * 0.08)
+                sphere_radius = self.height * (0.12 + rng.random() * 0.08)
                 
                 # Generate sphere vertices
                 lat_segments = 8
@@ -166,27 +178,32 @@ class AdvancedTree:
         """Generate complete tree geometry."""
         print("Building advanced tree...")
         
-        # Generate foliage only (no trunk)
-        foliage_vertices = self._generate_foliage()
+        # Foliage only (no trunk), with texture, plus simplified versions for distant trees
+        foliage = Geometry(self._generate_foliage, state=(self.height, self.seed))
+        self.foliage_mesh = Mesh.indexed(foliage, texture=self.leaf_texture, name="AdvancedTree",
+                                         vertex_format=COMPACT_FORMAT)
+        self.foliage_lod = LodMesh.generate(self.foliage_mesh, name="AdvancedTree")
         
-        # Create mesh for foliage only with texture
-        if foliage_vertices:
-            self.foliage_mesh = Mesh(np.array(foliage_vertices, dtype=np.float32), texture=self.leaf_texture)
-        else:
-            self.foliage_mesh = None
+        # The foliage draws from its own generator so it can be cached; leave the shared stream where drawing
+        # the foliage from it would have (cached or not), as the caller picks the next tree from it
+        skipped = random.Random(self.seed)
+        for _ in range(self.FOLIAGE_RANDOM_DRAWS):
+            skipped.random()
+        random.setstate(skipped.getstate())
         
         self.trunk_mesh = None  # No trunk mesh
         
         print("✅ Advanced tree generated!")
     
-    def draw(self, view, projection, light_pos, view_pos):
+    def world_bounds(self):
+        """World-space bounding box of the foliage at the current position."""
+        if not self.foliage_mesh:
+            return None
+        return self.foliage_mesh.bounds.translated(self.position)
+    
+    def draw(self):
         """Draw the tree."""
         self.shader.use()
-        self.shader.set_mat4("view", view)
-        self.shader.set_mat4("projection", projection)
-        self.shader.set_vec3("lightPos", light_pos)
-        self.shader.set_vec3("viewPos", view_pos)
-        self.shader.set_vec3("lightColor", (1.0, 1.0, 1.0))
         
         model = create_model_matrix(position=self.position)
         self.shader.set_mat4("model", model)
@@ -194,5 +211,7 @@ class AdvancedTree:
         # Draw foliage only
         if self.foliage_mesh:
             self.shader.set_vec3("objectColor", (0.2, 0.5, 0.1))  # Green leaves
-            self.shader.set_bool("useTexture", self.leaf_texture is not None)
-            self.foliage_mesh.draw(self.shader)
+            self.shader.set_textured(self.leaf_texture is not None)
+            center = np.add(self.position, self.foliage_mesh.bounding_sphere.center)
+            self.lod_level = self.foliage_lod.select(center, self.lod_level)
+            self.foliage_lod.draw(self.shader, self.lod_level)
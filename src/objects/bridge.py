@@ -5,48 +5,45 @@ Features: tall towers, main cables, vertical suspender cables, railings, and tex
 
 import numpy as np
 from rendering.mesh import Mesh
+from rendering.static_batch import StaticBatcher, draw_batches
 from objects.primitives import create_cube_with_uv
 from utils.transformations import create_model_matrix
-from core.texture import Texture
+from core.texture import TextureRegistry
 
 class Bridge:
+    TEXTURE_PATHS = {
+        "bridge": "assets/textures/bridgeLen.png",
+    }
+    
     def __init__(self, shader):
         self.shader = shader
-        self.cube_mesh = None
         self.cylinder_mesh = None
         self.bridge_texture = None
+        self.batches = []
         
         self._setup_bridge()
     
     def _setup_bridge(self):
         """Setup bridge components."""
         cube_vertices = create_cube_with_uv()
-        # Create mesh WITHOUT texture - we'll handle it in draw()
-        self.cube_mesh = Mesh(cube_vertices, texture=None)
+        # Create mesh WITHOUT texture - the batches carry the texture
+        cube_mesh = Mesh.indexed(cube_vertices, texture=None, name="Bridge")
         
         # Load bridge deck texture
         try:
-            self.bridge_texture = Texture("assets/textures/bridgeLen.png")
+            self.bridge_texture = TextureRegistry.acquire(self.TEXTURE_PATHS["bridge"])
             print(f"✅ Bridge texture loaded: {self.bridge_texture.texture_id}")
         except Exception as e:
             print(f"Bridge texture not found: {e}")
             self.bridge_texture = None
     
-    def _draw_cylinder(self, position, scale, color):
-        """Draw a cylinder approximation using scaled cube."""
-        model = create_model_matrix(position=position, scale=scale)
-        self.shader.set_mat4("model", model)
-        self.shader.set_vec3("objectColor", color)
-        self.cube_mesh.draw(self.shader)
+        # The bridge never changes, so its cubes are baked into one mesh per texture once
+        self.batches = self._build_batches(cube_mesh)
+        cube_mesh.delete()
     
-    def draw(self, view, projection, light_pos, view_pos):
-        """Draw a realistic suspension bridge."""
-        self.shader.use()
-        self.shader.set_mat4("view", view)
-        self.shader.set_mat4("projection", projection)
-        self.shader.set_vec3("lightPos", light_pos)
-        self.shader.set_vec3("viewPos", view_pos)
-        self.shader.set_vec3("lightColor", (1.0, 1.0, 1.0))
+    def _build_batches(self, cube_mesh):
+        """Lay out the cubes of a realistic suspension bridge and merge them per texture."""
+        batcher = StaticBatcher()
         
         # === BRIDGE PARAMETERS ===
         bridge_center = -3.0
@@ -67,60 +64,28 @@ class Bridge:
             position=(tower_x_left, tower_base_y + tower_height/2, -bridge_width/2 - 0.3 + bridge_z_offset),
             scale=(0.25, tower_height, 0.25)
         )
-        self.shader.set_mat4("model", left_tower_col1_model)
-        self.shader.set_vec3("objectColor", tower_color)
-        if self.bridge_texture:
-            self.bridge_texture.bind(0)
-            self.shader.set_sampler("texture_diffuse1", 0)
-            self.shader.set_bool("useTexture", True)
-        else:
-            self.shader.set_bool("useTexture", False)
-        self.cube_mesh.draw(self.shader)
+        batcher.add(cube_mesh, left_tower_col1_model, tower_color, self.bridge_texture)
         
         # Left tower - second column on LEFT SIDE of bridge
         left_tower_col2_model = create_model_matrix(
             position=(tower_x_left, tower_base_y + tower_height/2, bridge_width/2 + 0.3 + bridge_z_offset),
             scale=(0.25, tower_height, 0.25)
         )
-        self.shader.set_mat4("model", left_tower_col2_model)
-        self.shader.set_vec3("objectColor", tower_color)
-        if self.bridge_texture:
-            self.bridge_texture.bind(0)
-            self.shader.set_sampler("texture_diffuse1", 0)
-            self.shader.set_bool("useTexture", True)
-        else:
-            self.shader.set_bool("useTexture", False)
-        self.cube_mesh.draw(self.shader)
+        batcher.add(cube_mesh, left_tower_col2_model, tower_color, self.bridge_texture)
         
         # Right tower - positioned on RIGHT SIDE of bridge
         right_tower_col1_model = create_model_matrix(
             position=(tower_x_right, tower_base_y + tower_height/2, -bridge_width/2 - 0.3 + bridge_z_offset),
             scale=(0.25, tower_height, 0.25)
         )
-        self.shader.set_mat4("model", right_tower_col1_model)
-        self.shader.set_vec3("objectColor", tower_color)
-        if self.bridge_texture:
-            self.bridge_texture.bind(0)
-            self.shader.set_sampler("texture_diffuse1", 0)
-            self.shader.set_bool("useTexture", True)
-        else:
-            self.shader.set_bool("useTexture", False)
-        self.cube_mesh.draw(self.shader)
+        batcher.add(cube_mesh, right_tower_col1_model, tower_color, self.bridge_texture)
         
         # Right tower - second column on RIGHT SIDE of bridge
         right_tower_col2_model = create_model_matrix(
             position=(tower_x_right, tower_base_y + tower_height/2, bridge_width/2 + 0.3 + bridge_z_offset),
             scale=(0.25, tower_height, 0.25)
         )
-        self.shader.set_mat4("model", right_tower_col2_model)
-        self.shader.set_vec3("objectColor", tower_color)
-        if self.bridge_texture:
-            self.bridge_texture.bind(0)
-            self.shader.set_sampler("texture_diffuse1", 0)
-            self.shader.set_bool("useTexture", True)
-        else:
-            self.shader.set_bool("useTexture", False)
-        self.cube_mesh.draw(self.shader)
+        batcher.add(cube_mesh, right_tower_col2_model, tower_color, self.bridge_texture)
         
         # ===== MAIN CABLES (thick steel cables) =====
         main_cable_color = (0.2, 0.2, 0.25)  # Very dark steel
@@ -137,18 +102,14 @@ class Bridge:
             position=(cable_center_x, cable_center_y, -bridge_width/2 - 0.2 + bridge_z_offset),
             scale=(cable_length * 0.95, 0.08, 0.08)
         )
-        self.shader.set_mat4("model", left_cable_model)
-        self.shader.set_vec3("objectColor", main_cable_color)
-        self.cube_mesh.draw(self.shader)
+        batcher.add(cube_mesh, left_cable_model, main_cable_color, self.bridge_texture)
         
         # Right main cable (mirrored)
         right_cable_model = create_model_matrix(
             position=(cable_center_x, cable_center_y, bridge_width/2 + 0.2 + bridge_z_offset),
             scale=(cable_length * 0.95, 0.08, 0.08)
         )
-        self.shader.set_mat4("model", right_cable_model)
-        self.shader.set_vec3("objectColor", main_cable_color)
-        self.cube_mesh.draw(self.shader)
+        batcher.add(cube_mesh, right_cable_model, main_cable_color, self.bridge_texture)
         
         # ===== THIN VERTICAL SUPPORT COLUMNS (from cables to deck) =====
         column_color = (0.25, 0.25, 0.30)  # Dark steel
@@ -171,32 +132,14 @@ class Bridge:
                 position=(col_x, column_center_y, -bridge_width/2 - 0.2 + bridge_z_offset),
                 scale=(column_width, column_height, column_width)
             )
-            self.shader.set_mat4("model", left_support)
-            self.shader.set_vec3("objectColor", column_color)
-            if self.bridge_texture:
-                self.bridge_texture.bind(0)
-                self.shader.set_sampler("texture_diffuse1", 0)
-                self.shader.set_bool("useTexture", True)
-            else:
-                self.shader.set_bool("useTexture", False)
-            self.cube_mesh.draw(self.shader)
+            batcher.add(cube_mesh, left_support, column_color, self.bridge_texture)
             
             # Right side column
             right_support = create_model_matrix(
                 position=(col_x, column_center_y, bridge_width/2 + 0.2 + bridge_z_offset),
                 scale=(column_width, column_height, column_width)
             )
-            self.shader.set_mat4("model", right_support)
-            self.shader.set_vec3("objectColor", column_color)
-            if self.bridge_texture:
-                self.bridge_texture.bind(0)
-                self.shader.set_sampler("texture_diffuse1", 0)
-                self.shader.set_bool("useTexture", True)
-            else:
-                self.shader.set_bool("useTexture", False)
-            self.cube_mesh.draw(self.shader)
-        
-        self.shader.set_bool("useTexture", False)  # Reset for other objects
+            batcher.add(cube_mesh, right_support, column_color, self.bridge_texture)
         
         # ===== BRIDGE DECK =====
         deck_color = (0.35, 0.32, 0.28)  # Brown-gray asphalt
@@ -204,16 +147,7 @@ class Bridge:
             position=(bridge_center, deck_y, bridge_z_offset),
             scale=(bridge_length, 0.25, bridge_width)
         )
-        self.shader.set_mat4("model", deck_model)
-        self.shader.set_vec3("objectColor", deck_color)
-        if self.bridge_texture:
-            self.bridge_texture.bind(0)
-            self.shader.set_sampler("texture_diffuse1", 0)
-            self.shader.set_bool("useTexture", True)
-        else:
-            self.shader.set_bool("useTexture", False)
-        self.cube_mesh.draw(self.shader)
-        self.shader.set_bool("useTexture", False)  # Reset for other objects
+        batcher.add(cube_mesh, deck_model, deck_color, self.bridge_texture)
         
         # ===== DECK STRIPES (center line) =====
         stripe_color = (1.0, 1.0, 1.0)  # White
@@ -227,9 +161,7 @@ class Bridge:
                 position=(stripe_x, stripe_y, bridge_z_offset),
                 scale=(stripe_spacing * 0.4, 0.01, 0.15)
             )
-            self.shader.set_mat4("model", stripe_model)
-            self.shader.set_vec3("objectColor", stripe_color)
-            self.cube_mesh.draw(self.shader)
+            batcher.add(cube_mesh, stripe_model, stripe_color)
         
         
         # ===== CORNER RAILINGS =====
@@ -242,33 +174,33 @@ class Bridge:
             position=(bridge_center - bridge_length/2, deck_y + railing_height/2, -bridge_width/2 - 0.1 + bridge_z_offset),
             scale=(0.5, railing_height, railing_thickness)
         )
-        self.shader.set_mat4("model", front_left_railing)
-        self.shader.set_vec3("objectColor", railing_color)
-        self.cube_mesh.draw(self.shader)
+        batcher.add(cube_mesh, front_left_railing, railing_color)
         
         # Front-right corner railing
         front_right_railing = create_model_matrix(
             position=(bridge_center - bridge_length/2, deck_y + railing_height/2, bridge_width/2 + 0.1 + bridge_z_offset),
             scale=(0.5, railing_height, railing_thickness)
         )
-        self.shader.set_mat4("model", front_right_railing)
-        self.shader.set_vec3("objectColor", railing_color)
-        self.cube_mesh.draw(self.shader)
+        batcher.add(cube_mesh, front_right_railing, railing_color)
         
         # Back-left corner railing
         back_left_railing = create_model_matrix(
             position=(bridge_center + bridge_length/2, deck_y + railing_height/2, -bridge_width/2 - 0.1 + bridge_z_offset),
             scale=(0.5, railing_height, railing_thickness)
         )
-        self.shader.set_mat4("model", back_left_railing)
-        self.shader.set_vec3("objectColor", railing_color)
-        self.cube_mesh.draw(self.shader)
+        batcher.add(cube_mesh, back_left_railing, railing_color)
         
         # Back-right corner railing
         back_right_railing = create_model_matrix(
             position=(bridge_center + bridge_length/2, deck_y + railing_height/2, bridge_width/2 + 0.1 + bridge_z_offset),
             scale=(0.5, railing_height, railing_thickness)
         )
-        self.shader.set_mat4("model", back_right_railing)
-        self.shader.set_vec3("objectColor", railing_color)
-        self.cube_mesh.draw(self.shader)
\ No newline at end of file
+        batcher.add(cube_mesh, back_right_railing, railing_color)
+        
+        return batcher.build("Bridge")
+    
+    def draw(self):
+        """Draw the suspension bridge."""
+        self.shader.use()
+        self.shader.set_mat4("model", create_model_matrix())
+        draw_batches(self.shader, self.batches)
@@ -15,8 +15,11 @@ import numpy as np
 import glm
 import math
 import ctypes
+from rendering.lod import LodMesh
 from rendering.mesh import Mesh
-from core.texture import Texture
+from rendering.mesh_cache import Geometry
+from core.texture import TextureRegistry
+from utils.bounds import BoundingBox
 
 # ==========================================
 # GEOMETRY GENERATION
@@ -174,10 +177,17 @@ def create_sedan_mesh():
 class ProceduralCar:
     """Advanced procedural Tesla-style car with smooth curves and metallic texture."""
     
-    _shared_texture = None
-    _texture_loaded = False
+    TEXTURE_PATHS = {
+        "body": "assets/textures/car.png",
+    }
+    
+    # Wheels are small: their simplified levels take over at smaller projected sizes than the default
+    WHEEL_LOD_SCREEN_SIZES = (0.06, 0.03, 0.015)
+    
     _body_mesh = None
     _wheel_mesh = None
+    _wheel_lod = None
+    _local_bounds = None  # Body and wheels in car space
     
     def __init__(self, shader, lane=0, direction=1, car_index=0, is_bridge=False):
         """Initialize the procedural car.
@@ -206,10 +216,13 @@ class ProceduralCar:
             self.speed = 3.0 * self.direction
         
         self._wheel_spin = 0.0
+        self.wheel_lod_level = 0
         
-        # Load shared resources
-        if not ProceduralCar._texture_loaded:
-            self._load_texture_once()
+        # Load shared resources (car.png is shared through the texture registry)
+        try:
+            self.texture = TextureRegistry.acquire(self.TEXTURE_PATHS["body"])
+        except Exception:
+            self.texture = None
         
         if ProceduralCar._body_mesh is None:
             self._create_meshes()
@@ -221,30 +234,26 @@ class ProceduralCar:
             glm.vec3(-0.225, 0.0875, -0.35),
             glm.vec3( 0.225, 0.0875, -0.35)
         ]
-    
-    @classmethod
-    def _load_texture_once(cls):
-        """Load PNG texture from file for all instances."""
-        try:
-            # Load car.png as car texture
-            cls._shared_texture = Texture("assets/textures/car.png")
-            cls._texture_loaded = True
-            print("✅ Car texture loaded from PNG (car.png)")
-        except Exception as e:
-            print(f"Failed to load car texture: {e}")
-            cls._texture_loaded = False
+        
+        if ProceduralCar._local_bounds is None and ProceduralCar._body_mesh:
+            # Wheels spin, so bound them by their sphere
+            wheel_radius = ProceduralCar._wheel_mesh.bounding_sphere.radius
+            wheels = [BoundingBox(np.array(wheel_pos) - wheel_radius, np.array(wheel_pos) + wheel_radius)
+                      for wheel_pos in self.wheel_positions]
+            ProceduralCar._local_bounds = BoundingBox.union([ProceduralCar._body_mesh.bounds] + wheels)
     
     @classmethod
     def _create_meshes(cls):
         """Create body and wheel meshes once for all instances."""
         try:
             # Create body mesh
-            body_vertices = create_sedan_mesh()
-            cls._body_mesh = Mesh(body_vertices)
+            cls._body_mesh = Mesh.indexed(Geometry(create_sedan_mesh), name="ProceduralCar")
             
             # Create wheel mesh
-            wheel_vertices = create_wheel_mesh(radius=0.0875, width=0.0625, segments=32)
-            cls._wheel_mesh = Mesh(wheel_vertices)
+            wheel = Geometry(create_wheel_mesh, radius=0.0875, width=0.0625, segments=32)
+            cls._wheel_mesh = Mesh.indexed(wheel, name="ProceduralCar")
+            cls._wheel_lod = LodMesh.generate(cls._wheel_mesh, screen_sizes=cls.WHEEL_LOD_SCREEN_SIZES,
+                                              name="ProceduralCar wheel")
             
             print("✅ Procedural car meshes created")
         except Exception as e:
@@ -285,19 +294,8 @@ class ProceduralCar:
         # Adjust metallic red for lighting
         return (200/255, 20/255, 20/255)  # Metallic red
     
-    def draw(self, view, projection, light_pos, view_pos):
-        """Render the procedural car."""
-        if not ProceduralCar._body_mesh or not ProceduralCar._wheel_mesh:
-            return
-        
-        self.shader.use()
-        self.shader.set_mat4("view", view)
-        self.shader.set_mat4("projection", projection)
-        self.shader.set_vec3("lightPos", light_pos)
-        self.shader.set_vec3("viewPos", view_pos)
-        self.shader.set_vec3("lightColor", (1.0, 1.0, 1.0))
-        
-        # Draw body
+    def _body_matrix(self):
+        """Model matrix of the car body; the wheels are placed relative to it."""
         model = glm.translate(glm.mat4(1.0), glm.vec3(self.position[0], self.position[1], self.position[2]))
         model = glm.translate(model, glm.vec3(0.0, 0.1, 0.0))  # Shift up for wheels
         
@@ -310,39 +308,42 @@ class ProceduralCar:
             # Road cars: standard orientation
             if self.direction == -1:
                 model = glm.rotate(model, glm.radians(180.0), glm.vec3(0, 1, 0))
+        return model
         
-        self.shader.set_mat4("model", model)
-        self.shader.set_vec3("objectColor", self._get_car_color())
-        self.shader.set_bool("useTexture", True)
+    def world_bounds(self):
+        """World-space bounding box of the car and its wheels."""
+        if ProceduralCar._local_bounds is None:
+            return None
+        return ProceduralCar._local_bounds.transformed(self._body_matrix())
+    
+    def draw(self):
+        """Render the procedural car."""
+        if not ProceduralCar._body_mesh or not ProceduralCar._wheel_mesh:
+            return
+        
+        self.shader.use()
         
-        if ProceduralCar._shared_texture:
-            glActiveTexture(GL_TEXTURE0)
-            glBindTexture(GL_TEXTURE_2D, ProceduralCar._shared_texture.texture_id)
-            self.shader.set_sampler("texture1", 0)
+        # Draw body
+        body = self._body_matrix()
+        self.shader.set_mat4("model", body)
+        self.shader.set_vec3("objectColor", self._get_car_color())
+        if self.texture:
+            self.shader.use_texture(self.texture)
+        else:
+            self.shader.set_textured(True)
         
         ProceduralCar._body_mesh.draw(self.shader)
         
         # Draw wheels
-        self.shader.set_bool("useTexture", False)
+        self.shader.set_textured(False)
         self.shader.set_vec3("objectColor", (0.2, 0.2, 0.2))
         
+        # One level for all four wheels, chosen from the car's distance
+        self.wheel_lod_level = ProceduralCar._wheel_lod.select(self.position, self.wheel_lod_level)
         for wheel_pos in self.wheel_positions:
-            model = glm.translate(glm.mat4(1.0), glm.vec3(self.position[0], self.position[1], self.position[2]))
-            model = glm.translate(model, glm.vec3(0.0, 0.1, 0.0))
-            
-            if self.is_bridge:
-                # Bridge cars: rotate 90 degrees to face along X-axis
-                model = glm.rotate(model, glm.radians(90.0), glm.vec3(0, 1, 0))
-                if self.direction == -1:
-                    model = glm.rotate(model, glm.radians(180.0), glm.vec3(0, 1, 0))
-            else:
-                # Road cars: standard orientation
-                if self.direction == -1:
-                    model = glm.rotate(model, glm.radians(180.0), glm.vec3(0, 1, 0))
-            
-            model = glm.translate(model, wheel_pos)
+            model = glm.translate(body, wheel_pos)
             # Rotate wheels around X-axis (the wheel is oriented along X-axis)
             model = glm.rotate(model, glm.radians(glm.degrees(self._wheel_spin)), glm.vec3(1, 0, 0))
             
             self.shader.set_mat4("model", model)
-            ProceduralCar._wheel_mesh.draw(self.shader)
+            ProceduralCar._wheel_lod.draw(self.shader, self.wheel_lod_level)
@@ -4,41 +4,44 @@ Simple Christmas tree with layered cones.
 
 import numpy as np
 import glm
+from rendering.instancing import InstanceBuffer, instance_matrices
+from rendering.lod import LodMesh
 from rendering.mesh import Mesh
-from core.texture import Texture
+from rendering.mesh_cache import Geometry
+from rendering.vertex_format import COMPACT_FORMAT
+from core.texture import TextureRegistry
+from utils.bounds import BoundingBox
 from utils.transformations import create_model_matrix
 
 
 class ChristmasTree:
-    # Class-level texture shared by all instances
-    _shared_texture = None
-    _texture_loaded = False
+    TEXTURE_PATHS = {
+        "tree": "assets/textures/christmas_tree.png",
+        # Bark the forest shows when christmas_tree.png is missing
+        "fallback": "assets/textures/log.png",
+    }
+    
+    # Part meshes are the same for every tree, so they are built once
+    _part_meshes = None
+    _part_lods = None
+    
+    # Fraction of the triangles kept by the cones' simplified levels (16 segments, so two levels)
+    CONE_LOD_RATIOS = (0.5, 0.25)
     
     def __init__(self, shader):
         """Initialize Christmas tree."""
         self.shader = shader
         self.tree_parts = []
-        # Load texture once for all instances
-        if not ChristmasTree._texture_loaded:
-            self._load_texture_once()
-        self._create_tree()
-    
-    @classmethod
-    def _load_texture_once(cls):
-        """Load the Christmas tree texture once for all instances."""
+        # Texture is shared by all instances through the registry
+        # (a missing file is reported once by the registry's first load)
         try:
-            cls._shared_texture = Texture("assets/textures/christmas_tree.png")
-            cls._texture_loaded = True
-            print("✅ Christmas tree texture loaded once (shared)")
-        except Exception as e:
-            print(f"Failed to load christmas_tree.png: {e}")
-            cls._shared_texture = None
-            cls._texture_loaded = True
-    
-    @property
-    def tree_texture(self):
-        """Return the shared texture."""
-        return ChristmasTree._shared_texture
+            self.tree_texture = TextureRegistry.acquire(self.TEXTURE_PATHS["tree"])
+        except Exception:
+            try:
+                self.tree_texture = TextureRegistry.acquire(self.TEXTURE_PATHS["fallback"])
+            except Exception:
+                self.tree_texture = None
+        self._create_tree()
 
     def _create_cone_mesh(self, radius, height, segments=16):
         """Create a cone mesh (for tree layers)."""
@@ -129,32 +132,63 @@ class ChristmasTree:
         return np.array(vertices, dtype=np.float32)
     
     def _create_tree(self):
-        """Create tree structure with cones and ornaments."""
+        """Create tree structure with cones and trunk (meshes are shared by every tree)."""
+        if ChristmasTree._part_meshes is None:
+            ChristmasTree._part_meshes = self._create_part_meshes()
+            # The trunk is six quads already; only the cones get simplified levels
+            ChristmasTree._part_lods = [LodMesh.generate(mesh, ratios=self.CONE_LOD_RATIOS, name="ChristmasTree cone")
+                                        for mesh in ChristmasTree._part_meshes[:3]]
+            ChristmasTree._part_lods.append(LodMesh([ChristmasTree._part_meshes[3]]))
+        cone1_mesh, cone2_mesh, cone3_mesh, trunk_mesh = ChristmasTree._part_meshes
+        cone1_lod, cone2_lod, cone3_lod, trunk_lod = ChristmasTree._part_lods
+        
         # Layer 1: Large bottom cone
-        cone1_mesh = Mesh(self._create_cone_mesh(radius=0.6, height=0.8))
         self.tree_parts.append({
             'mesh': cone1_mesh,
+            'lod': cone1_lod,
             'position': (0, 0, 0),
             'color': (0.2, 0.7, 0.2)  # Green
         })
         
         # Layer 2: Medium middle cone
-        cone2_mesh = Mesh(self._create_cone_mesh(radius=0.4, height=0.6))
         self.tree_parts.append({
             'mesh': cone2_mesh,
+            'lod': cone2_lod,
             'position': (0, 0.6, 0),
             'color': (0.15, 0.65, 0.15)  # Darker green
         })
         
         # Layer 3: Small top cone
-        cone3_mesh = Mesh(self._create_cone_mesh(radius=0.25, height=0.4))
         self.tree_parts.append({
             'mesh': cone3_mesh,
+            'lod': cone3_lod,
             'position': (0, 1.1, 0),
             'color': (0.1, 0.6, 0.1)  # Even darker green
         })
         
         # Trunk
+        self.tree_parts.append({
+            'mesh': trunk_mesh,
+            'lod': trunk_lod,
+            'position': (0, -0.3, 0),
+            'color': (0.5, 0.3, 0.1)  # Brown
+        })
+    
+    def _create_part_meshes(self):
+        """Create the three cone meshes and the trunk mesh."""
+        cone1_mesh = Mesh.indexed(Geometry(self._create_cone_mesh, radius=0.6, height=0.8), name="ChristmasTree",
+                                  vertex_format=COMPACT_FORMAT)
+        cone2_mesh = Mesh.indexed(Geometry(self._create_cone_mesh, radius=0.4, height=0.6), name="ChristmasTree",
+                                  vertex_format=COMPACT_FORMAT)
+        cone3_mesh = Mesh.indexed(Geometry(self._create_cone_mesh, radius=0.25, height=0.4), name="ChristmasTree",
+                                  vertex_format=COMPACT_FORMAT)
+        trunk_mesh = Mesh.indexed(Geometry(self._create_trunk_vertices), name="ChristmasTree",
+                                  vertex_format=COMPACT_FORMAT)
+        return cone1_mesh, cone2_mesh, cone3_mesh, trunk_mesh
+        
+    @staticmethod
+    def _create_trunk_vertices():
+        """Six-sided trunk without caps."""
         trunk_vertices = []
         trunk_radius = 0.08
         trunk_height = 0.3
@@ -182,21 +216,21 @@ class ChristmasTree:
             trunk_vertices.extend([x2, trunk_height, z2] + list(normal) + [(i+1)/segments, 1.0])
             trunk_vertices.extend([x2, 0, z2] + list(normal) + [(i+1)/segments, 0.0])
         
-        trunk_mesh = Mesh(np.array(trunk_vertices, dtype=np.float32))
-        self.tree_parts.append({
-            'mesh': trunk_mesh,
-            'position': (0, -0.3, 0),
-            'color': (0.5, 0.3, 0.1)  # Brown
-        })
+        return np.array(trunk_vertices, dtype=np.float32)
+    
+    def world_part_bounds(self, position=(0, 0, 0), scale=1.0):
+        """World-space bounding box of every part, in tree_parts order, for a tree at position and scale."""
+        bounds = []
+        for part in self.tree_parts:
+            box = part['mesh'].bounds
+            offset = np.add(position, np.multiply(part['position'], scale))
+            bounds.append(BoundingBox(box.minimum * scale + offset, box.maximum * scale + offset))
+        return bounds
     
-    def draw(self, view, projection, light_pos, view_pos, position=(0, 0, 0)):
+    def draw(self, position=(0, 0, 0)):
         """Draw the Christmas tree."""
         self.shader.use()
-        self.shader.set_mat4("view", view)
-        self.shader.set_mat4("projection", projection)
-        self.shader.set_vec3("lightPos", light_pos)
-        self.shader.set_vec3("viewPos", view_pos)
-        self.shader.set_bool("useTexture", False)
+        self.shader.set_textured(False)
         
         for part in self.tree_parts:
             # Create model matrix for this part
@@ -211,3 +245,114 @@ class ChristmasTree:
             self.shader.set_vec3("objectColor", part['color'])
             
             part['mesh'].draw(self.shader)
+
+
+class ChristmasForest:
+    """Many Christmas trees, drawn with one instanced draw per tree part and level of detail.
+    
+    The trees only differ by position and scale, so each part mesh is drawn
+    once for the whole forest from an InstanceBuffer of model matrices and
+    colours. The forest never moves: the visible instances are culled, given
+    a level by their distance and re-uploaded only when the camera has moved.
+    """
+    
+    def __init__(self, shader, positions, scales):
+        self.shader = shader
+        self.tree = ChristmasTree(shader)
+        self.positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+        self.scales = np.asarray(scales, dtype=np.float64).reshape(-1)
+        
+        parts = self.tree.tree_parts
+        part_offsets = np.array([part['position'] for part in parts], dtype=np.float64)
+        # (trees, parts, 3) world position of every part
+        origins = self.positions[:, None, :] + part_offsets[None, :, :] * self.scales[:, None, None]
+        self.models = instance_matrices(origins.reshape(-1, 3), np.repeat(self.scales, len(parts)))
+        self.models = self.models.reshape(len(self.positions), len(parts), 16)
+        self.colors = np.array([part['color'] for part in parts], dtype=np.float32)
+        
+        # World-space boxes of every part, tree by tree, tested in one call per frame
+        minimums = np.array([part['mesh'].bounds.minimum for part in parts], dtype=np.float64)
+        maximums = np.array([part['mesh'].bounds.maximum for part in parts], dtype=np.float64)
+        scales = self.scales[:, None, None]
+        self.part_centers = (origins + (minimums + maximums) * 0.5 * scales).reshape(-1, 3)
+        self.part_extents = ((maximums - minimums) * 0.5 * scales).reshape(-1, 3)
+        
+        self.part_scales = np.repeat(self.scales, len(parts)).reshape(len(self.positions), len(parts))
+        
+        self.instances = InstanceBuffer()
+        # (LodMesh, level, first instance, instance count) per instanced draw
+        self.part_ranges = []
+        self.visibility = None
+        self.levels = np.zeros((len(self.positions), len(parts)), dtype=np.int64)
+        self.visibility_generation = None
+        self._upload(np.ones((len(self.positions), len(parts)), dtype=bool))
+    
+    def __len__(self):
+        return len(self.positions)
+    
+    def _select_levels(self):
+        """Level of every (tree, part) for the current view; True if any changed."""
+        part_centers = self.part_centers.reshape(len(self.positions), -1, 3)
+        levels = self.levels.copy()
+        for part_index, part in enumerate(self.tree.tree_parts):
+            levels[:, part_index] = part['lod'].select_many(part_centers[:, part_index], levels[:, part_index],
+                                                            self.part_scales[:, part_index])
+        changed = not np.array_equal(levels, self.levels)
+        self.levels = levels
+        return changed
+    
+    def _upload(self, visible):
+        """Upload the instances of the visible (trees, parts) entries, grouped by part and level."""
+        models, colors, self.part_ranges = [], [], []
+        first = 0
+        for part_index, part in enumerate(self.tree.tree_parts):
+            for level in range(len(part['lod'].levels)):
+                selected = visible[:, part_index] & (self.levels[:, part_index] == level)
+                part_models = self.models[selected, part_index]
+                if not len(part_models):
+                    continue
+                models.append(part_models)
+                colors.append(np.repeat(self.colors[part_index:part_index + 1], len(part_models), axis=0))
+                self.part_ranges.append((part['lod'], level, first, len(part_models)))
+                first += len(part_models)
+        if models:
+            self.instances.upload(np.concatenate(models), np.concatenate(colors))
+        self.visibility = visible
+    
+    def draw(self, frustum=None, camera_generation=None):
+        """Draw every tree part visible in frustum (all of them without one).
+        
+        camera_generation identifies the camera state; while it is unchanged
+        the previous frame's visibility is reused and only counted.
+        """
+        if not len(self):
+            return
+        if camera_generation is None or camera_generation != self.visibility_generation:
+            if frustum is None:
+                visible = np.ones_like(self.visibility)
+            else:
+                visible = frustum.visible_boxes(self.part_centers, self.part_extents).reshape(self.visibility.shape)
+            levels_changed = self._select_levels()
+            if levels_changed or not np.array_equal(visible, self.visibility):
+                self._upload(visible)
+            self.visibility_generation = camera_generation
+        elif frustum is not None:
+            frustum.count(self.visibility.ravel())
+        
+        self.shader.use()
+        # One texture bind for the whole forest
+        if self.tree.tree_texture:
+            self.shader.use_texture(self.tree.tree_texture)
+        
+        self.shader.set_instanced(True)
+        for lod, level, first, count in self.part_ranges:
+            lod.count(level, count)
+            lod.levels[level].draw_instanced(self.shader, self.instances, count, first)
+        self.shader.set_instanced(False)
+        
+        if not self.tree.tree_texture:
+            self.shader.set_textured(False)
+
+    def delete(self):
+        """Free the instance buffer."""
+        self.instances.delete()
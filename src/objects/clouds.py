@@ -7,55 +7,21 @@ import numpy as np
 import glm
 from OpenGL.GL import *
 from rendering.mesh import Mesh
-from core.texture import Texture
-from PIL import Image
-import math
+from rendering.mesh_cache import Geometry
+from core.texture import TextureRegistry
+from utils.procedural_textures import ProceduralTextures
 
 def generate_cloud_texture():
     """Generate a procedural cloud texture using Perlin-like noise."""
-    width, height = 256, 256
-    data = np.zeros((height, width, 4), dtype=np.uint8)
-    
-    # Create cloud-like noise pattern
-    for y in range(height):
-        for x in range(width):
-            # Multiple layers of noise for natural cloud look
-            noise = 0.0
-            frequency = 1.0
-            amplitude = 1.0
-            max_amplitude = 0.0
-            
-            for i in range(4):
-                # Sine-based pseudo-random noise
-                nx = (x / width) * frequency
-                ny = (y / height) * frequency
-                
-                noise_val = math.sin(nx * 12.9898 + ny * 78.233) * 43758.5453
-                noise_val = noise_val - math.floor(noise_val)
-                
-                # Smooth interpolation
-                noise_val = noise_val * noise_val * (3.0 - 2.0 * noise_val)
-                
-                noise += noise_val * amplitude
-                max_amplitude += amplitude
-                
-                frequency *= 2.0
-                amplitude *= 0.5
-            
-            noise = noise / max_amplitude
-            
-            # Convert to cloud color (white/light gray)
-            intensity = int(255 * max(0, noise - 0.3))
-            
-            data[y, x] = [255, 255, 255, intensity]
-    
-    image = Image.fromarray(data, 'RGBA')
-    return image
+    return ProceduralTextures.bake("cloud")
 
 class Cloud:
     """A single cloud billboard."""
     
-    _cloud_texture = None
+    TEXTURE_PATHS = {
+        "cloud": "assets/textures/cloud.png",
+    }
+    
     _cloud_mesh = None
     
     def __init__(self, position, scale=1.0, speed=0.5):
@@ -74,46 +40,33 @@ class Cloud:
         # Load shared resources
         if Cloud._cloud_mesh is None:
             self._create_cloud_mesh()
+        self.texture = self._acquire_texture()
     
-    @classmethod
-    def _load_texture_once(cls):
-        """Load or generate cloud texture."""
-        if cls._cloud_texture is not None:
-            return
-        
+    @staticmethod
+    def _acquire_texture():
+        """Get the shared cloud texture, generating it if cloud.png is missing."""
         try:
             # Load cloud.png from file
-            cls._cloud_texture = Texture("assets/textures/cloud.png")
-            print("✅ Cloud texture loaded from file")
+            return TextureRegistry.acquire(Cloud.TEXTURE_PATHS["cloud"])
+        except Exception:
+            pass
+        
+        # Generate procedurally as fallback
+        try:
+            return TextureRegistry.acquire_generated("cloud", generate_cloud_texture)
         except Exception as e:
-            print(f"Cloud file not found ({e}), generating procedurally...")
-            # Generate procedurally as fallback
-            try:
-                img = generate_cloud_texture()
-                img_data = img.tobytes()
-                
-                texture_id = glGenTextures(1)
-                glBindTexture(GL_TEXTURE_2D, texture_id)
-                glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_REPEAT)
-                glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_REPEAT)
-                glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
-                glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
-                glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, img.width, img.height, 0, GL_RGBA, GL_UNSIGNED_BYTE, img_data)
-                glGenerateMipmap(GL_TEXTURE_2D)
-                
-                # Create a temporary texture object
-                class TempTexture:
-                    def __init__(self, tid):
-                        self.texture_id = tid
-                
-                cls._cloud_texture = TempTexture(texture_id)
-                print("✅ Procedural cloud texture generated")
-            except Exception as e:
-                print(f"Failed to create cloud texture: {e}")
+            print(f"Failed to create cloud texture: {e}")
+            return None
     
     @classmethod
     def _create_cloud_mesh(cls):
         """Create a 3D cloud mesh made of multiple cubes for volumetric appearance."""
+        cls._cloud_mesh = Mesh.indexed(Geometry(cls._create_cloud_vertices), optimize=False, name="CloudSystem")
+        print("✅ 3D volumetric cloud mesh created")
+    
+    @staticmethod
+    def _create_cloud_vertices():
+        """Triangle soup of the cubes making up one cloud."""
         vertices = []
         
         # Create a cloud shape using multiple small cube positions
@@ -188,9 +141,7 @@ class Cloud:
             
             vertices.extend(cube_verts)
         
-        cloud_vertices = np.array(vertices, dtype=np.float32)
-        cls._cloud_mesh = Mesh(cloud_vertices)
-        print("✅ 3D volumetric cloud mesh created")
+        return np.array(vertices, dtype=np.float32)
     
     def update(self, delta_time):
         """Update cloud position."""
@@ -202,42 +153,37 @@ class Cloud:
         elif self.position[0] < -30.0:
             self.position[0] = 30.0
     
-    def draw(self, shader, view, projection, light_pos, view_pos):
+    def _model_matrix(self):
+        # Just position and scale (no billboard rotation)
+        model = glm.translate(glm.mat4(1.0), glm.vec3(self.position[0], self.position[1], self.position[2]))
+        return glm.scale(model, glm.vec3(self.scale, self.scale * 0.7, self.scale * 0.8))  # Varied dimensions
+    
+    def world_bounds(self):
+        """World-space bounding box of the cloud."""
+        if Cloud._cloud_mesh is None:
+            return None
+        return Cloud._cloud_mesh.bounds.transformed(self._model_matrix())
+    
+    def draw(self, shader):
         """Render the 3D cloud."""
         if Cloud._cloud_mesh is None:
             return
         
-        # Load texture only once (cached)
-        if Cloud._cloud_texture is None:
-            self._load_texture_once()
-        
         shader.use()
-        shader.set_mat4("view", view)
-        shader.set_mat4("projection", projection)
-        shader.set_vec3("lightPos", light_pos)
-        shader.set_vec3("viewPos", view_pos)
-        shader.set_vec3("lightColor", (1.0, 1.0, 1.0))
-        
-        # Create model matrix - just position and scale (no billboard rotation)
-        model = glm.translate(glm.mat4(1.0), glm.vec3(self.position[0], self.position[1], self.position[2]))
-        model = glm.scale(model, glm.vec3(self.scale, self.scale * 0.7, self.scale * 0.8))  # Varied dimensions
-        
-        shader.set_mat4("model", model)
+        shader.set_mat4("model", self._model_matrix())
         shader.set_vec3("objectColor", (1.0, 1.0, 1.0))  # White
-        shader.set_bool("useTexture", True)
-        
-        if Cloud._cloud_texture:
-            glActiveTexture(GL_TEXTURE0)
-            glBindTexture(GL_TEXTURE_2D, Cloud._cloud_texture.texture_id)
-            shader.set_sampler("texture1", 0)
+        if self.texture:
+            shader.use_texture(self.texture)
             
             # Enable additive blending to ignore black background
             glEnable(GL_BLEND)
             glBlendFunc(GL_SRC_COLOR, GL_ONE)  # Additive blend: ignore black, show white/colors
+        else:
+            shader.set_textured(True)
         
         Cloud._cloud_mesh.draw(shader)
         
-        shader.set_bool("useTexture", False)
+        shader.set_textured(False)
         # Reset blend function
         glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
         # Reset blend function
@@ -247,6 +193,8 @@ class Cloud:
 class CloudSystem:
     """Manages multiple clouds for the sky."""
     
+    TEXTURE_PATHS = Cloud.TEXTURE_PATHS
+    
     def __init__(self, shader, num_clouds=8):
         """Initialize cloud system.
         
@@ -286,7 +234,8 @@ class CloudSystem:
         for cloud in self.clouds:
             cloud.update(delta_time)
     
-    def draw(self, view, projection, light_pos, view_pos):
-        """Render all clouds."""
+    def draw(self, frustum=None):
+        """Render all clouds, skipping the ones outside frustum if given."""
         for cloud in self.clouds:
-            cloud.draw(self.shader, view, projection, light_pos, view_pos)
+            if frustum is None or frustum.is_visible(cloud.world_bounds()):
+                cloud.draw(self.shader)
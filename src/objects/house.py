@@ -4,66 +4,63 @@ Advanced house class with walls, door, and windows (roof is separate).
 
 import numpy as np
 from rendering.mesh import Mesh
+from rendering.static_batch import StaticBatcher, draw_batches
 from objects.primitives import create_cube_with_uv
 from utils.transformations import create_model_matrix
-from core.texture import Texture
+from core.texture import TextureRegistry
 
 class AdvancedHouse:
+    TEXTURE_PATHS = {
+        "wall": "assets/textures/houseWall.png",
+        "door": "assets/textures/houseDoor.png",
+        "window": "assets/textures/houseWindow.png",
+        "chimney": "assets/textures/column.png",
+    }
+    
     def __init__(self, shader):
         self.shader = shader
-        self.cube_mesh = Mesh(create_cube_with_uv())
+        self.cube_mesh = Mesh.indexed(create_cube_with_uv(), name="AdvancedHouse")
         self.house_texture = None
         self.door_texture = None
         self.window_texture = None
         self.chimney_texture = None
         
         self._load_textures()
+        
+        # The parts never move relative to the house, so they are baked into one mesh per texture once
+        self.batches = self._build_batches()
+        self.cube_mesh.delete()
+        self.cube_mesh = None
     
     def _load_textures(self):
         """Load house textures."""
         try:
-            self.house_texture = Texture("assets/textures/houseWall.png")
+            self.house_texture = TextureRegistry.acquire(self.TEXTURE_PATHS["wall"])
             print(f"✅ House texture loaded: {self.house_texture.texture_id}")
         except Exception as e:
             print(f"House texture not found: {e}")
         
         try:
-            self.door_texture = Texture("assets/textures/houseDoor.png")
+            self.door_texture = TextureRegistry.acquire(self.TEXTURE_PATHS["door"])
             print(f"✅ Door texture loaded: {self.door_texture.texture_id}")
         except Exception as e:
             print(f"Door texture not found: {e}")
         
         try:
-            self.window_texture = Texture("assets/textures/houseWindow.png")
+            self.window_texture = TextureRegistry.acquire(self.TEXTURE_PATHS["window"])
             print(f"✅ Window texture loaded: {self.window_texture.texture_id}")
         except Exception as e:
             print(f"Window texture not found: {e}")
         
         try:
-            self.chimney_texture = Texture("assets/textures/column.png")
+            self.chimney_texture = TextureRegistry.acquire(self.TEXTURE_PATHS["chimney"])
             print(f"✅ Chimney texture loaded: {self.chimney_texture.texture_id}")
         except Exception as e:
             print(f"Chimney texture not found: {e}")
     
     
-    def _draw_cube(self, position, scale, color, texture=None):
-        """Helper to draw a textured cube."""
-        model = create_model_matrix(position=position, scale=scale)
-        self.shader.set_mat4("model", model)
-        self.shader.set_vec3("objectColor", color)
-        
-        if texture:
-            texture.bind(0)
-            self.shader.set_sampler("texture_diffuse1", 0)
-            self.shader.set_bool("useTexture", True)
-        else:
-            self.shader.set_bool("useTexture", False)
-        
-        self.cube_mesh.draw(self.shader)
-        self.shader.set_bool("useTexture", False)
-    
-    def _draw_cube_rotated(self, position, scale, color, texture, rotation_angle, center):
-        """Helper to draw a rotated textured cube around a center point."""
+    def _add_cube_rotated(self, batcher, position, scale, color, texture, rotation_angle, center):
+        """Helper to add a rotated textured cube around a center point to the batcher."""
         import glm
         
         # Translate to center, rotate, translate back
@@ -76,29 +73,12 @@ class AdvancedHouse:
         model = glm.translate(model, local_pos)
         model = glm.scale(model, glm.vec3(scale[0], scale[1], scale[2]))
         
-        self.shader.set_mat4("model", model)
-        self.shader.set_vec3("objectColor", color)
-        
-        if texture:
-            texture.bind(0)
-            self.shader.set_sampler("texture_diffuse1", 0)
-            self.shader.set_bool("useTexture", True)
-        else:
-            self.shader.set_bool("useTexture", False)
+        batcher.add(self.cube_mesh, model, color, texture)
         
-        self.cube_mesh.draw(self.shader)
-        self.shader.set_bool("useTexture", False)
-    
-    def draw(self, view, projection, light_pos, view_pos, position=(0, 0, 0)):
-        """Draw an advanced house with multiple components."""
-        self.shader.use()
-        self.shader.set_mat4("view", view)
-        self.shader.set_mat4("projection", projection)
-        self.shader.set_vec3("lightPos", light_pos)
-        self.shader.set_vec3("viewPos", view_pos)
-        self.shader.set_vec3("lightColor", (1.0, 1.0, 1.0))
-        
-        house_x, house_y, house_z = position
+    def _build_batches(self):
+        """Lay out the walls, door, windows and chimney around the origin and merge them per texture."""
+        batcher = StaticBatcher()
+        house_x, house_y, house_z = (0.0, 0.0, 0.0)
         
         # Rotation: 270 degrees around Y axis (180 + 90)
         import math
@@ -111,7 +91,8 @@ class AdvancedHouse:
         wall_depth = 1.0
         
         # Front wall (now facing road - rotated)
-        self._draw_cube_rotated(
+        self._add_cube_rotated(
+            batcher,
             (house_x, house_y + wall_height/2, house_z + wall_depth/2),
             (wall_width, wall_height, 0.08),
             wall_color,
@@ -121,7 +102,8 @@ class AdvancedHouse:
         )
         
         # Back wall (rotated)
-        self._draw_cube_rotated(
+        self._add_cube_rotated(
+            batcher,
             (house_x, house_y + wall_height/2, house_z - wall_depth/2),
             (wall_width, wall_height, 0.08),
             wall_color,
@@ -131,7 +113,8 @@ class AdvancedHouse:
         )
         
         # Left wall (rotated)
-        self._draw_cube_rotated(
+        self._add_cube_rotated(
+            batcher,
             (house_x - wall_width/2, house_y + wall_height/2, house_z),
             (0.08, wall_height, wall_depth),
             wall_color,
@@ -141,7 +124,8 @@ class AdvancedHouse:
         )
         
         # Right wall (rotated)
-        self._draw_cube_rotated(
+        self._add_cube_rotated(
+            batcher,
             (house_x + wall_width/2, house_y + wall_height/2, house_z),
             (0.08, wall_height, wall_depth),
             wall_color,
@@ -155,7 +139,8 @@ class AdvancedHouse:
         door_width = 0.25
         door_height = 0.5
         
-        self._draw_cube_rotated(
+        self._add_cube_rotated(
+            batcher,
             (house_x, house_y + door_height/2, house_z + wall_depth/2 + 0.04),
             (door_width, door_height, 0.05),
             door_color,
@@ -169,7 +154,8 @@ class AdvancedHouse:
         window_size = 0.2
         
         # Front left window (rotated)
-        self._draw_cube_rotated(
+        self._add_cube_rotated(
+            batcher,
             (house_x - 0.35, house_y + 0.5, house_z + wall_depth/2 + 0.04),
             (window_size, window_size, 0.03),
             window_color,
@@ -179,7 +165,8 @@ class AdvancedHouse:
         )
         
         # Front right window (rotated)
-        self._draw_cube_rotated(
+        self._add_cube_rotated(
+            batcher,
             (house_x + 0.35, house_y + 0.5, house_z + wall_depth/2 + 0.04),
             (window_size, window_size, 0.03),
             window_color,
@@ -189,7 +176,8 @@ class AdvancedHouse:
         )
         
         # Back left window (rotated)
-        self._draw_cube_rotated(
+        self._add_cube_rotated(
+            batcher,
             (house_x - 0.35, house_y + 0.5, house_z - wall_depth/2 - 0.04),
             (window_size, window_size, 0.03),
             window_color,
@@ -199,7 +187,8 @@ class AdvancedHouse:
         )
         
         # Back right window (rotated)
-        self._draw_cube_rotated(
+        self._add_cube_rotated(
+            batcher,
             (house_x + 0.35, house_y + 0.5, house_z - wall_depth/2 - 0.04),
             (window_size, window_size, 0.03),
             window_color,
@@ -212,11 +201,20 @@ class AdvancedHouse:
         chimney_color = (0.8, 0.8, 0.8)
         roof_y = house_y + wall_height
         roof_height = 0.5
-        self._draw_cube_rotated(
+        self._add_cube_rotated(
+            batcher,
             (house_x + wall_width/2 - 0.15, roof_y + roof_height/2 + 0.25, house_z - 0.15),
             (0.1, 0.4, 0.1),
             chimney_color,
             self.chimney_texture,
             rotation_angle,
             (house_x, house_y, house_z)
-        )
\ No newline at end of file
+        )
+        
+        return batcher.build("House")
+    
+    def draw(self, position=(0, 0, 0)):
+        """Draw an advanced house with multiple components."""
+        self.shader.use()
+        self.shader.set_mat4("model", create_model_matrix(position=position))
+        draw_batches(self.shader, self.batches)
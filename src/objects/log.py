@@ -11,14 +11,18 @@ from utils.transformations import create_model_matrix
 class Log:
     """A simple cylindrical fallen log."""
     
+    TEXTURE_PATHS = {
+        "wood": "assets/textures/log.png",
+    }
+    
     def __init__(self, shader):
         self.shader = shader
         self.wood_texture = None
         
         # Load wood texture (optional)
         try:
-            from core.texture import Texture
-            self.wood_texture = Texture("assets/textures/log.png")
+            from core.texture import TextureRegistry
+            self.wood_texture = TextureRegistry.acquire(self.TEXTURE_PATHS["wood"])
             print("✅ Wood texture loaded")
         except:
             self.wood_texture = None
@@ -62,21 +66,20 @@ class Log:
             vertices.extend([x_next, y_pos_top, z_next, nx_next, 0.0, nz_next, (seg+1)/segments, 1.0])
             vertices.extend([x, y_pos_top, z, nx, 0.0, nz, seg/segments, 1.0])
         
-        self.log_mesh = Mesh(np.array(vertices, dtype=np.float32), texture=self.wood_texture)
+        self.log_mesh = Mesh.indexed(np.array(vertices, dtype=np.float32), texture=self.wood_texture, name="Log")
+    
+    def world_bounds(self, position):
+        """World-space bounding box of the log drawn at position."""
+        return self.log_mesh.bounds.translated(position)
     
-    def draw(self, view, projection, light_pos, view_pos, position, rotation_y=0.0):
+    def draw(self, position, rotation_y=0.0):
         """Draw the log at specified position."""
         self.shader.use()
-        self.shader.set_mat4("view", view)
-        self.shader.set_mat4("projection", projection)
-        self.shader.set_vec3("lightPos", light_pos)
-        self.shader.set_vec3("viewPos", view_pos)
-        self.shader.set_vec3("lightColor", (1.0, 1.0, 1.0))
         
         # Logs are vertical pillars - no rotation needed
         model = create_model_matrix(position=position)
         self.shader.set_mat4("model", model)
         self.shader.set_vec3("objectColor", (0.5, 0.35, 0.15))  # Dark brown wood
-        self.shader.set_bool("useTexture", self.wood_texture is not None)
+        self.shader.set_textured(self.wood_texture is not None)
         
         self.log_mesh.draw(self.shader)
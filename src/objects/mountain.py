@@ -8,29 +8,28 @@ from objects.primitives import create_cube_with_uv
 from utils.transformations import create_model_matrix
 
 class Mountain:
+    # Cube shared by every block of every hill, created once instead of on every draw
+    _cube_mesh = None
+    
     def __init__(self, shader):
         self.shader = shader
+        if Mountain._cube_mesh is None:
+            Mountain._cube_mesh = Mesh(create_cube_with_uv(), texture=None)
     
     def _draw_block(self, position, scale, color, use_texture=False):
         """Helper to draw a block."""
-        cube_vertices = create_cube_with_uv()
-        mesh = Mesh(cube_vertices, texture=None)
+        mesh = Mountain._cube_mesh
         
         model = create_model_matrix(position=position, scale=scale)
         self.shader.set_mat4("model", model)
         self.shader.set_vec3("objectColor", color)
-        self.shader.set_bool("useTexture", False)
+        self.shader.set_textured(False)
         
         mesh.draw(self.shader)
     
-    def draw(self, view, projection, light_pos, view_pos):
+    def draw(self):
         """Draw a simple 3-layer green hill at right back of bridge."""
         self.shader.use()
-        self.shader.set_mat4("view", view)
-        self.shader.set_mat4("projection", projection)
-        self.shader.set_vec3("lightPos", light_pos)
-        self.shader.set_vec3("viewPos", view_pos)
-        self.shader.set_vec3("lightColor", (1.0, 1.0, 1.0))
         
         # Hill positioned at right back of bridge
         hill_x = 10.0
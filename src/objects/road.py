@@ -4,10 +4,14 @@ Road class with tiled texture.
 
 import numpy as np
 from rendering.mesh import Mesh
-from core.texture import Texture
+from core.texture import TextureRegistry
 from utils.transformations import create_model_matrix
 
 class Road:
+    TEXTURE_PATHS = {
+        "road": "assets/textures/road.png",
+    }
+    
     def __init__(self, shader):
         self.shader = shader
         self.road_mesh = None
@@ -40,26 +44,21 @@ class Road:
         
         # Load road texture
         try:
-            self.road_texture = Texture("assets/textures/road.png")
+            self.road_texture = TextureRegistry.acquire(self.TEXTURE_PATHS["road"])
         except:
             print("Road texture not found, using fallback color")
             self.road_texture = None
         
-        self.road_mesh = Mesh(road_vertices, texture=self.road_texture)
+        self.road_mesh = Mesh.indexed(road_vertices, texture=self.road_texture, name="Road")
     
-    def draw(self, view, projection, light_pos, view_pos):
+    def draw(self):
         """Draw the road with tiled texture."""
         self.shader.use()
-        self.shader.set_mat4("view", view)
-        self.shader.set_mat4("projection", projection)
-        self.shader.set_vec3("lightPos", light_pos)
-        self.shader.set_vec3("viewPos", view_pos)
-        self.shader.set_vec3("lightColor", (1.0, 1.0, 1.0))
         
         road_model = create_model_matrix(
             position=(2.0, -0.1, 0.0),
             scale=(0.25, 1.0, 4.0)  # Extended length, lowered
         )
         self.shader.set_mat4("model", road_model)
-        self.shader.set_bool("useTexture", True)
+        self.shader.set_textured(True)
         self.road_mesh.draw(self.shader)
\ No newline at end of file
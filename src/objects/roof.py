@@ -5,10 +5,14 @@ Pyramid roof class for the house.
 import numpy as np
 import glm
 from rendering.mesh import Mesh
-from core.texture import Texture
+from core.texture import TextureRegistry
 
 
 class PyramidRoof:
+    TEXTURE_PATHS = {
+        "roof": "assets/textures/houseRoof.png",
+    }
+    
     def __init__(self, shader):
         """Initialize pyramid roof."""
         self.shader = shader
@@ -21,7 +25,7 @@ class PyramidRoof:
     def _load_texture(self):
         """Load roof texture."""
         try:
-            self.roof_texture = Texture("assets/textures/houseRoof.png")
+            self.roof_texture = TextureRegistry.acquire(self.TEXTURE_PATHS["roof"])
             print(f"Roof texture loaded: {self.roof_texture.texture_id}")
         except Exception as e:
             print(f"Roof texture not found: {e}")
@@ -83,16 +87,11 @@ class PyramidRoof:
             flat_vertices.extend(vertex)
         
         vertices_array = np.array(flat_vertices, dtype=np.float32)
-        self.mesh = Mesh(vertices_array)
+        self.mesh = Mesh.indexed(vertices_array, name="PyramidRoof")
     
-    def draw(self, view, projection, light_pos, view_pos, position=(0, 0, 0)):
+    def draw(self, position=(0, 0, 0)):
         """Draw the pyramid roof."""
         self.shader.use()
-        self.shader.set_mat4("view", view)
-        self.shader.set_mat4("projection", projection)
-        self.shader.set_vec3("lightPos", light_pos)
-        self.shader.set_vec3("viewPos", view_pos)
-        self.shader.set_vec3("lightColor", (1.0, 1.0, 1.0))
         
         # Create model matrix
         model = glm.translate(glm.mat4(1.0), glm.vec3(position[0], position[1], position[2]))
@@ -104,13 +103,11 @@ class PyramidRoof:
         
         # Apply texture
         if self.roof_texture:
-            self.roof_texture.bind(0)
-            self.shader.set_sampler("texture_diffuse1", 0)
-            self.shader.set_bool("useTexture", True)
+            self.shader.use_texture(self.roof_texture)
         else:
-            self.shader.set_bool("useTexture", False)
+            self.shader.set_textured(False)
         
         # Draw mesh
         self.mesh.draw(self.shader)
         
-        self.shader.set_bool("useTexture", False)
+        self.shader.set_textured(False)
@@ -5,16 +5,16 @@ Features: Textured ship with hull, decks, and cabin. Floats on the river.
 
 import numpy as np
 import glm
-import ctypes
-from OpenGL.GL import *
-from PIL import Image
+from core.texture import TextureRegistry
+from rendering.mesh import Mesh
+from rendering.mesh_cache import Geometry
+from utils.procedural_textures import ProceduralTextures
 
 
 class Ship:
     """A procedural ship model that floats on the river."""
     
     _ship_mesh = None  # Class-level mesh (created once)
-    _ship_texture = None  # Class-level texture (created once)
     
     def __init__(self, shader, position=(0.0, 0.1, 0.0)):
         """Initialize the ship.
@@ -29,15 +29,20 @@ class Ship:
         self.speed = 2.0  # Units per second (movement speed)
         self.scale = 0.4  # Scale down the ship to 40% of original size
         
-        # Create mesh and texture once (shared across all ship instances)
+        # Create mesh once (shared across all ship instances); the texture
+        # is generated once and shared through the texture registry
         if Ship._ship_mesh is None:
             Ship._ship_mesh = self._create_ship_mesh()
-        if Ship._ship_texture is None:
-            Ship._ship_texture = self._create_ship_texture()
+        self.texture = TextureRegistry.acquire_generated("ship_hull", self._create_ship_texture, mipmaps=False)
     
     @staticmethod
     def _create_ship_mesh():
-        """Create procedural ship mesh with VAO/VBO."""
+        """Create the procedural ship mesh."""
+        return Mesh.indexed(Geometry(Ship._create_ship_vertices), name="Ship")
+    
+    @staticmethod
+    def _create_ship_vertices():
+        """Triangle soup of the hull, deck, cabins and bridge."""
         vertices = []
         
         def add_vertex(x, y, z, nx, ny, nz, u, v):
@@ -126,61 +131,15 @@ class Ship:
         ship_vertices = np.array(vertices, dtype=np.float32)
         print(f"✅ Ship mesh created with {len(vertices)//8} vertices")
         
-        # Create VAO/VBO
-        vao = glGenVertexArrays(1)
-        vbo = glGenBuffers(1)
-        
-        glBindVertexArray(vao)
-        glBindBuffer(GL_ARRAY_BUFFER, vbo)
-        glBufferData(GL_ARRAY_BUFFER, ship_vertices.nbytes, ship_vertices, GL_STATIC_DRAW)
-        
-        # Vertex attributes (8 floats per vertex: 3 pos, 3 normal, 2 uv)
-        stride = 8 * 4
-        
-        glVertexAttribPointer(0, 3, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(0))
-        glEnableVertexAttribArray(0)
-        
-        glVertexAttribPointer(1, 3, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(3 * 4))
-        glEnableVertexAttribArray(1)
-        
-        glVertexAttribPointer(2, 2, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(6 * 4))
-        glEnableVertexAttribArray(2)
-        
-        glBindVertexArray(0)
-        
-        return {"vao": vao, "vbo": vbo, "vertex_count": len(vertices) // 8}
+        return ship_vertices
     
     @staticmethod
     def _create_ship_texture():
-        """Create procedural ship hull texture."""
-        width, height = 256, 256
-        img = Image.new('RGB', (width, height), (240, 240, 240))  # White hull
-        pixels = img.load()
-        
-        # Draw windows (dark blue glass)
-        for y in range(80, 140):
-            for x in range(width):
-                if (x // 30) % 2 == 0:  # Spaced windows
-                    pixels[x, y] = (20, 20, 40)  # Dark blue
-        
-        # Add wood trim at bottom
-        for y in range(230, 240):
-            for x in range(width):
-                pixels[x, y] = (139, 69, 19)  # Wood brown
-        
-        # Convert to OpenGL texture
-        img_data = img.tobytes()
-        
-        texture_id = glGenTextures(1)
-        glBindTexture(GL_TEXTURE_2D, texture_id)
-        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_REPEAT)
-        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_REPEAT)
-        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
-        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
-        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGB, width, height, 0, GL_RGB, GL_UNSIGNED_BYTE, img_data)
+        """Create procedural ship hull texture image."""
+        img = ProceduralTextures.bake("ship_hull")
         
         print("✅ Ship texture created")
-        return texture_id
+        return img
     
     def update(self, delta_time):
         """Update ship position (animate along river)."""
@@ -191,16 +150,12 @@ class Ship:
         if self.position[2] > 20.0:
             self.position[2] = -20.0
     
-    def draw(self, view, projection, light_pos, view_pos):
+    def draw(self):
         """Draw the ship using the application shader."""
         if Ship._ship_mesh is None:
             return
         
         self.shader.use()
-        self.shader.set_mat4("view", view)
-        self.shader.set_mat4("projection", projection)
-        self.shader.set_vec3("lightPos", light_pos)
-        self.shader.set_vec3("viewPos", view_pos)
         
         # Create model matrix with translation, rotation, and scale
         model = glm.translate(glm.mat4(1.0), glm.vec3(
@@ -213,16 +168,11 @@ class Ship:
         
         self.shader.set_mat4("model", model)
         self.shader.set_vec3("objectColor", (1.0, 1.0, 1.0))  # White
-        self.shader.set_bool("useTexture", True)
         
         # Bind texture
-        glActiveTexture(GL_TEXTURE0)
-        glBindTexture(GL_TEXTURE_2D, Ship._ship_texture)
-        self.shader.set_sampler("texture1", 0)
+        self.shader.use_texture(self.texture)
         
         # Draw
-        glBindVertexArray(Ship._ship_mesh["vao"])
-        glDrawArrays(GL_TRIANGLES, 0, Ship._ship_mesh["vertex_count"])
-        glBindVertexArray(0)
+        Ship._ship_mesh.draw(self.shader)
         
-        self.shader.set_bool("useTexture", False)
\ No newline at end of file
+        self.shader.set_textured(False)
\ No newline at end of file
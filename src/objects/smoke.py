@@ -7,40 +7,13 @@ import numpy as np
 import glm
 from OpenGL.GL import *
 from rendering.mesh import Mesh
-from core.texture import Texture
-from PIL import Image
-import math
+from rendering.mesh_cache import Geometry
+from core.texture import TextureRegistry
+from utils.procedural_textures import ProceduralTextures
 
 def generate_smoke_texture():
     """Generate a procedural smoke texture with alpha channel."""
-    width, height = 128, 128
-    data = np.zeros((height, width, 4), dtype=np.uint8)
-    
-    # Create smoke-like radial gradient
-    center_x, center_y = width / 2, height / 2
-    max_dist = math.sqrt((width/2)**2 + (height/2)**2)
-    
-    for y in range(height):
-        for x in range(width):
-            # Distance from center
-            dx = x - center_x
-            dy = y - center_y
-            dist = math.sqrt(dx*dx + dy*dy)
-            
-            # Create radial falloff for smoke puff
-            falloff = max(0, 1.0 - (dist / max_dist))
-            
-            # Add some noise variation
-            noise = math.sin(x * 0.1) * math.cos(y * 0.1) * 0.3 + 0.7
-            
-            # Smoke color (light gray/white)
-            intensity = int(200 * falloff * noise)
-            alpha = int(255 * falloff * falloff)  # Quadratic falloff for alpha
-            
-            data[y, x] = [220, 220, 220, alpha]
-    
-    image = Image.fromarray(data, 'RGBA')
-    return image
+    return ProceduralTextures.bake("smoke")
 
 class SmokeParticle:
     """A single smoke particle."""
@@ -89,7 +62,10 @@ class SmokeParticle:
 class SmokeSystem:
     """Manages smoke particles from chimney."""
     
-    _smoke_texture = None
+    TEXTURE_PATHS = {
+        "smoke": "assets/textures/cloud.png",
+    }
+    
     _smoke_mesh = None
     
     def __init__(self, shader, chimney_position=(5.0, 1.8, 0.0)):
@@ -108,47 +84,35 @@ class SmokeSystem:
         # Load shared resources
         if SmokeSystem._smoke_mesh is None:
             self._create_smoke_mesh()
-        if SmokeSystem._smoke_texture is None:
-            self._load_texture_once()
+        self.texture = self._acquire_texture()
         
         print("✅ SmokeSystem created")
     
-    @classmethod
-    def _load_texture_once(cls):
-        """Load cloud.png texture for smoke."""
+    @staticmethod
+    def _acquire_texture():
+        """Get the shared cloud.png texture for smoke, generating one if it is missing."""
         try:
-            # Load cloud.png from file for smoke texture
-            cls._smoke_texture = Texture("assets/textures/cloud.png")
-            print("✅ Smoke texture loaded from cloud.png")
+            # Same registry entry as the clouds, so cloud.png is only loaded once
+            return TextureRegistry.acquire(SmokeSystem.TEXTURE_PATHS["smoke"])
         except Exception as e:
             print(f"Failed to load cloud.png for smoke ({e}), generating procedurally...")
-            # Generate procedurally as fallback
-            try:
-                img = generate_smoke_texture()
-                img_data = img.tobytes()
-                
-                texture_id = glGenTextures(1)
-                glBindTexture(GL_TEXTURE_2D, texture_id)
-                glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_REPEAT)
-                glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_REPEAT)
-                glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
-                glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
-                glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, img.width, img.height, 0, GL_RGBA, GL_UNSIGNED_BYTE, img_data)
-                glGenerateMipmap(GL_TEXTURE_2D)
                 
-                # Create a temporary texture object
-                class TempTexture:
-                    def __init__(self, tid):
-                        self.texture_id = tid
-                
-                cls._smoke_texture = TempTexture(texture_id)
-                print("✅ Smoke texture generated procedurally")
-            except Exception as e:
-                print(f"Failed to create smoke texture: {e}")
+        # Generate procedurally as fallback
+        try:
+            return TextureRegistry.acquire_generated("smoke", generate_smoke_texture)
+        except Exception as e:
+            print(f"Failed to create smoke texture: {e}")
+            return None
     
     @classmethod
     def _create_smoke_mesh(cls):
         """Create a small cube mesh for smoke particles."""
+        cls._smoke_mesh = Mesh.indexed(Geometry(cls._create_smoke_vertices), optimize=False, name="SmokeSystem")
+        print("✅ Smoke cube mesh created")
+    
+    @staticmethod
+    def _create_smoke_vertices():
+        """Triangle soup of the unit cube."""
         # Small cube with 6 faces
         vertices = [
             # Front face
@@ -200,9 +164,7 @@ class SmokeSystem:
             -0.5, -0.5, -0.5,  -1, 0, 0,  0, 0,
         ]
         
-        smoke_vertices = np.array(vertices, dtype=np.float32)
-        cls._smoke_mesh = Mesh(smoke_vertices)
-        print("✅ Smoke cube mesh created")
+        return np.array(vertices, dtype=np.float32)
     
     def emit_particles(self, delta_time):
         """Emit new particles from chimney."""
@@ -240,27 +202,19 @@ class SmokeSystem:
         # Update and remove dead particles
         self.particles = [p for p in self.particles if p.update(delta_time)]
     
-    def draw(self, view, projection, light_pos, view_pos):
+    def draw(self):
         """Render all smoke particles with optimized batching."""
-        if not self.particles or SmokeSystem._smoke_mesh is None or SmokeSystem._smoke_texture is None:
+        if not self.particles or SmokeSystem._smoke_mesh is None or self.texture is None:
             return
         
         self.shader.use()
-        self.shader.set_mat4("view", view)
-        self.shader.set_mat4("projection", projection)
-        self.shader.set_vec3("lightPos", light_pos)
-        self.shader.set_vec3("viewPos", view_pos)
-        self.shader.set_vec3("lightColor", (1.0, 1.0, 1.0))
         
         # Enable blending with additive mode to hide black background from cloud.png
         glEnable(GL_BLEND)
         glBlendFunc(GL_SRC_COLOR, GL_ONE)  # Additive blend: ignore black, show white/colors
         
         # Bind texture ONCE for all particles (major optimization)
-        glActiveTexture(GL_TEXTURE0)
-        glBindTexture(GL_TEXTURE_2D, SmokeSystem._smoke_texture.texture_id)
-        self.shader.set_sampler("texture1", 0)
-        self.shader.set_bool("useTexture", True)
+        self.shader.use_texture(self.texture)
         self.shader.set_vec3("objectColor", (1.0, 1.0, 1.0))  # White to blend with cloud texture
         
         # Draw each particle
@@ -4,10 +4,14 @@ Terrain class with textures.
 
 import numpy as np
 from rendering.mesh import Mesh
-from core.texture import Texture
+from core.texture import TextureRegistry
 from utils.transformations import create_model_matrix
 
 class Terrain:
+    TEXTURE_PATHS = {
+        "grass": "assets/textures/grass.png",
+    }
+    
     def __init__(self, shader):
         self.shader = shader
         self.ground_mesh = None
@@ -101,33 +105,28 @@ class Terrain:
         
         # Load texture with debug info
         try:
-            self.grass_texture = Texture("assets/textures/grass.png")
+            self.grass_texture = TextureRegistry.acquire(self.TEXTURE_PATHS["grass"])
             print(f"✅ Grass texture loaded: {self.grass_texture.texture_id}")
         except Exception as e:
             print(f"❌ Grass texture failed: {e}")
             self.grass_texture = None
         
-        self.ground_mesh = Mesh(ground_vertices, texture=self.grass_texture)
-        self.river_channel_mesh = Mesh(river_vertices)
+        self.ground_mesh = Mesh.indexed(ground_vertices, texture=self.grass_texture, name="Terrain")
+        self.river_channel_mesh = Mesh.indexed(river_vertices, name="Terrain")
     
-    def draw(self, view, projection, light_pos, view_pos):
+    def draw(self):
         """Draw the terrain - FORCE TEXTURE."""
         self.shader.use()
-        self.shader.set_mat4("view", view)
-        self.shader.set_mat4("projection", projection)
-        self.shader.set_vec3("lightPos", light_pos)
-        self.shader.set_vec3("viewPos", view_pos)
-        self.shader.set_vec3("lightColor", (1.0, 1.0, 1.0))
         
         # Draw ground WITH TEXTURE FORCED
         ground_model = create_model_matrix(position=(0.0, 0.0, 0.0))
         self.shader.set_mat4("model", ground_model)
-        self.shader.set_bool("useTexture", True)  # FORCE TEXTURE
+        self.shader.set_textured(True)  # FORCE TEXTURE
         self.ground_mesh.draw(self.shader)
         
         # Draw river channel WITHOUT TEXTURE
         river_channel_model = create_model_matrix(position=(-3.0, 0.0, 0.0))
         self.shader.set_mat4("model", river_channel_model)
-        self.shader.set_bool("useTexture", False)  # No texture
+        self.shader.set_textured(False)  # No texture
         self.shader.set_vec3("objectColor", (0.6, 0.5, 0.3))
         self.river_channel_mesh.draw(self.shader)
\ No newline at end of file
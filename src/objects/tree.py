@@ -21,14 +21,9 @@ class Tree:
         self.trunk_mesh = Mesh(cube_vertices)
         self.leaves_mesh = Mesh(cube_vertices)
     
-    def draw(self, view, projection, light_pos, view_pos, position=(0, 0, 0)):
+    def draw(self, position=(0, 0, 0)):
         """Draw the tree at specified position."""
         self.shader.use()
-        self.shader.set_mat4("view", view)
-        self.shader.set_mat4("projection", projection)
-        self.shader.set_vec3("lightPos", light_pos)
-        self.shader.set_vec3("viewPos", view_pos)
-        self.shader.set_vec3("lightColor", (1.0, 1.0, 1.0))
         
         # Tree trunk
         trunk_model = create_model_matrix(
@@ -4,10 +4,15 @@ Water class with texture support.
 
 import numpy as np
 from rendering.mesh import Mesh
-from core.texture import Texture
+from rendering.vertex_format import COMPACT_FORMAT
+from core.texture import TextureRegistry
 from utils.transformations import create_model_matrix
 
 class Water:
+    TEXTURE_PATHS = {
+        "water": "assets/textures/water.png",
+    }
+    
     def __init__(self, shader):
         self.shader = shader
         self.water_mesh = None
@@ -55,26 +60,22 @@ class Water:
         # Load water texture
         try:
             print("Loading texture: assets/textures/water.png")
-            self.water_texture = Texture("assets/textures/water.png")
+            self.water_texture = TextureRegistry.acquire(self.TEXTURE_PATHS["water"])
             print(f"✅ Water texture loaded: {self.water_texture.texture_id}")
         except Exception as e:
             print(f"Water texture not found: {e}")
             self.water_texture = None
         
-        self.water_mesh = Mesh(water_vertices, texture=self.water_texture)
+        self.water_mesh = Mesh.indexed(water_vertices, texture=self.water_texture, optimize=False, name="Water",
+                                       vertex_format=COMPACT_FORMAT)
     
     def update(self, delta_time):
         """Update water animation."""
         self.time += delta_time
     
-    def draw(self, view, projection, light_pos, view_pos):
+    def draw(self):
         """Draw the water."""
         self.shader.use()
-        self.shader.set_mat4("view", view)
-        self.shader.set_mat4("projection", projection)
-        self.shader.set_vec3("lightPos", light_pos)
-        self.shader.set_vec3("viewPos", view_pos)
-        self.shader.set_vec3("lightColor", (1.0, 1.0, 1.0))
         self.shader.set_float("time", self.time)
         
         water_model = create_model_matrix(position=(-3.0, 0.0, 0.0))
@@ -0,0 +1,208 @@
+"""
+Shared GPU buffers: every mesh of one vertex format lives in one VBO/EBO pair behind one VAO.
+
+A mesh only owns a range of vertices and a range of indices in its
+format's arena and is drawn with glDrawElementsBaseVertex, so switching
+between meshes needs no VAO bind and the whole scene uses one VAO per
+vertex format instead of one per mesh.
+"""
+
+import OpenGL.GL as gl
+from core.gpu_resources import BUFFER, GpuResources
+
+# Buffers start this big and double whenever a mesh does not fit
+INITIAL_VERTEX_BYTES = 1024 * 1024
+INITIAL_INDEX_BYTES = 256 * 1024
+
+# Index ranges start on 4 bytes so uint16 and uint32 ranges can share a buffer
+INDEX_ALIGNMENT = 4
+
+
+class RangeAllocator:
+    """First-fit suballocation of byte ranges; freed ranges are merged and reused."""
+    
+    def __init__(self):
+        self.end = 0
+        self.free = []  # (offset, size), sorted by offset
+    
+    @property
+    def used(self):
+        return self.end - sum(size for _, size in self.free)
+    
+    def allocate(self, size, alignment=1):
+        """Offset of a new range of size bytes aligned to alignment."""
+        for i, (offset, length) in enumerate(self.free):
+            start = -(-offset // alignment) * alignment
+            if start + size <= offset + length:
+                pieces = []
+                if start > offset:
+                    pieces.append((offset, start - offset))
+                if start + size < offset + length:
+                    pieces.append((start + size, offset + length - start - size))
+                self.free[i:i + 1] = pieces
+                return start
+        start = -(-self.end // alignment) * alignment
+        self.end = start + size
+        return start
+    
+    def release(self, offset, size):
+        """Give a range back, merging it with free neighbours (and the end of the buffer)."""
+        if size <= 0:
+            return
+        self.free.append((offset, size))
+        self.free.sort()
+        merged = []
+        for start, length in self.free:
+            if merged and merged[-1][0] + merged[-1][1] >= start:
+                last_start, last_length = merged[-1]
+                merged[-1] = (last_start, max(last_length, start + length - last_start))
+            else:
+                merged.append((start, length))
+        if merged and merged[-1][0] + merged[-1][1] >= self.end:
+            self.end = merged.pop()[0]
+        self.free = merged
+
+
+class ArenaRange:
+    """Where one mesh's data lives in an arena: byte offsets and sizes of its vertices and indices."""
+    
+    def __init__(self, arena, vertex_offset, vertex_bytes, index_offset=0, index_bytes=0):
+        self.arena = arena
+        self.vertex_offset = vertex_offset
+        self.vertex_bytes = vertex_bytes
+        self.index_offset = index_offset
+        self.index_bytes = index_bytes
+    
+    @property
+    def base_vertex(self):
+        return self.vertex_offset // self.arena.vertex_format.stride
+
+
+class BufferArena:
+    """One VAO with a growable VBO and EBO holding the meshes of one vertex format."""
+    
+    # VertexFormat -> BufferArena
+    _arenas = {}
+    # VAO currently bound with glBindVertexArray (shared by all arenas)
+    bound_vao = 0
+    
+    def __init__(self, vertex_format):
+        self.vertex_format = vertex_format
+        self.vao = GpuResources.create_vertex_array(str(vertex_format))
+        self.vbo = None
+        self.ebo = None
+        self.vbo_capacity = 0
+        self.ebo_capacity = 0
+        self.vertex_ranges = RangeAllocator()
+        self.index_ranges = RangeAllocator()
+        self.meshes = 0
+    
+    @classmethod
+    def for_format(cls, vertex_format):
+        """The arena for vertex_format, created on first use."""
+        arena = cls._arenas.get(vertex_format)
+        if arena is None:
+            arena = cls._arenas[vertex_format] = cls(vertex_format)
+        return arena
+    
+    def bind(self):
+        """Bind the arena's VAO unless it already is."""
+        if BufferArena.bound_vao != self.vao:
+            gl.glBindVertexArray(self.vao)
+            BufferArena.bound_vao = self.vao
+    
+    def allocate(self, vertices, indices=None):
+        """Copy packed vertices (and indices) into the arena; returns their ArenaRange."""
+        GpuResources.allocated(f"mesh in the {self.vertex_format} arena")
+        stride = self.vertex_format.stride
+        in_use = self.vertex_ranges.end
+        vertex_offset = self.vertex_ranges.allocate(vertices.nbytes, stride)
+        self._reserve_vertices(self.vertex_ranges.end, in_use)
+        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self.vbo)
+        gl.glBufferSubData(gl.GL_ARRAY_BUFFER, vertex_offset, vertices.nbytes, vertices)
+        
+        arena_range = ArenaRange(self, vertex_offset, vertices.nbytes)
+        if indices is not None:
+            in_use = self.index_ranges.end
+            arena_range.index_offset = self.index_ranges.allocate(indices.nbytes, INDEX_ALIGNMENT)
+            arena_range.index_bytes = indices.nbytes
+            self._reserve_indices(self.index_ranges.end, in_use)
+            # Upload through the copy target: binding GL_ELEMENT_ARRAY_BUFFER would change the bound VAO
+            gl.glBindBuffer(gl.GL_COPY_WRITE_BUFFER, self.ebo)
+            gl.glBufferSubData(gl.GL_COPY_WRITE_BUFFER, arena_range.index_offset, indices.nbytes, indices)
+        
+        self.meshes += 1
+        return arena_range
+    
+    def release(self, arena_range):
+        """Free a mesh's ranges for later meshes."""
+        self.vertex_ranges.release(arena_range.vertex_offset, arena_range.vertex_bytes)
+        self.index_ranges.release(arena_range.index_offset, arena_range.index_bytes)
+        self.meshes -= 1
+    
+    def _grown(self, buffer, capacity, used, required, initial, label):
+        """(buffer, capacity) with room for required bytes; the first used bytes are carried over."""
+        if required <= capacity:
+            return buffer, capacity
+        new_capacity = max(capacity, initial)
+        while new_capacity < required:
+            new_capacity *= 2
+        new_buffer = GpuResources.create_buffer(f"{self.vertex_format} {label}")
+        gl.glBindBuffer(gl.GL_COPY_WRITE_BUFFER, new_buffer)
+        gl.glBufferData(gl.GL_COPY_WRITE_BUFFER, new_capacity, None, gl.GL_STATIC_DRAW)
+        GpuResources.set_size(BUFFER, new_buffer, new_capacity)
+        if buffer is not None:
+            if used:
+                gl.glBindBuffer(gl.GL_COPY_READ_BUFFER, buffer)
+                gl.glCopyBufferSubData(gl.GL_COPY_READ_BUFFER, gl.GL_COPY_WRITE_BUFFER, 0, 0, used)
+            GpuResources.delete_buffer(buffer)
+        return new_buffer, new_capacity
+    
+    def _reserve_vertices(self, required, in_use):
+        """Grow the VBO to required bytes and point the VAO at the new buffer."""
+        vbo, self.vbo_capacity = self._grown(self.vbo, self.vbo_capacity, in_use, required, INITIAL_VERTEX_BYTES,
+                                             "vertices")
+        if vbo != self.vbo:
+            self.vbo = vbo
+            self.bind()
+            gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self.vbo)
+            self.vertex_format.setup_attributes()
+    
+    def _reserve_indices(self, required, in_use):
+        """Grow the EBO to required bytes and attach the new buffer to the VAO."""
+        ebo, self.ebo_capacity = self._grown(self.ebo, self.ebo_capacity, in_use, required, INITIAL_INDEX_BYTES,
+                                             "indices")
+        if ebo != self.ebo:
+            self.ebo = ebo
+            self.bind()
+            gl.glBindBuffer(gl.GL_ELEMENT_ARRAY_BUFFER, self.ebo)
+    
+    def delete(self):
+        """Free the VAO and buffers; every mesh in the arena becomes invalid."""
+        if BufferArena.bound_vao == self.vao:
+            gl.glBindVertexArray(0)
+            BufferArena.bound_vao = 0
+        GpuResources.delete_buffer(self.vbo)
+        GpuResources.delete_buffer(self.ebo)
+        GpuResources.delete_vertex_array(self.vao)
+        self.vao = self.vbo = self.ebo = None
+    
+    @classmethod
+    def release_all(cls):
+        """Delete every arena (at shutdown, while the context is still current)."""
+        for arena in cls._arenas.values():
+            arena.delete()
+        cls._arenas.clear()
+    
+    @classmethod
+    def report(cls):
+        """Print what the arenas hold."""
+        if not cls._arenas:
+            return
+        kilobytes = 1024
+        for arena in cls._arenas.values():
+            print(f"   {arena.vertex_format}: {arena.meshes} meshes, "
+                  f"{arena.vertex_ranges.used / kilobytes:.1f} KB of {arena.vbo_capacity / kilobytes:.0f} KB vertices, "
+                  f"{arena.index_ranges.used / kilobytes:.1f} KB of {arena.ebo_capacity / kilobytes:.0f} KB indices")
+        meshes = sum(arena.meshes for arena in cls._arenas.values())
+        print(f"✅ Buffer arenas: {meshes} meshes in {len(cls._arenas)} VAOs")
@@ -0,0 +1,86 @@
+"""
+Per-instance attributes for instanced draws: a model matrix and a colour for every instance.
+"""
+
+import OpenGL.GL as gl
+import numpy as np
+from core.gpu_resources import BUFFER, GpuResources
+
+# Attribute locations, as declared in the INSTANCED variant of textured.vert;
+# the mat4 takes one location per column (4-7)
+INSTANCE_MODEL_LOCATION = 4
+INSTANCE_COLOR_LOCATION = 8
+
+INSTANCE_DTYPE = np.dtype([("model", np.float32, (16,)), ("color", np.float32, (4,))])
+
+
+def instance_matrices(positions, scales):
+    """Column-major translate * uniform scale model matrices, (n, 16) float32, for (n, 3) positions."""
+    positions = np.asarray(positions, dtype=np.float32).reshape(-1, 3)
+    scales = np.broadcast_to(np.asarray(scales, dtype=np.float32), (len(positions),))
+    matrices = np.zeros((len(positions), 16), dtype=np.float32)
+    matrices[:, 0] = matrices[:, 5] = matrices[:, 10] = scales
+    matrices[:, 12:15] = positions
+    matrices[:, 15] = 1.0
+    return matrices
+
+
+class InstanceBuffer:
+    """A VBO of INSTANCE_DTYPE records, fed to a mesh's VAO with an attribute divisor of 1.
+    
+    Ranges of instances are drawn by pointing the attributes at their
+    first record, so one buffer can hold the instances of several meshes.
+    """
+    
+    def __init__(self):
+        self.vbo = GpuResources.create_buffer("instances")
+        self.capacity = 0
+        self.count = 0
+    
+    def upload(self, models, colors):
+        """Replace the contents with (n, 16) model matrices and (n, 3|4) colours."""
+        models = np.asarray(models, dtype=np.float32).reshape(-1, 16)
+        colors = np.asarray(colors, dtype=np.float32)
+        colors = colors.reshape(-1, colors.shape[-1])
+        records = np.zeros(len(models), dtype=INSTANCE_DTYPE)
+        records["model"] = models
+        records["color"][:, :colors.shape[1]] = colors
+        if colors.shape[1] == 3:
+            records["color"][:, 3] = 1.0
+        
+        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self.vbo)
+        if len(records) > self.capacity:
+            GpuResources.allocated("instance buffer growth")
+            self.capacity = len(records)
+            gl.glBufferData(gl.GL_ARRAY_BUFFER, records.nbytes, records, gl.GL_DYNAMIC_DRAW)
+            GpuResources.set_size(BUFFER, self.vbo, records.nbytes)
+        elif len(records):
+            gl.glBufferSubData(gl.GL_ARRAY_BUFFER, 0, records.nbytes, records)
+        self.count = len(records)
+    
+    def bind_attributes(self, first=0):
+        """Point the instance attributes of the bound VAO at the records from first on."""
+        stride = INSTANCE_DTYPE.itemsize
+        base = first * stride
+        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self.vbo)
+        for column in range(4):
+            location = INSTANCE_MODEL_LOCATION + column
+            gl.glVertexAttribPointer(location, 4, gl.GL_FLOAT, gl.GL_FALSE, stride,
+                                     gl.ctypes.c_void_p(base + INSTANCE_DTYPE.fields["model"][1] + column * 16))
+            gl.glVertexAttribDivisor(location, 1)
+            gl.glEnableVertexAttribArray(location)
+        gl.glVertexAttribPointer(INSTANCE_COLOR_LOCATION, 4, gl.GL_FLOAT, gl.GL_FALSE, stride,
+                                 gl.ctypes.c_void_p(base + INSTANCE_DTYPE.fields["color"][1]))
+        gl.glVertexAttribDivisor(INSTANCE_COLOR_LOCATION, 1)
+        gl.glEnableVertexAttribArray(INSTANCE_COLOR_LOCATION)
+    
+    @staticmethod
+    def unbind_attributes():
+        """Disable the instance attributes of the bound VAO again (the VAO is shared with plain draws)."""
+        for location in range(INSTANCE_MODEL_LOCATION, INSTANCE_COLOR_LOCATION + 1):
+            gl.glDisableVertexAttribArray(location)
+    
+    def delete(self):
+        """Free the buffer."""
+        GpuResources.delete_buffer(self.vbo)
+        self.vbo = None
@@ -0,0 +1,321 @@
+"""
+Level of detail: simplified versions of a mesh, and the choice between them by projected size.
+
+simplify() reduces an indexed mesh by quadric error edge collapse
+(Garland & Heckbert 1997): every vertex carries the squared distances to
+the planes of its faces, and the edges whose collapse moves the surface
+least go first. Collapses are half-edge collapses onto an existing
+vertex, so the kept vertices keep their normals and texture coordinates.
+Independent collapses are made in batches with NumPy; a collapse that
+would fold a triangle over is skipped.
+
+A LodMesh holds the full mesh and its simplified levels with the
+projected sizes below which each level takes over. Objects ask it for a
+level every frame with the level they drew last, so an object sitting
+right at a threshold does not flicker between two levels.
+"""
+
+import numpy as np
+from rendering.mesh import Mesh
+from rendering.mesh_cache import source_hash
+from rendering.mesh_tools import optimize_vertex_cache, reorder_vertices
+
+# Fraction of the triangles kept by LOD 1, 2 and 3
+LOD_RATIOS = (0.5, 0.25, 0.12)
+
+# Projected diameter, as a fraction of the viewport height, below which LOD 1, 2 and 3 are drawn
+LOD_SCREEN_SIZES = (0.3, 0.12, 0.05)
+
+# A level changes only once the projected size is this far (relative) past the threshold
+LOD_HYSTERESIS = 0.15
+
+# Levels that save less than this fraction of the previous level's triangles are dropped
+MIN_REDUCTION = 0.1
+
+# Border edges keep their place this much more strongly than the surface around them
+BOUNDARY_WEIGHT = 100.0
+
+# Smallest cosine between a triangle's normal before and after a collapse
+MIN_NORMAL_COSINE = 0.2
+
+
+def _triangle_normals(points, triangles):
+    """Unnormalized normals (twice the area long) of (m, 3) position-index triangles."""
+    p0, p1, p2 = points[triangles[:, 0]], points[triangles[:, 1]], points[triangles[:, 2]]
+    return np.cross(p1 - p0, p2 - p0)
+
+
+def _non_degenerate(triangles):
+    return (triangles[:, 0] != triangles[:, 1]) & (triangles[:, 1] != triangles[:, 2]) \
+        & (triangles[:, 0] != triangles[:, 2])
+
+
+def _plane_quadrics(planes, weights):
+    """(k, 4, 4) quadrics of (k, 4) planes, scaled by weights."""
+    return planes[:, :, None] * planes[:, None, :] * weights[:, None, None]
+
+
+def _quadrics(points, triangles):
+    """Per-position error quadrics: area-weighted face planes, plus border planes."""
+    normals = _triangle_normals(points, triangles)
+    doubled_areas = np.linalg.norm(normals, axis=1)
+    keep = doubled_areas > 1e-20
+    triangles, normals, doubled_areas = triangles[keep], normals[keep] / doubled_areas[keep, None], doubled_areas[keep]
+    
+    quadrics = np.zeros((len(points), 4, 4))
+    planes = np.hstack([normals, -(normals * points[triangles[:, 0]]).sum(axis=1, keepdims=True)])
+    face_quadrics = _plane_quadrics(planes, doubled_areas * 0.5)
+    for corner in range(3):
+        np.add.at(quadrics, triangles[:, corner], face_quadrics)
+    
+    # Edges used by a single triangle: a plane through the edge, perpendicular to the face
+    edges = triangles[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2)
+    _, inverse, counts = np.unique(np.sort(edges, axis=1), axis=0, return_inverse=True, return_counts=True)
+    border = counts[inverse.ravel()] == 1
+    if border.any():
+        edges = edges[border]
+        direction = points[edges[:, 1]] - points[edges[:, 0]]
+        side = np.cross(direction, normals[np.repeat(np.arange(len(triangles)), 3)[border]])
+        side /= np.maximum(np.linalg.norm(side, axis=1, keepdims=True), 1e-20)
+        planes = np.hstack([side, -(side * points[edges[:, 0]]).sum(axis=1, keepdims=True)])
+        border_quadrics = _plane_quadrics(planes, BOUNDARY_WEIGHT * (direction * direction).sum(axis=1))
+        np.add.at(quadrics, edges[:, 0], border_quadrics)
+        np.add.at(quadrics, edges[:, 1], border_quadrics)
+    return quadrics
+
+
+def _select_collapses(points, quadrics, triangles, budget):
+    """Cheapest independent (source, target) position collapses removing about budget triangles."""
+    edges = np.unique(np.sort(triangles[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2), axis=1), axis=0)
+    a, b = edges[:, 0], edges[:, 1]
+    combined = quadrics[a] + quadrics[b]
+    homogeneous_a = np.hstack([points[a], np.ones((len(a), 1))])
+    homogeneous_b = np.hstack([points[b], np.ones((len(b), 1))])
+    cost_onto_b = np.einsum("ni,nij,nj->n", homogeneous_b, combined, homogeneous_b)
+    cost_onto_a = np.einsum("ni,nij,nj->n", homogeneous_a, combined, homogeneous_a)
+    onto_b = cost_onto_b <= cost_onto_a
+    sources = np.where(onto_b, a, b).tolist()
+    targets = np.where(onto_b, b, a).tolist()
+    order = np.argsort(np.where(onto_b, cost_onto_b, cost_onto_a), kind="stable").tolist()
+    
+    # Position -> triangles adjacency in CSR form
+    corners = triangles.ravel()
+    adjacency = np.argsort(corners, kind="stable") // 3
+    starts = np.concatenate([[0], np.cumsum(np.bincount(corners, minlength=len(points)))]).tolist()
+    
+    locked = np.zeros(len(points), dtype=bool)
+    chosen_sources, chosen_targets = [], []
+    removed = 0
+    for edge in order:
+        source, target = sources[edge], targets[edge]
+        if locked[source] or locked[target]:
+            continue
+        around = triangles[adjacency[starts[source]:starts[source + 1]]]
+        collapsing = (around == target).any(axis=1)
+        moved = around[~collapsing]
+        if len(moved):
+            before = _triangle_normals(points, moved)
+            after = _triangle_normals(points, np.where(moved == source, target, moved))
+            lengths = np.linalg.norm(before, axis=1) * np.linalg.norm(after, axis=1)
+            if ((before * after).sum(axis=1) <= MIN_NORMAL_COSINE * lengths).any():
+                continue
+        # The source's whole neighbourhood stays fixed for the rest of the batch
+        locked[around.ravel()] = True
+        chosen_sources.append(source)
+        chosen_targets.append(target)
+        removed += int(collapsing.sum())
+        if removed >= budget:
+            break
+    return np.array(chosen_sources, dtype=np.int64), np.array(chosen_targets, dtype=np.int64)
+
+
+def _compact(rows, triangles):
+    """(vertices, indices) of the rows the triangles use, cache-ordered."""
+    used, indices = np.unique(triangles.ravel(), return_inverse=True)
+    indices = optimize_vertex_cache(indices.astype(np.int64), len(used))
+    return reorder_vertices(rows[used], indices)
+
+
+def simplify(vertices, indices, ratios=LOD_RATIOS):
+    """Simplified versions of an indexed mesh: one (vertices, indices) per ratio of triangles kept.
+    
+    vertices are rows of 8+ float32 (extra columns, e.g. colours, follow
+    their vertex). Each level continues from the previous one, so ratios
+    must decrease. A level stops early when no collapse is left that does
+    not fold a triangle over.
+    """
+    rows = np.asarray(vertices, dtype=np.float32)
+    rows = rows if rows.ndim == 2 else rows.reshape(-1, 8)
+    # Topology works on positions: rows that only differ by normal or texture coordinates collapse together
+    points, position_ids = np.unique(rows[:, :3].astype(np.float64), axis=0, return_inverse=True)
+    position_ids = position_ids.ravel()
+    first_row = np.empty(len(points), dtype=np.int64)
+    first_row[position_ids[::-1]] = np.arange(len(rows) - 1, -1, -1)
+    
+    triangles = np.asarray(indices, dtype=np.int64).reshape(-1, 3)
+    triangles = triangles[_non_degenerate(position_ids[triangles])]
+    quadrics = _quadrics(points, position_ids[triangles])
+    
+    levels = []
+    start = len(triangles)
+    for ratio in ratios:
+        target = int(start * ratio)
+        while len(triangles) > target:
+            positions = position_ids[triangles]
+            sources, targets = _select_collapses(points, quadrics, positions, len(triangles) - target)
+            if not len(sources):
+                break
+            collapse_to = np.full(len(points), -1, dtype=np.int64)
+            collapse_to[sources] = targets
+            
+            # Rows of a collapsed position move to a row of the target position, preferably the one
+            # across the collapsed edge in the same triangle (keeps texture and normal seams apart)
+            row_map = np.arange(len(rows))
+            moving = collapse_to[position_ids] >= 0
+            row_map[moving] = first_row[collapse_to[position_ids[moving]]]
+            for i in range(3):
+                for j in range(3):
+                    if i != j:
+                        across = collapse_to[positions[:, i]] == positions[:, j]
+                        row_map[triangles[across, i]] = triangles[across, j]
+            
+            np.add.at(quadrics, targets, quadrics[sources])
+            triangles = row_map[triangles]
+            triangles = triangles[_non_degenerate(position_ids[triangles])]
+        levels.append(_compact(rows, triangles))
+    return levels
+
+
+class LodMesh:
+    """A mesh and its simplified levels, with the projected size below which each level is drawn."""
+    
+    # Off: generate() keeps only the full mesh (see MESH_LOD in config.py)
+    enabled = True
+    # Camera position and 1 / tan(fov / 2), set once per frame with set_view
+    view_position = np.zeros(3)
+    projection_scale = 1.0
+    # Triangles drawn through LodMeshes since reset_stats, and what they would have been at full detail
+    triangles = 0
+    full_triangles = 0
+    # name -> [meshes, triangles per level]
+    _objects = {}
+    
+    def __init__(self, levels, screen_sizes=()):
+        self.levels = levels
+        self.screen_sizes = np.asarray(screen_sizes, dtype=np.float64)
+        self.triangle_counts = [len(level.indices) // 3 for level in levels]
+        self.radius = levels[0].bounding_sphere.radius if levels[0].bounding_sphere else 0.0
+    
+    @classmethod
+    def generate(cls, mesh, ratios=LOD_RATIOS, screen_sizes=LOD_SCREEN_SIZES, name=None):
+        """Build the levels of an indexed mesh; they share its texture and vertex format (and arena).
+        
+        The levels of a mesh built from a cached Geometry are cached along with it.
+        """
+        if not cls.enabled or mesh.indices is None:
+            return cls([mesh])
+        
+        if mesh.cache_key is not None and Mesh.cache is not None:
+            key = mesh.cache_key + (tuple(ratios), source_hash(simplify))
+            arrays = Mesh.cache.load_or_build(key, lambda: cls._level_arrays(mesh, ratios))
+        else:
+            arrays = cls._level_arrays(mesh, ratios)
+        
+        levels, sizes = [mesh], []
+        for level, ratio_index in enumerate(arrays["levels"]):
+            if ratio_index >= len(screen_sizes):
+                break
+            vertices, indices = arrays[f"vertices{level + 1}"], arrays[f"indices{level + 1}"]
+            colors = vertices[:, 8:] if mesh.colors is not None else None
+            levels.append(Mesh(vertices[:, :8], indices, mesh.texture, mesh.vertex_format, colors))
+            sizes.append(screen_sizes[ratio_index])
+        
+        lod = cls(levels, sizes)
+        if name:
+            totals = cls._objects.setdefault(name, [0, [0] * (len(ratios) + 1)])
+            totals[0] += 1
+            for level, count in enumerate(lod.triangle_counts):
+                totals[1][level] += count
+        return lod
+    
+    @staticmethod
+    def _level_arrays(mesh, ratios):
+        """The simplified levels worth keeping, as a MeshCache stores them.
+        
+        levels holds the index in ratios of each kept level, whose rows and
+        indices are vertices1, indices1 and so on.
+        """
+        rows = mesh.vertices.reshape(-1, 8)
+        if mesh.colors is not None:
+            rows = np.hstack([rows, np.asarray(mesh.colors, dtype=np.float32).reshape(len(rows), -1)])
+        arrays, kept, previous = {}, [], len(mesh.indices)
+        for ratio_index, (vertices, indices) in enumerate(simplify(rows, mesh.indices, ratios)):
+            if not len(indices) or len(indices) > (1.0 - MIN_REDUCTION) * previous:
+                continue
+            kept.append(ratio_index)
+            # Same index type as the full mesh, so every level can be drawn from the same command slot
+            arrays[f"vertices{len(kept)}"] = vertices
+            arrays[f"indices{len(kept)}"] = indices.astype(mesh.indices.dtype)
+            previous = len(indices)
+        arrays["levels"] = np.array(kept, dtype=np.int64)
+        return arrays
+    
+    @classmethod
+    def set_view(cls, position, fov_degrees):
+        """Camera state every selection of the frame uses."""
+        cls.view_position = np.array(position, dtype=np.float64)
+        cls.projection_scale = 1.0 / np.tan(np.radians(fov_degrees) * 0.5)
+    
+    def screen_sizes_at(self, centers, scales=1.0):
+        """Projected diameters (fraction of the viewport height) of the mesh's sphere at (n, 3) world centers."""
+        centers = np.asarray(centers, dtype=np.float64).reshape(-1, 3)
+        distances = np.sqrt(((centers - LodMesh.view_position) ** 2).sum(axis=1))
+        return self.radius * np.asarray(scales) * LodMesh.projection_scale / np.maximum(distances, 1e-6)
+    
+    def select_many(self, centers, current, scales=1.0):
+        """Levels for meshes at (n, 3) world centers that last drew the given levels."""
+        current = np.asarray(current)
+        if len(self.levels) == 1:
+            return np.zeros_like(current)
+        sizes = self.screen_sizes_at(centers, scales)[:, None]
+        # Coarsest level the size forces, finest it still allows; the current level is kept in between
+        coarsest = (sizes < self.screen_sizes * (1.0 - LOD_HYSTERESIS)).sum(axis=1)
+        finest = (sizes < self.screen_sizes * (1.0 + LOD_HYSTERESIS)).sum(axis=1)
+        return np.clip(current, coarsest, finest)
+    
+    def select(self, center, current=0, scale=1.0):
+        """Level for one mesh at a world center that last drew level current."""
+        if len(self.levels) == 1:
+            return 0
+        return int(self.select_many(center, [current], scale)[0])
+    
+    def count(self, level, instances=1):
+        """Add a draw of level to the triangle statistics."""
+        LodMesh.triangles += self.triangle_counts[level] * instances
+        LodMesh.full_triangles += self.triangle_counts[0] * instances
+    
+    def draw(self, shader, level=0):
+        """Draw one level with the current model matrix."""
+        # A DrawRecorder (rendering.static_draw_list) keeps every level and picks one per frame itself
+        record_lod = getattr(shader, "record_lod", None)
+        if record_lod is not None:
+            record_lod(self)
+            return
+        self.count(level)
+        self.levels[level].draw(shader)
+    
+    @classmethod
+    def reset_stats(cls):
+        cls.triangles = 0
+        cls.full_triangles = 0
+    
+    @classmethod
+    def report(cls):
+        """Print the triangles of every level, per object."""
+        if not cls._objects:
+            return
+        for name, (meshes, counts) in sorted(cls._objects.items()):
+            levels = " / ".join(str(count) for count in counts if count)
+            plural = f" ({meshes} meshes)" if meshes > 1 else ""
+            print(f"   {name}{plural}: {levels} triangles")
+        print(f"✅ Mesh LODs: {sum(meshes for meshes, _ in cls._objects.values())} meshes simplified")
@@ -2,79 +2,166 @@
 Mesh class with texture support.
 """
 
+import hashlib
 import OpenGL.GL as gl
 import numpy as np
+from rendering.buffer_arena import BufferArena
+from rendering.mesh_cache import Geometry, source_hash
+from rendering.mesh_tools import MeshIndexingReport, index_mesh
+from rendering.vertex_format import STANDARD_FORMAT
+from utils.bounds import BoundingBox, BoundingSphere
+
+# The stats of index_mesh, in the order a cached mesh keeps them
+INDEXING_STATS = ("vertices_before", "vertices_after", "bytes_before", "bytes_after", "acmr_before", "acmr_after")
+
+
+def _index_arrays(vertices, colors, smooth_normals, optimize):
+    """Arrays of an indexed mesh built from a triangle soup, as a MeshCache stores them."""
+    rows = np.asarray(vertices, dtype=np.float32).reshape(-1, 8)
+    if colors is not None:
+        rows = np.hstack([rows, np.asarray(colors, dtype=np.float32).reshape(len(rows), -1)])
+    rows, indices, stats = index_mesh(rows, smooth=smooth_normals, optimize=optimize)
+    arrays = {"vertices": rows[:, :8], "indices": indices,
+              "stats": np.array([stats[field] for field in INDEXING_STATS], dtype=np.float64)}
+    if colors is not None:
+        arrays["colors"] = rows[:, 8:]
+    return arrays
+
 
 class Mesh:
-    def __init__(self, vertices, indices=None, texture=None):
+    # Optional MeshCache (rendering.mesh_cache) for meshes built from a Geometry
+    cache = None
+    
+    def __init__(self, vertices, indices=None, texture=None, vertex_format=None, colors=None):
         """
         Initialize mesh with vertex data and optional texture.
+        
+        vertices are rows of 8 float32 whatever the vertex_format (default
+        STANDARD_FORMAT); they are packed into it for upload. colors are
+        (n, 3|4) values in [0, 1] for a format with a colour attribute.
+        The GPU data lives in the shared BufferArena of the vertex format.
         """
         self.vertices = np.array(vertices, dtype=np.float32)
-        self.indices = np.array(indices, dtype=np.uint32) if indices is not None else None
+        self.vertex_count = self.vertices.size // 8
+        self.vertex_format = vertex_format or STANDARD_FORMAT
+        self.colors = colors
+        self.indices = None
+        self.index_type = None
+        if indices is not None:
+            # 16-bit indices halve the index buffer when every vertex fits
+            indices = np.asarray(indices)
+            self.indices = np.array(indices, dtype=np.uint16 if indices.dtype == np.uint16 else np.uint32)
+            self.index_type = gl.GL_UNSIGNED_SHORT if self.indices.dtype == np.uint16 else gl.GL_UNSIGNED_INT
         self.texture = texture
-        self.vao = None
-        self.vbo = None
-        self.ebo = None
+        self.arena = None
+        self.range = None
+        # Key of the cached arrays this mesh was built from, if any (see indexed)
+        self.cache_key = None
+        
+        # Object-space bounds for culling; None for an empty mesh
+        self.bounds = None
+        self.bounding_sphere = None
+        positions = self.vertices.reshape(-1, 8)[:, :3]
+        if len(positions):
+            self.bounds = BoundingBox.from_points(positions)
+            self.bounding_sphere = BoundingSphere.from_points(positions)
         
         self._setup_mesh()
     
-    def _setup_mesh(self):
-        """Setup VAO, VBO for vertex data."""
-        self.vao = gl.glGenVertexArrays(1)
-        self.vbo = gl.glGenBuffers(1)
-        
-        gl.glBindVertexArray(self.vao)
-        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self.vbo)
-        gl.glBufferData(gl.GL_ARRAY_BUFFER, self.vertices.nbytes, self.vertices, gl.GL_STATIC_DRAW)
-        
-        if self.indices is not None:
-            self.ebo = gl.glGenBuffers(1)
-            gl.glBindBuffer(gl.GL_ELEMENT_ARRAY_BUFFER, self.ebo)
-            gl.glBufferData(gl.GL_ELEMENT_ARRAY_BUFFER, self.indices.nbytes, self.indices, gl.GL_STATIC_DRAW)
+    @classmethod
+    def indexed(cls, vertices, texture=None, smooth_normals=False, optimize=True, name=None, vertex_format=None,
+                colors=None):
+        """Build an indexed mesh from a triangle soup (see rendering.mesh_tools).
         
-        # Vertex attributes: position(3), normal(3), texcoords(2) = 8 floats
-        stride = 8 * 4
+        Identical vertices are welded and triangles ordered for the vertex
+        cache; smooth_normals recomputes the normals first. Blended meshes
+        pass optimize=False, since their look depends on the triangle order.
+        Per-vertex colors are welded along with the vertices. What was saved,
+        including the smaller vertex_format, is recorded under name for
+        MeshIndexingReport.
         
-        # Position
-        gl.glVertexAttribPointer(0, 3, gl.GL_FLOAT, gl.GL_FALSE, stride, None)
-        gl.glEnableVertexAttribArray(0)
+        vertices may also be a Geometry: with Mesh.cache set, the generator
+        only runs when the cache has no indexed arrays for it.
+        """
+        if isinstance(vertices, Geometry) and cls.cache is not None:
+            geometry = vertices
+            key = geometry.key + (smooth_normals, optimize, source_hash(index_mesh))
+            if colors is not None:
+                key += (hashlib.sha1(np.ascontiguousarray(colors, dtype=np.float32)).hexdigest(),)
+            arrays = cls.cache.load_or_build(key, lambda: _index_arrays(geometry(), colors, smooth_normals, optimize))
+        else:
+            if isinstance(vertices, Geometry):
+                vertices = vertices()
+            key = None
+            arrays = _index_arrays(vertices, colors, smooth_normals, optimize)
         
-        # Normal
-        gl.glVertexAttribPointer(1, 3, gl.GL_FLOAT, gl.GL_FALSE, stride, gl.ctypes.c_void_p(3 * 4))
-        gl.glEnableVertexAttribArray(1)
+        mesh = cls(arrays["vertices"], arrays["indices"], texture, vertex_format, arrays.get("colors"))
+        mesh.cache_key = key
+        if name:
+            stats = {field: float(value) if field.startswith("acmr") else int(value)
+                     for field, value in zip(INDEXING_STATS, arrays["stats"])}
+            stats["bytes_after"] = mesh.vertex_count * mesh.vertex_format.stride + mesh.indices.nbytes
+            MeshIndexingReport.record(name, stats)
+        return mesh
+    
+    def _setup_mesh(self):
+        """Copy vertex and index data into the arena of the vertex format."""
+        self.arena = BufferArena.for_format(self.vertex_format)
+        packed = self.vertex_format.pack(self.vertices, self.colors)
+        self.range = self.arena.allocate(packed, self.indices)
+        self.base_vertex = self.range.base_vertex
+        self.index_offset = gl.ctypes.c_void_p(self.range.index_offset)
         
-        # Texture coordinates
-        gl.glVertexAttribPointer(2, 2, gl.GL_FLOAT, gl.GL_FALSE, stride, gl.ctypes.c_void_p(6 * 4))
-        gl.glEnableVertexAttribArray(2)
+    @property
+    def vao(self):
+        return self.arena.vao
         
-        gl.glBindVertexArray(0)
     def draw(self, shader):
         """Render the mesh with texture."""
         # Only set texture if mesh has its own texture
         # Otherwise, let the caller handle texture settings
         if self.texture:
-            self.texture.bind(0)
-            shader.set_bool("useTexture", True)
-            shader.set_sampler("texture_diffuse1", 0)
+            shader.use_texture(self.texture)
+        
+        # A DrawRecorder (rendering.static_draw_list) keeps the draw for later instead
+        record_mesh = getattr(shader, "record_mesh", None)
+        if record_mesh is not None:
+            record_mesh(self)
+            return
         
-        gl.glBindVertexArray(self.vao)
+        # Meshes of one vertex format share a VAO, which stays bound between draws
+        self.arena.bind()
         
         if self.indices is not None:
-            gl.glDrawElements(gl.GL_TRIANGLES, len(self.indices), gl.GL_UNSIGNED_INT, None)
+            gl.glDrawElementsBaseVertex(gl.GL_TRIANGLES, len(self.indices), self.index_type, self.index_offset,
+                                        self.base_vertex)
         else:
-            gl.glDrawArrays(gl.GL_TRIANGLES, 0, len(self.vertices) // 8)
+            gl.glDrawArrays(gl.GL_TRIANGLES, self.base_vertex, self.vertex_count)
+    
+    def draw_instanced(self, shader, instances, count=None, first=0):
+        """Render count instances from an InstanceBuffer, starting at record first.
         
-        gl.glBindVertexArray(0)
+        The shader must have its instanced variant selected (see
+        ShaderVariants.set_instanced); per-instance model matrices and
+        colours replace the model and objectColor uniforms.
+        """
+        count = instances.count - first if count is None else count
+        if count <= 0:
+            return
+        if self.texture:
+            shader.use_texture(self.texture)
+        
+        self.arena.bind()
+        instances.bind_attributes(first)
+        if self.indices is not None:
+            gl.glDrawElementsInstancedBaseVertex(gl.GL_TRIANGLES, len(self.indices), self.index_type,
+                                                 self.index_offset, count, self.base_vertex)
+        else:
+            gl.glDrawArraysInstanced(gl.GL_TRIANGLES, self.base_vertex, self.vertex_count, count)
+        instances.unbind_attributes()
     
-    def __del__(self):
-        """Clean up buffers."""
-        try:
-            if self.vao:
-                gl.glDeleteVertexArrays(1, [self.vao])
-            if self.vbo:
-                gl.glDeleteBuffers(1, [self.vbo])
-            if self.ebo:
-                gl.glDeleteBuffers(1, [self.ebo])
-        except:
-            pass
\ No newline at end of file
+    def delete(self):
+        """Give the arena ranges back; the mesh cannot be drawn afterwards."""
+        if self.range:
+            self.arena.release(self.range)
+            self.range = None
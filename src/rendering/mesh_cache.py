@@ -0,0 +1,127 @@
+"""
+Cache of generated meshes: the arrays a procedural generator, indexing and LOD simplification produce.
+
+Procedural objects are built in Python at startup, and the same generator
+called with the same parameters always gives the same geometry. A
+MeshCache keeps the resulting vertex and index arrays for the rest of the
+process and, with a directory, on disk: one .npy file per array, loaded
+with np.load(mmap_mode='r'), so a warm start copies the data from the page
+cache into the vertex arena without running the generator at all.
+
+Keys are the generator's qualified name, its parameters, whatever object
+state it reads (seed, size) and the SHA-1 of the source files the
+generator and the processing step live in, so editing either one starts
+new entries.
+"""
+
+import hashlib
+import inspect
+import os
+import shutil
+import numpy as np
+from utils.atomic_write import atomic_directory
+
+# path -> SHA-1 of the file, read once per process
+_source_hashes = {}
+
+
+def source_hash(function):
+    """SHA-1 of the source file function is defined in."""
+    path = inspect.getsourcefile(function)
+    if path not in _source_hashes:
+        with open(path, 'rb') as file:
+            _source_hashes[path] = hashlib.sha1(file.read()).hexdigest()
+    return _source_hashes[path]
+
+
+class Geometry:
+    """A generator call returning a triangle soup, made only when the cache has nothing for it.
+    
+    args and kwargs are passed to function; state lists whatever else the
+    generator reads (self.seed, self.height). All of them are part of the
+    key, so they need a stable repr().
+    """
+    
+    def __init__(self, function, *args, state=(), **kwargs):
+        self.function = function
+        self.args = args
+        self.kwargs = kwargs
+        self.name = f"{function.__module__}.{function.__qualname__}"
+        self.key = (self.name, args, tuple(sorted(kwargs.items())), tuple(state), source_hash(function))
+    
+    def __call__(self):
+        return self.function(*self.args, **self.kwargs)
+
+
+class MeshCache:
+    """Named arrays per key, in memory and optionally in cache_dir.
+    
+    An entry on disk is a directory of .npy files named after the key's
+    first element and its digest, written with atomic_directory().
+    """
+    
+    VERSION = 1
+    
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+    
+    def _digest(self, key):
+        return hashlib.sha1(repr((self.VERSION, key)).encode()).hexdigest()
+    
+    def _path(self, key, digest):
+        name = "".join(char if char.isalnum() else "_" for char in str(key[0]))
+        return os.path.join(self.cache_dir, f"{name}-{digest[:16]}")
+    
+    def load(self, key):
+        """Return the memory-mapped arrays for key, or None if not on disk."""
+        path = self._path(key, self._digest(key))
+        try:
+            return {os.path.splitext(name)[0]: np.load(os.path.join(path, name), mmap_mode='r')
+                    for name in os.listdir(path) if name.endswith(".npy")}
+        except (OSError, ValueError):
+            return None
+    
+    def store(self, key, arrays):
+        """Write arrays (name -> ndarray) for key to cache_dir."""
+        path = self._path(key, self._digest(key))
+        if os.path.isdir(path):
+            return
+        with atomic_directory(path) as temp_path:
+            for name, array in arrays.items():
+                np.save(os.path.join(temp_path, f"{name}.npy"), np.ascontiguousarray(array))
+    
+    def load_or_build(self, key, build):
+        """Return the arrays for key, calling build() for them (and storing them) on a miss."""
+        digest = self._digest(key)
+        arrays = self.entries.get(digest)
+        if arrays is None and self.cache_dir:
+            arrays = self.load(key)
+        if arrays is not None:
+            self.hits += 1
+            self.entries[digest] = arrays
+            return arrays
+        
+        arrays = build()
+        self.misses += 1
+        self.entries[digest] = arrays
+        if self.cache_dir:
+            try:
+                self.store(key, arrays)
+            except OSError as e:
+                print(f"⚠️  Could not cache mesh {key[0]}: {e}")
+        return arrays
+    
+    def clear(self):
+        """Forget every entry, in memory and on disk."""
+        self.entries = {}
+        if not self.cache_dir or not os.path.isdir(self.cache_dir):
+            return
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            # Only entry directories (name-<digest>): cache_dir may be shared with other caches
+            suffix = name.rpartition("-")[2]
+            if os.path.isdir(path) and len(suffix) == 16 and all(char in "0123456789abcdef" for char in suffix):
+                shutil.rmtree(path, ignore_errors=True)
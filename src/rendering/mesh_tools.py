@@ -0,0 +1,263 @@
+"""
+Mesh processing for the procedural generators: vertex welding, smooth normals and vertex cache ordering.
+
+The generators build triangle soups (three fresh vertices per triangle).
+index_mesh() turns one into an indexed mesh: bit-identical vertices are
+merged, triangles are reordered for the GPU's post-transform vertex cache
+and vertices are renumbered in first-use order, so the result draws the
+same image from a fraction of the vertex data. Vertices are rows of
+position(3), normal(3), texcoords(2) float32, like everywhere in the repo;
+2-D arrays may carry extra columns (e.g. a colour), which are welded too.
+"""
+
+import numpy as np
+
+VERTEX_FLOATS = 8
+
+# Cache size used for reordering and for the ACMR statistics; small enough
+# to be a lower bound for current GPUs
+CACHE_SIZE = 16
+
+_HASH_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+
+def _rows(vertices, copy=False):
+    """Vertices as a 2-D float32 array: flat input is split into rows of VERTEX_FLOATS."""
+    rows = np.array(vertices, dtype=np.float32, copy=copy or None)
+    return rows if rows.ndim == 2 else rows.reshape(-1, VERTEX_FLOATS)
+
+
+def index_dtype(vertex_count):
+    """Smallest index type for vertex_count vertices: uint16 up to 65536, else uint32."""
+    return np.uint16 if vertex_count <= 65536 else np.uint32
+
+
+def _row_keys(rows):
+    """One 64-bit hash per row of float32 values; 0.0 and -0.0 hash the same."""
+    bits = np.ascontiguousarray(rows + np.float32(0.0), dtype=np.float32).view(np.uint32).astype(np.uint64)
+    keys = np.zeros(len(rows), dtype=np.uint64)
+    for column in bits.T:
+        keys = (keys ^ column) * _HASH_MULTIPLIER
+        keys ^= keys >> np.uint64(29)
+    return keys
+
+
+def _dedupe(rows):
+    """(first row of each distinct value, index of every row's distinct value), in first-use order.
+    
+    Rows are grouped by hash; a collision (two different rows with one
+    hash) is caught by comparing the rows and falls back to exact grouping
+    on the raw bytes.
+    """
+    rows = np.ascontiguousarray(rows, dtype=np.float32)
+    _, first, inverse = np.unique(_row_keys(rows), return_index=True, return_inverse=True)
+    if not np.array_equal(rows[first][inverse] + np.float32(0.0), rows + np.float32(0.0)):
+        normalized = np.ascontiguousarray(rows + np.float32(0.0))
+        void_rows = normalized.view(np.dtype((np.void, normalized.dtype.itemsize * rows.shape[1]))).ravel()
+        _, first, inverse = np.unique(void_rows, return_index=True, return_inverse=True)
+    
+    # Number the distinct rows in the order they are first used
+    order = np.argsort(first, kind="stable")
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(len(order))
+    return first[order], rank[inverse.ravel()]
+
+
+def weld(vertices):
+    """Merge identical vertices of a triangle soup -> (vertices (n, 8+), uint32 indices)."""
+    rows = _rows(vertices)
+    first, indices = _dedupe(rows)
+    return rows[first], indices.astype(np.uint32)
+
+
+def smooth_normals(vertices, indices=None):
+    """Replace normals with area-weighted averages of the faces around each position.
+    
+    Vertices at the same position share their normal even when their
+    texture coordinates differ. Each new normal keeps the side of the old
+    one, so the result does not depend on the triangle winding. Without
+    indices, vertices are taken as a triangle soup. Returns a new array.
+    """
+    rows = _rows(vertices, copy=True)
+    if indices is None:
+        indices = np.arange(len(rows))
+    triangles = np.asarray(indices, dtype=np.int64).reshape(-1, 3)
+    positions = rows[:, :3].astype(np.float64)
+    
+    corners = positions[triangles]
+    face_normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    
+    # Accumulate per distinct position, then hand the sums back to every vertex there
+    _, position_ids = _dedupe(rows[:, :3])
+    sums = np.zeros((position_ids.max() + 1, 3))
+    for corner in range(3):
+        vertex_position = position_ids[triangles[:, corner]]
+        for axis in range(3):
+            sums[:, axis] += np.bincount(vertex_position, weights=face_normals[:, axis], minlength=len(sums))
+    normals = sums[position_ids]
+    
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    usable = lengths[:, 0] > 1e-12
+    normals[usable] /= lengths[usable]
+    normals[~usable] = rows[~usable, 3:6]
+    flipped = (normals * rows[:, 3:6]).sum(axis=1) < 0
+    normals[flipped] *= -1
+    rows[:, 3:6] = normals
+    return rows
+
+
+def optimize_vertex_cache(indices, vertex_count, cache_size=CACHE_SIZE):
+    """Reorder triangles for post-transform cache reuse (Tipsify, Sander et al. 2007).
+    
+    Runs in time linear in the triangle count. Returns a new index array of
+    the same type.
+    """
+    indices = np.asarray(indices)
+    triangles = indices.reshape(-1, 3).astype(np.int64)
+    triangle_count = len(triangles)
+    if triangle_count == 0:
+        return indices.copy()
+    
+    # Vertex -> triangles adjacency in CSR form
+    corners = triangles.ravel()
+    order = np.argsort(corners, kind="stable")
+    adjacency = (order // 3).tolist()
+    starts = np.concatenate([[0], np.cumsum(np.bincount(corners, minlength=vertex_count))]).tolist()
+    live = np.bincount(corners, minlength=vertex_count).tolist()
+    triangle_list = triangles.tolist()
+    
+    timestamps = [0] * vertex_count
+    emitted = [False] * triangle_count
+    output = []
+    dead_end = []
+    time = cache_size + 1
+    cursor = 1
+    fanning = 0
+    
+    while fanning >= 0:
+        candidates = set()
+        for triangle in adjacency[starts[fanning]:starts[fanning + 1]]:
+            if emitted[triangle]:
+                continue
+            emitted[triangle] = True
+            output.append(triangle)
+            for vertex in triangle_list[triangle]:
+                dead_end.append(vertex)
+                candidates.add(vertex)
+                live[vertex] -= 1
+                if time - timestamps[vertex] > cache_size:
+                    timestamps[vertex] = time
+                    time += 1
+        
+        # Next fanning vertex: still in the cache after its remaining triangles are emitted
+        best, best_priority = -1, -1
+        for vertex in candidates:
+            if live[vertex] > 0:
+                priority = 0
+                if time - timestamps[vertex] + 2 * live[vertex] <= cache_size:
+                    priority = time - timestamps[vertex]
+                if priority > best_priority:
+                    best, best_priority = vertex, priority
+        
+        if best == -1:
+            # Dead end: most recent vertex with triangles left, else the next one in input order
+            while dead_end:
+                vertex = dead_end.pop()
+                if live[vertex] > 0:
+                    best = vertex
+                    break
+            while best == -1 and cursor < vertex_count:
+                if live[cursor] > 0:
+                    best = cursor
+                cursor += 1
+        fanning = best
+    
+    return triangles[output].astype(indices.dtype).ravel()
+
+
+def reorder_vertices(vertices, indices):
+    """Renumber vertices in the order the indices first use them (better vertex fetch locality)."""
+    indices = np.asarray(indices)
+    _, first = np.unique(indices, return_index=True)
+    used = indices[np.sort(first)]
+    remap = np.empty(len(vertices), dtype=np.int64)
+    remap[used] = np.arange(len(used))
+    return vertices[used], remap[indices].astype(indices.dtype)
+
+
+def average_cache_miss_ratio(indices, cache_size=CACHE_SIZE):
+    """Vertices transformed per triangle with a FIFO cache (ACMR); 3.0 means no reuse."""
+    indices = np.asarray(indices).tolist()
+    if not indices:
+        return 0.0
+    cache = []
+    cached = set()
+    misses = 0
+    for vertex in indices:
+        if vertex not in cached:
+            misses += 1
+            cache.append(vertex)
+            cached.add(vertex)
+            if len(cache) > cache_size:
+                cached.discard(cache.pop(0))
+    return misses / (len(indices) / 3)
+
+
+def index_mesh(vertices, smooth=False, optimize=True):
+    """Turn a triangle soup into (vertices (n, 8+) float32, indices uint16/uint32, stats).
+    
+    smooth recomputes the normals first, so vertices that only differed by
+    their face normal are merged too. stats holds vertex counts, buffer
+    bytes and ACMR before and after.
+    """
+    soup = _rows(vertices)
+    if smooth:
+        soup = smooth_normals(soup)
+    welded, indices = weld(soup)
+    if optimize:
+        indices = optimize_vertex_cache(indices, len(welded))
+        welded, indices = reorder_vertices(welded, indices)
+    indices = indices.astype(index_dtype(len(welded)))
+    
+    stats = {
+        "vertices_before": len(soup),
+        "vertices_after": len(welded),
+        "bytes_before": int(soup.nbytes),
+        "bytes_after": int(welded.nbytes + indices.nbytes),
+        "acmr_before": 3.0,
+        "acmr_after": average_cache_miss_ratio(indices),
+    }
+    return welded, indices, stats
+
+
+class MeshIndexingReport:
+    """Per-object totals of what indexing saved, printed once the scene is built."""
+    
+    _objects = {}
+    
+    @classmethod
+    def record(cls, name, stats):
+        totals = cls._objects.setdefault(name, dict.fromkeys(
+            ("meshes", "vertices_before", "vertices_after", "bytes_before", "bytes_after", "acmr_after"), 0))
+        totals["meshes"] += 1
+        for key in ("vertices_before", "vertices_after", "bytes_before", "bytes_after"):
+            totals[key] += stats[key]
+        # Triangle-weighted average ACMR
+        totals["acmr_after"] += stats["acmr_after"] * stats["vertices_before"] / 3
+    
+    @classmethod
+    def report(cls):
+        if not cls._objects:
+            return
+        kilobytes = 1024
+        for name, totals in sorted(cls._objects.items()):
+            meshes = f" ({totals['meshes']} meshes)" if totals["meshes"] > 1 else ""
+            print(f"   {name}{meshes}: {totals['vertices_before']} -> {totals['vertices_after']} vertices, "
+                  f"{totals['bytes_before'] / kilobytes:.1f} KB -> {totals['bytes_after'] / kilobytes:.1f} KB, "
+                  f"ACMR {totals['acmr_after'] / (totals['vertices_before'] / 3):.2f}")
+        before = sum(totals["bytes_before"] for totals in cls._objects.values())
+        after = sum(totals["bytes_after"] for totals in cls._objects.values())
+        vertices_before = sum(totals["vertices_before"] for totals in cls._objects.values())
+        vertices_after = sum(totals["vertices_after"] for totals in cls._objects.values())
+        print(f"✅ Indexed meshes: {vertices_before} -> {vertices_after} vertices, "
+              f"{(before - after) / kilobytes:.1f} KB of vertex data saved ({before / max(after, 1):.1f}x smaller)")
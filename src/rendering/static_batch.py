@@ -0,0 +1,84 @@
+"""
+Static batching: parts that never move relative to each other, merged into one mesh per material at load time.
+
+Each part is a mesh drawn with a model matrix and an objectColor. The
+batcher transforms the part's vertices and normals by the matrix, stores
+the colour in a vertex colour and appends everything drawn with the same
+texture to one mesh, so an object made of dozens of cubes is drawn with
+one call per texture and no per-part matrices at draw time.
+"""
+
+import numpy as np
+from rendering.mesh import Mesh
+from rendering.mesh_tools import index_dtype
+from rendering.vertex_format import COMPACT_COLOR_FORMAT
+from utils.bounds import matrix_rows
+
+WHITE = (1.0, 1.0, 1.0)
+
+
+def bake_vertices(vertices, model):
+    """Rows of 8 float32 with positions and normals transformed by model (glm mat4 or array)."""
+    rows = np.array(vertices, dtype=np.float32).reshape(-1, 8)
+    matrix = matrix_rows(model)
+    rows[:, 0:3] = rows[:, 0:3] @ matrix[:3, :3].T + matrix[:3, 3]
+    
+    # Normals as the vertex shader transforms them (inverse transpose), renormalized for packing
+    normals = rows[:, 3:6] @ np.linalg.inv(matrix[:3, :3])
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    rows[:, 3:6] = normals / np.maximum(lengths, 1e-12)
+    return rows
+
+
+class StaticBatcher:
+    """Collects (mesh, model, color, texture) parts and merges them into one mesh per texture.
+    
+    Textured parts are baked white: the textured shader variant ignores
+    objectColor. Parts keep the order they were added in within a batch,
+    and batches are returned in the order their texture first appeared.
+    """
+    
+    def __init__(self, vertex_format=COMPACT_COLOR_FORMAT):
+        self.vertex_format = vertex_format
+        self.parts = []
+    
+    def __len__(self):
+        return len(self.parts)
+    
+    def add(self, mesh, model, color=WHITE, texture=None):
+        """Add one draw of an indexed mesh with the given model matrix, objectColor and texture."""
+        if mesh.indices is None:
+            raise Exception("Static batching needs indexed meshes")
+        self.parts.append((mesh, model, WHITE if texture is not None else color, texture))
+    
+    def build(self, name=None):
+        """One Mesh per texture (None for untextured parts), with the texture set on the mesh."""
+        groups = {}
+        for mesh, model, color, texture in self.parts:
+            groups.setdefault(id(texture), (texture, []))[1].append((mesh, model, color))
+        
+        batches = []
+        for texture, parts in groups.values():
+            vertices, indices, colors = [], [], []
+            vertex_count = 0
+            for mesh, model, color in parts:
+                vertices.append(bake_vertices(mesh.vertices, model))
+                indices.append(mesh.indices.astype(np.uint32) + vertex_count)
+                colors.append(np.tile(np.asarray(color, dtype=np.float32), (mesh.vertex_count, 1)))
+                vertex_count += mesh.vertex_count
+            indices = np.concatenate(indices).astype(index_dtype(vertex_count))
+            batches.append(Mesh(np.vstack(vertices), indices, texture, self.vertex_format, np.vstack(colors)))
+        
+        if name:
+            print(f"✅ {name} batched: {len(self.parts)} parts in {len(batches)} meshes")
+        return batches
+
+
+def draw_batches(shader, batches):
+    """Draw meshes from StaticBatcher.build; the caller sets the model matrix."""
+    shader.set_vec3("objectColor", WHITE)
+    for mesh in batches:
+        if mesh.texture is None:
+            shader.set_textured(False)
+        mesh.draw(shader)
+    shader.set_textured(False)
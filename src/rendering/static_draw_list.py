@@ -0,0 +1,292 @@
+"""
+Static scene submission: the draws of objects that never move, recorded once and replayed every frame.
+
+Recording runs an object's own draw() against a DrawRecorder in place of
+its shader, so the objects keep a single description of how they are
+drawn. Replay sorts the draws by vertex format and material and submits
+each group with one glMultiDrawElementsIndirect call; the model matrix
+and colour of every draw come from an InstanceBuffer record selected by
+the command's baseInstance. Without GL 4.3 the groups are replayed with
+one uniform upload and draw call per command instead. Draws of a LodMesh
+keep all its levels: the command is pointed at the level the camera
+distance calls for whenever the camera moves.
+"""
+
+import OpenGL.GL as gl
+import numpy as np
+from core.gpu_resources import BUFFER, GpuResources
+from rendering.instancing import InstanceBuffer
+from rendering.lod import LodMesh
+from utils.bounds import BoundingBox
+from utils.transformations import matrix_bytes
+
+# DrawElementsIndirectCommand: count, instanceCount, firstIndex, baseVertex, baseInstance
+COMMAND_FIELDS = 5
+COMMAND_BYTES = COMMAND_FIELDS * 4
+
+
+def multi_draw_indirect_supported():
+    """Whether the current context has glMultiDrawElementsIndirect with base instances (GL 4.3)."""
+    version = (gl.glGetIntegerv(gl.GL_MAJOR_VERSION), gl.glGetIntegerv(gl.GL_MINOR_VERSION))
+    if version >= (4, 3):
+        return True
+    count = gl.glGetIntegerv(gl.GL_NUM_EXTENSIONS)
+    extensions = {gl.glGetStringi(gl.GL_EXTENSIONS, index) for index in range(count)}
+    return b"GL_ARB_multi_draw_indirect" in extensions and b"GL_ARB_base_instance" in extensions
+
+
+class DrawRecorder:
+    """Stands in for a ShaderVariants while an object draws, keeping each mesh draw with its state.
+    
+    Only the state the static objects use is understood: the model
+    matrix, objectColor and the material (untextured, or a texture). Any
+    other uniform raises, so an object that needs more cannot be replayed
+    wrongly.
+    """
+    
+    def __init__(self):
+        self.draws = []
+        self.model = np.eye(4, dtype=np.float32).ravel()
+        self.color = (1.0, 1.0, 1.0)
+        self.textured = False
+        self.texture = None
+    
+    def use(self):
+        pass
+    
+    def set_textured(self, textured):
+        self.textured = bool(textured)
+    
+    def use_texture(self, texture, texture_unit=0):
+        self.textured = True
+        self.texture = texture
+    
+    def set_mat4(self, name, value):
+        if name != "model":
+            raise Exception(f"Static draws cannot record uniform {name}")
+        self.model = np.frombuffer(matrix_bytes(value), dtype=np.float32).copy()
+    
+    def set_vec3(self, name, value):
+        if name != "objectColor":
+            raise Exception(f"Static draws cannot record uniform {name}")
+        self.color = tuple(float(component) for component in value)
+    
+    def record_mesh(self, mesh, lod=None):
+        """Called by Mesh.draw instead of drawing."""
+        if mesh.indices is None:
+            raise Exception("Static draws need indexed meshes")
+        self.draws.append({
+            "mesh": mesh,
+            "lod": lod,
+            "model": self.model,
+            "color": self.color,
+            "texture": self.texture if self.textured else None,
+        })
+    
+    def record_lod(self, lod):
+        """Called by LodMesh.draw instead of drawing; the draw starts at full detail."""
+        mesh = lod.levels[0]
+        if mesh.texture:
+            self.use_texture(mesh.texture)
+        self.record_mesh(mesh, lod)
+
+
+class StaticDrawList:
+    """Every draw of the static objects, grouped for submission with as few calls as possible.
+    
+    record() the objects, build() once, then draw() each frame. With a
+    frustum, commands whose world box is outside it get an instance count
+    of 0; the command buffer is only rewritten when the camera has moved.
+    """
+    
+    def __init__(self, shader):
+        self.shader = shader
+        self.recorder = DrawRecorder()
+        self.multi_draw_indirect = False
+        self.groups = []
+        self.commands = None
+        self.command_rows = []
+        self.command_buffer = None
+        self.instances = None
+        self.visibility = None
+        self.visibility_generation = None
+        # Draws of LodMeshes: (command index, LodMesh, world center, scale) and the level each draws
+        self.lod_draws = []
+        self.lod_levels = None
+        self.lod_triangles = 0
+        self.lod_full_triangles = 0
+    
+    def __len__(self):
+        return len(self.recorder.draws)
+    
+    def record(self, obj, *args, **kwargs):
+        """Run obj.draw(*args, **kwargs) with the recorder as its shader."""
+        shader = obj.shader
+        obj.shader = self.recorder
+        try:
+            obj.draw(*args, **kwargs)
+        finally:
+            obj.shader = shader
+    
+    def build(self, multi_draw_indirect=None):
+        """Group the recorded draws and upload their per-draw data and commands.
+        
+        multi_draw_indirect defaults to what the context supports.
+        """
+        if multi_draw_indirect is None:
+            multi_draw_indirect = multi_draw_indirect_supported()
+        self.multi_draw_indirect = multi_draw_indirect
+        
+        # Group by VAO, index type and material, keeping the recorded order inside a group
+        group_keys = {}
+        for draw in self.recorder.draws:
+            mesh = draw["mesh"]
+            key = (id(mesh.arena), mesh.index_type, id(draw["texture"]))
+            group_keys.setdefault(key, len(group_keys))
+        draws = sorted(self.recorder.draws, key=lambda draw: group_keys[
+            (id(draw["mesh"].arena), draw["mesh"].index_type, id(draw["texture"]))])
+        
+        self.groups = []
+        self.lod_draws = []
+        commands = np.zeros((len(draws), COMMAND_FIELDS), dtype=np.uint32)
+        boxes = []
+        for index, draw in enumerate(draws):
+            mesh = draw["mesh"]
+            index_size = mesh.indices.itemsize
+            commands[index] = (len(mesh.indices), 1, mesh.range.index_offset // index_size, mesh.base_vertex, index)
+            boxes.append(mesh.bounds.transformed(draw["model"]) if mesh.bounds else BoundingBox((0, 0, 0), (0, 0, 0)))
+            
+            group = self.groups[-1] if self.groups else None
+            if group is None or group["mesh"].arena is not mesh.arena or group["mesh"].index_type != mesh.index_type \
+                    or group["texture"] is not draw["texture"]:
+                group = {"mesh": mesh, "texture": draw["texture"], "first": index, "count": 0, "draws": []}
+                self.groups.append(group)
+            group["count"] += 1
+            # The uniforms the fallback loop sets, resolved up front
+            group["draws"].append((matrix_bytes(draw["model"]), draw["color"]))
+            
+            if draw["lod"] is not None:
+                sphere = mesh.bounding_sphere.transformed(draw["model"])
+                self.lod_draws.append((index, draw["lod"], sphere.center, sphere.radius / draw["lod"].radius))
+        
+        self.commands = commands
+        self.command_rows = commands.tolist()
+        self.lod_levels = np.zeros(len(self.lod_draws), dtype=np.int64)
+        self._count_lod_triangles(np.ones(len(draws), dtype=bool))
+        self.visibility = np.ones(len(draws), dtype=bool)
+        self.box_centers = np.array([box.center for box in boxes], dtype=np.float32).reshape(-1, 3)
+        self.box_extents = np.array([box.extents for box in boxes], dtype=np.float32).reshape(-1, 3)
+        
+        if self.multi_draw_indirect and len(draws):
+            self.instances = InstanceBuffer()
+            self.instances.upload(np.array([draw["model"] for draw in draws]),
+                                  np.array([draw["color"] for draw in draws]))
+            self.command_buffer = GpuResources.create_buffer("indirect commands")
+            gl.glBindBuffer(gl.GL_DRAW_INDIRECT_BUFFER, self.command_buffer)
+            gl.glBufferData(gl.GL_DRAW_INDIRECT_BUFFER, commands.nbytes, commands, gl.GL_DYNAMIC_DRAW)
+            GpuResources.set_size(BUFFER, self.command_buffer, commands.nbytes)
+    
+    def delete(self):
+        """Free the command and instance buffers."""
+        GpuResources.delete_buffer(self.command_buffer)
+        self.command_buffer = None
+        if self.instances is not None:
+            self.instances.delete()
+            self.instances = None
+        self.groups = []
+    
+    def _select_lods(self):
+        """Point the commands of LodMesh draws at the level for the current view; True if any changed."""
+        changed = False
+        for slot, (index, lod, center, scale) in enumerate(self.lod_draws):
+            level = lod.select(center, self.lod_levels[slot], scale)
+            if level != self.lod_levels[slot]:
+                self.lod_levels[slot] = level
+                mesh = lod.levels[level]
+                self.commands[index, 0] = len(mesh.indices)
+                self.commands[index, 2] = mesh.range.index_offset // mesh.indices.itemsize
+                self.commands[index, 3] = mesh.base_vertex
+                changed = True
+        return changed
+    
+    def _count_lod_triangles(self, visible):
+        """Triangles the LodMesh draws add to LodMesh's statistics every frame."""
+        self.lod_triangles = self.lod_full_triangles = 0
+        for slot, (index, lod, _, _) in enumerate(self.lod_draws):
+            if visible[index]:
+                self.lod_triangles += lod.triangle_counts[self.lod_levels[slot]]
+                self.lod_full_triangles += lod.triangle_counts[0]
+    
+    def _update_visibility(self, frustum, camera_generation):
+        if camera_generation is not None and camera_generation == self.visibility_generation:
+            if frustum is not None:
+                frustum.count(self.visibility)
+            return
+        self.visibility_generation = camera_generation
+        
+        if frustum is None:
+            visible = np.ones(len(self.commands), dtype=bool)
+        else:
+            visible = frustum.visible_boxes(self.box_centers, self.box_extents)
+        lods_changed = self._select_lods()
+        
+        if lods_changed or not np.array_equal(visible, self.visibility):
+            self.visibility = visible
+            self._count_lod_triangles(visible)
+            self.commands[:, 1] = visible
+            self.command_rows = self.commands.tolist()
+            if self.command_buffer:
+                gl.glBindBuffer(gl.GL_DRAW_INDIRECT_BUFFER, self.command_buffer)
+                gl.glBufferSubData(gl.GL_DRAW_INDIRECT_BUFFER, 0, self.commands.nbytes, self.commands)
+    
+    def draw(self, frustum=None, camera_generation=None):
+        """Draw everything recorded (what is inside frustum, if given)."""
+        if not self.groups:
+            return
+        self._update_visibility(frustum, camera_generation)
+        LodMesh.triangles += self.lod_triangles
+        LodMesh.full_triangles += self.lod_full_triangles
+        
+        self.shader.use()
+        if self.multi_draw_indirect:
+            self._draw_indirect()
+        else:
+            self._draw_loop()
+        self.shader.set_textured(False)
+    
+    def _select_material(self, group):
+        if group["texture"] is not None:
+            self.shader.use_texture(group["texture"])
+        else:
+            self.shader.set_textured(False)
+    
+    def _draw_indirect(self):
+        """One glMultiDrawElementsIndirect per group; culled commands have no instances."""
+        self.shader.set_instanced(True)
+        gl.glBindBuffer(gl.GL_DRAW_INDIRECT_BUFFER, self.command_buffer)
+        for group in self.groups:
+            self._select_material(group)
+            group["mesh"].arena.bind()
+            self.instances.bind_attributes()
+            gl.glMultiDrawElementsIndirect(gl.GL_TRIANGLES, group["mesh"].index_type,
+                                           gl.ctypes.c_void_p(group["first"] * COMMAND_BYTES), group["count"], 0)
+            self.instances.unbind_attributes()
+        self.shader.set_instanced(False)
+    
+    def _draw_loop(self):
+        """GL 3.3 fallback: per command, set the model matrix and colour and draw."""
+        rows = self.command_rows
+        for group in self.groups:
+            self._select_material(group)
+            group["mesh"].arena.bind()
+            index_type = group["mesh"].index_type
+            index_size = group["mesh"].indices.itemsize
+            first = group["first"]
+            for offset, (model, color) in enumerate(group["draws"]):
+                count, instances, first_index, base_vertex, _ = rows[first + offset]
+                if not instances:
+                    continue
+                self.shader.set_mat4("model", model)
+                self.shader.set_vec3("objectColor", color)
+                gl.glDrawElementsBaseVertex(gl.GL_TRIANGLES, count, index_type,
+                                            gl.ctypes.c_void_p(first_index * index_size), base_vertex)
@@ -0,0 +1,130 @@
+"""
+Vertex layouts: how position, normal, texture coordinates and optional colour are stored in a VBO.
+
+Generators always build rows of position(3), normal(3), texcoords(2)
+float32. A VertexFormat packs those rows into its own layout at upload
+time and sets up the matching attribute pointers, so the shaders keep
+reading vec3/vec3/vec2(/vec4) whatever the storage is.
+"""
+
+import OpenGL.GL as gl
+import numpy as np
+
+# Attribute locations, as declared in the vertex shaders
+POSITION_LOCATION = 0
+NORMAL_LOCATION = 1
+TEXCOORDS_LOCATION = 2
+COLOR_LOCATION = 3
+
+
+def pack_normals(normals):
+    """(n, 3) unit vectors -> uint32 GL_INT_2_10_10_10_REV words (x in the low bits, w = 0)."""
+    normals = np.clip(np.asarray(normals, dtype=np.float32).reshape(-1, 3), -1.0, 1.0)
+    components = np.round(normals * 511.0).astype(np.int32) & 0x3FF
+    return (components[:, 0] | (components[:, 1] << 10) | (components[:, 2] << 20)).astype(np.uint32)
+
+
+def unpack_normals(packed):
+    """Inverse of pack_normals (for checks and tools)."""
+    packed = np.asarray(packed, dtype=np.uint32)
+    components = np.stack([(packed >> shift) & 0x3FF for shift in (0, 10, 20)], axis=1).astype(np.int32)
+    components[components >= 512] -= 1024
+    return np.maximum(components / 511.0, -1.0).astype(np.float32)
+
+
+def pack_colors(colors):
+    """(n, 3) or (n, 4) colours in [0, 1] -> (n, 4) uint8; alpha defaults to 1."""
+    colors = np.asarray(colors, dtype=np.float32)
+    if colors.shape[1] == 3:
+        colors = np.hstack([colors, np.ones((len(colors), 1), dtype=np.float32)])
+    return np.round(np.clip(colors, 0.0, 1.0) * 255.0).astype(np.uint8)
+
+
+class VertexFormat:
+    """One vertex layout: float32 positions plus a choice of storage for the other attributes.
+    
+    normal is "float" (3 x float32) or "packed" (GL_INT_2_10_10_10_REV,
+    one 32-bit word); texcoords is "float" (2 x float32) or "half"
+    (2 x float16, fine for coordinates within a few repeats of the
+    texture); color adds a normalized RGBA8 attribute at COLOR_LOCATION.
+    """
+    
+    def __init__(self, normal="float", texcoords="float", color=False):
+        if normal not in ("float", "packed") or texcoords not in ("float", "half"):
+            raise Exception(f"Unknown vertex format: normal={normal}, texcoords={texcoords}")
+        self.normal = normal
+        self.texcoords = texcoords
+        self.color = color
+        
+        fields = [("position", np.float32, (3,))]
+        fields.append(("normal", np.float32, (3,)) if normal == "float" else ("normal", np.uint32))
+        fields.append(("texcoords", np.float32 if texcoords == "float" else np.float16, (2,)))
+        if color:
+            fields.append(("color", np.uint8, (4,)))
+        self.dtype = np.dtype(fields)
+    
+    @property
+    def stride(self):
+        return self.dtype.itemsize
+    
+    def pack(self, vertices, colors=None):
+        """Rows of 8 float32 (plus (n, 3|4) colors if the format has them) -> structured array."""
+        rows = np.asarray(vertices, dtype=np.float32).reshape(-1, 8)
+        packed = np.empty(len(rows), dtype=self.dtype)
+        packed["position"] = rows[:, 0:3]
+        packed["normal"] = rows[:, 3:6] if self.normal == "float" else pack_normals(rows[:, 3:6])
+        packed["texcoords"] = rows[:, 6:8]
+        if self.color:
+            if colors is None:
+                raise Exception("Vertex format has a colour attribute but no colours were given")
+            packed["color"] = pack_colors(colors)
+        return packed
+    
+    def setup_attributes(self):
+        """Point the attributes of the bound VAO at the bound GL_ARRAY_BUFFER."""
+        def offset(field):
+            return gl.ctypes.c_void_p(self.dtype.fields[field][1])
+        
+        gl.glVertexAttribPointer(POSITION_LOCATION, 3, gl.GL_FLOAT, gl.GL_FALSE, self.stride, offset("position"))
+        gl.glEnableVertexAttribArray(POSITION_LOCATION)
+        
+        if self.normal == "float":
+            gl.glVertexAttribPointer(NORMAL_LOCATION, 3, gl.GL_FLOAT, gl.GL_FALSE, self.stride, offset("normal"))
+        else:
+            gl.glVertexAttribPointer(NORMAL_LOCATION, 4, gl.GL_INT_2_10_10_10_REV, gl.GL_TRUE, self.stride,
+                                     offset("normal"))
+        gl.glEnableVertexAttribArray(NORMAL_LOCATION)
+        
+        texcoords_type = gl.GL_FLOAT if self.texcoords == "float" else gl.GL_HALF_FLOAT
+        gl.glVertexAttribPointer(TEXCOORDS_LOCATION, 2, texcoords_type, gl.GL_FALSE, self.stride, offset("texcoords"))
+        gl.glEnableVertexAttribArray(TEXCOORDS_LOCATION)
+        
+        if self.color:
+            gl.glVertexAttribPointer(COLOR_LOCATION, 4, gl.GL_UNSIGNED_BYTE, gl.GL_TRUE, self.stride, offset("color"))
+            gl.glEnableVertexAttribArray(COLOR_LOCATION)
+    
+    def __eq__(self, other):
+        return isinstance(other, VertexFormat) and self.dtype == other.dtype
+    
+    def __hash__(self):
+        return hash(self.dtype)
+    
+    def __repr__(self):
+        return f"VertexFormat(normal={self.normal!r}, texcoords={self.texcoords!r}, color={self.color}, {self.stride} bytes)"
+
+
+# 32 bytes: the layout every mesh used before formats existed
+STANDARD_FORMAT = VertexFormat()
+# 20 bytes: packed normals, half-float texture coordinates
+COMPACT_FORMAT = VertexFormat(normal="packed", texcoords="half")
+# 24 bytes: COMPACT_FORMAT plus an RGBA8 vertex colour
+COMPACT_COLOR_FORMAT = VertexFormat(normal="packed", texcoords="half", color=True)
+
+
+def set_default_color():
+    """Make meshes without a colour attribute read white at COLOR_LOCATION.
+    
+    A disabled attribute reads the context's current generic value, which
+    starts out as (0, 0, 0, 1); call once after the GL context is created.
+    """
+    gl.glVertexAttrib4f(COLOR_LOCATION, 1.0, 1.0, 1.0, 1.0)
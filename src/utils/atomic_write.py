@@ -0,0 +1,56 @@
+"""
+Atomic writes for the on-disk caches: a file or directory appears complete or not at all.
+
+Entries are written under a temporary name unique to the process and
+thread, then renamed into place, so launches and worker threads sharing a
+cache directory never read a partial entry. A failed write leaves nothing
+behind.
+"""
+
+import os
+import shutil
+import threading
+from contextlib import contextmanager
+
+
+def _temp_path(path):
+    return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+
+@contextmanager
+def atomic_write(path, mode='wb'):
+    """Open a temporary file for writing that replaces path once the block completes."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temp_path = _temp_path(path)
+    try:
+        with open(temp_path, mode) as file:
+            yield file
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+@contextmanager
+def atomic_directory(path):
+    """Yield a temporary directory that is renamed to path once the block completes.
+    
+    If another writer created path first, theirs is kept and this one is
+    discarded.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temp_path = _temp_path(path)
+    os.makedirs(temp_path, exist_ok=True)
+    try:
+        yield temp_path
+        os.rename(temp_path, path)
+    except OSError:
+        shutil.rmtree(temp_path, ignore_errors=True)
+        if not os.path.isdir(path):
+            raise
+    except BaseException:
+        shutil.rmtree(temp_path, ignore_errors=True)
+        raise
@@ -0,0 +1,224 @@
+"""
+BC1 / BC3 (S3TC DXT1 / DXT5) block compression in pure NumPy.
+
+Images are split into 4x4 pixel blocks (edges padded by repeating the last
+row/column) and every block is encoded at once with array operations:
+BC1 stores two RGB565 endpoints and a 2-bit palette index per pixel (8
+bytes per block, 6:1 against RGB), BC3 adds an 8-byte block of interpolated
+alpha (16 bytes per block, 4:1 against RGBA). Rows keep the order of the
+input, so the blocks upload the same way the raw pixels do.
+"""
+
+import numpy as np
+
+BLOCK_BYTES = {"bc1": 8, "bc3": 16}
+
+_COLOR_BLOCK = np.dtype([("color0", "<u2"), ("color1", "<u2"), ("indices", "<u4")])
+
+
+class CompressedImage:
+    """A block-compressed mip chain: level 0 first, each level a flat uint8 array of blocks.
+    
+    Indexing with a slice returns the chain from that level on, like a list
+    of mip levels.
+    """
+    
+    def __init__(self, format, width, height, levels):
+        self.format = format
+        self.width = width
+        self.height = height
+        self.levels = levels
+    
+    @property
+    def channels(self):
+        return 4 if self.format == "bc3" else 3
+    
+    @property
+    def shape(self):
+        """Shape of the decoded level 0, for grouping equally sized textures."""
+        return (self.height, self.width, self.channels)
+    
+    def level_size(self, level):
+        """(width, height) of a mip level."""
+        return max(1, self.width >> level), max(1, self.height >> level)
+    
+    def __len__(self):
+        return len(self.levels)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start = index.start or 0
+            width, height = self.level_size(start)
+            return CompressedImage(self.format, width, height, self.levels[index])
+        return self.levels[index]
+    
+    @property
+    def size_bytes(self):
+        return sum(level.nbytes for level in self.levels)
+
+
+def compressed_size(width, height, format):
+    """Bytes of one compressed level."""
+    return ((width + 3) // 4) * ((height + 3) // 4) * BLOCK_BYTES[format]
+
+
+def _to_blocks(pixels):
+    """height x width x channels -> (blocks, 16, channels), block rows first, pixels row by row."""
+    height, width, channels = pixels.shape
+    padded_height, padded_width = -(-height // 4) * 4, -(-width // 4) * 4
+    if (padded_height, padded_width) != (height, width):
+        pixels = np.pad(pixels, ((0, padded_height - height), (0, padded_width - width), (0, 0)), mode="edge")
+    blocks = pixels.reshape(padded_height // 4, 4, padded_width // 4, 4, channels).transpose(0, 2, 1, 3, 4)
+    return blocks.reshape(-1, 16, channels)
+
+
+def _from_blocks(blocks, width, height):
+    """Inverse of _to_blocks, cropping the padding."""
+    channels = blocks.shape[-1]
+    block_rows, block_columns = -(-height // 4), -(-width // 4)
+    pixels = blocks.reshape(block_rows, block_columns, 4, 4, channels).transpose(0, 2, 1, 3, 4)
+    return pixels.reshape(block_rows * 4, block_columns * 4, channels)[:height, :width]
+
+
+def _quantize565(colors):
+    """float RGB (..., 3) -> packed RGB565 uint16."""
+    colors = np.clip(np.rint(colors), 0, 255).astype(np.uint16)
+    return ((colors[..., 0] * 31 + 127) // 255 << 11) | ((colors[..., 1] * 63 + 127) // 255 << 5) | \
+           ((colors[..., 2] * 31 + 127) // 255)
+
+
+def _expand565(packed):
+    """Packed RGB565 -> float RGB (..., 3) as a decoder sees it."""
+    packed = packed.astype(np.uint16)
+    red, green, blue = packed >> 11 & 31, packed >> 5 & 63, packed & 31
+    return np.stack([red << 3 | red >> 2, green << 2 | green >> 4, blue << 3 | blue >> 2], axis=-1).astype(np.float32)
+
+
+def _color_palette(color0, color1):
+    """The four BC1 colors (4-color mode) for packed endpoints, shape (blocks, 4, 3)."""
+    end0, end1 = _expand565(color0), _expand565(color1)
+    return np.stack([end0, end1, (2 * end0 + end1) / 3, (end0 + 2 * end1) / 3], axis=1)
+
+
+def _nearest(colors, palette):
+    """Index of the closest palette entry per pixel and the total squared error per block."""
+    distances = ((colors[:, :, None, :] - palette[:, None, :, :]) ** 2).sum(axis=-1)
+    indices = distances.argmin(axis=-1)
+    return indices, np.take_along_axis(distances, indices[..., None], axis=-1)[..., 0].sum(axis=-1)
+
+
+def _ordered(color0, color1, indices):
+    """Swap endpoints so color0 > color1 (4-color mode); equal endpoints use index 0 only."""
+    swap = color0 < color1
+    color0, color1 = np.where(swap, color1, color0), np.where(swap, color0, color1)
+    # Swapping the endpoints swaps palette entries 0<->1 and 2<->3
+    indices = np.where(swap[:, None], indices ^ 1, indices)
+    indices = np.where((color0 == color1)[:, None], 0, indices)
+    return color0, color1, indices
+
+
+def _encode_colors(colors):
+    """Encode (blocks, 16, 3) float colors into BC1 color blocks."""
+    # Principal axis of every block's colors by power iteration
+    mean = colors.mean(axis=1, keepdims=True)
+    centered = colors - mean
+    covariance = np.einsum("npi,npj->nij", centered, centered)
+    axis = np.ones((len(colors), 3), dtype=np.float32)
+    for _ in range(8):
+        axis = np.einsum("nij,nj->ni", covariance, axis)
+        axis /= np.maximum(np.abs(axis).max(axis=1, keepdims=True), 1e-12)
+    axis /= np.maximum(np.linalg.norm(axis, axis=1, keepdims=True), 1e-12)
+    
+    # Endpoints at the extremes of the colors projected onto the axis
+    projection = np.einsum("npi,ni->np", centered, axis)
+    end0 = mean[:, 0] + axis * projection.max(axis=1, keepdims=True)
+    end1 = mean[:, 0] + axis * projection.min(axis=1, keepdims=True)
+    color0, color1 = _quantize565(end0), _quantize565(end1)
+    indices, error = _nearest(colors, _color_palette(color0, color1))
+    
+    # One least-squares refinement of the endpoints for the chosen indices
+    weights = np.array([1.0, 0.0, 2.0 / 3.0, 1.0 / 3.0], dtype=np.float32)[indices]
+    a, b = weights, 1.0 - weights
+    aa, bb, ab = (a * a).sum(axis=1), (b * b).sum(axis=1), (a * b).sum(axis=1)
+    ax, bx = np.einsum("np,npi->ni", a, colors), np.einsum("np,npi->ni", b, colors)
+    determinant = aa * bb - ab * ab
+    solvable = np.abs(determinant) > 1e-6
+    determinant = np.where(solvable, determinant, 1.0)[:, None]
+    refined0 = (bb[:, None] * ax - ab[:, None] * bx) / determinant
+    refined1 = (aa[:, None] * bx - ab[:, None] * ax) / determinant
+    refined_color0, refined_color1 = _quantize565(refined0), _quantize565(refined1)
+    refined_indices, refined_error = _nearest(colors, _color_palette(refined_color0, refined_color1))
+    better = solvable & (refined_error < error)
+    color0 = np.where(better, refined_color0, color0)
+    color1 = np.where(better, refined_color1, color1)
+    indices = np.where(better[:, None], refined_indices, indices)
+    
+    color0, color1, indices = _ordered(color0, color1, indices)
+    blocks = np.empty(len(colors), dtype=_COLOR_BLOCK)
+    blocks["color0"] = color0
+    blocks["color1"] = color1
+    blocks["indices"] = (indices.astype(np.uint32) << (2 * np.arange(16, dtype=np.uint32))).sum(axis=1, dtype=np.uint32)
+    return blocks.view(np.uint8).reshape(-1, 8)
+
+
+def _encode_alpha(alpha):
+    """Encode (blocks, 16) alpha values into BC3 alpha blocks (8-value mode)."""
+    alpha0, alpha1 = alpha.max(axis=1), alpha.min(axis=1)
+    end0, end1 = alpha0.astype(np.float32)[:, None], alpha1.astype(np.float32)[:, None]
+    steps = np.arange(1, 7, dtype=np.float32)
+    palette = np.concatenate([end0, end1, ((7 - steps) * end0 + steps * end1) / 7], axis=1)
+    indices = np.abs(alpha[:, :, None].astype(np.float32) - palette[:, None, :]).argmin(axis=-1)
+    indices = np.where((alpha0 == alpha1)[:, None], 0, indices)
+    
+    packed = (indices.astype(np.uint64) << (3 * np.arange(16, dtype=np.uint64))).sum(axis=1, dtype=np.uint64)
+    blocks = np.empty((len(alpha), 8), dtype=np.uint8)
+    blocks[:, 0] = alpha0
+    blocks[:, 1] = alpha1
+    blocks[:, 2:] = packed.astype("<u8").view(np.uint8).reshape(-1, 8)[:, :6]
+    return blocks
+
+
+def compress(pixels, format=None):
+    """Compress one image (height x width x 3 or 4 uint8) to a flat array of blocks.
+    
+    format defaults to bc1 for RGB and bc3 for RGBA.
+    """
+    pixels = np.asarray(pixels, dtype=np.uint8)
+    format = format or ("bc3" if pixels.shape[2] == 4 else "bc1")
+    blocks = _to_blocks(pixels)
+    colors = _encode_colors(blocks[:, :, :3].astype(np.float32))
+    if format == "bc1":
+        return colors.reshape(-1)
+    return np.concatenate([_encode_alpha(blocks[:, :, 3]), colors], axis=1).reshape(-1)
+
+
+def compress_chain(levels, format=None):
+    """Compress a mip chain (level 0 first) into a CompressedImage."""
+    format = format or ("bc3" if np.shape(levels[0])[2] == 4 else "bc1")
+    height, width = np.shape(levels[0])[:2]
+    return CompressedImage(format, width, height, [compress(level, format) for level in levels])
+
+
+def _decode_colors(blocks):
+    color = blocks.copy().view(_COLOR_BLOCK)[:, 0]
+    palette = _color_palette(color["color0"], color["color1"])
+    indices = (color["indices"][:, None] >> (2 * np.arange(16, dtype=np.uint32))) & 3
+    return np.rint(np.take_along_axis(palette, indices[:, :, None].astype(np.intp), axis=1))
+
+
+def decompress(data, width, height, format):
+    """Decode one compressed level back to height x width x channels uint8 pixels."""
+    blocks = np.asarray(data, dtype=np.uint8).reshape(-1, BLOCK_BYTES[format])
+    if format == "bc1":
+        return _from_blocks(_decode_colors(blocks).astype(np.uint8), width, height)
+    
+    colors = _decode_colors(blocks[:, 8:])
+    alpha0, alpha1 = blocks[:, 0].astype(np.float32)[:, None], blocks[:, 1].astype(np.float32)[:, None]
+    steps = np.arange(1, 7, dtype=np.float32)
+    palette = np.concatenate([alpha0, alpha1, ((7 - steps) * alpha0 + steps * alpha1) / 7], axis=1)
+    packed = np.zeros((len(blocks), 8), dtype=np.uint8)
+    packed[:, :6] = blocks[:, 2:8]
+    packed = packed.view("<u8")[:, 0]
+    indices = (packed[:, None] >> (3 * np.arange(16, dtype=np.uint64))) & 7
+    alpha = np.rint(np.take_along_axis(palette, indices.astype(np.intp), axis=1))
+    return _from_blocks(np.concatenate([colors, alpha[:, :, None]], axis=2).astype(np.uint8), width, height)
@@ -0,0 +1,146 @@
+"""
+Bounding volumes and view-frustum tests for culling.
+"""
+
+import numpy as np
+from utils.transformations import glm_to_array
+
+
+def matrix_rows(matrix):
+    """glm mat4 or flat column-major array -> 4x4 numpy matrix indexed [row, column]."""
+    return glm_to_array(matrix).reshape(4, 4).T
+
+
+class BoundingBox:
+    """Axis-aligned bounding box given by its minimum and maximum corners."""
+    
+    def __init__(self, minimum, maximum):
+        self.minimum = np.asarray(minimum, dtype=np.float32)
+        self.maximum = np.asarray(maximum, dtype=np.float32)
+    
+    @classmethod
+    def from_points(cls, points):
+        """Smallest box around an (n, 3) array of points."""
+        points = np.asarray(points, dtype=np.float32).reshape(-1, 3)
+        return cls(points.min(axis=0), points.max(axis=0))
+    
+    @classmethod
+    def union(cls, boxes):
+        """Smallest box around several boxes."""
+        return cls(np.min([box.minimum for box in boxes], axis=0), np.max([box.maximum for box in boxes], axis=0))
+    
+    @property
+    def center(self):
+        return (self.minimum + self.maximum) * 0.5
+    
+    @property
+    def extents(self):
+        """Half the size along each axis."""
+        return (self.maximum - self.minimum) * 0.5
+    
+    def translated(self, offset):
+        offset = np.asarray(offset, dtype=np.float32)
+        return BoundingBox(self.minimum + offset, self.maximum + offset)
+    
+    def transformed(self, matrix):
+        """Box around this box after an affine transform (glm mat4), e.g. a model matrix."""
+        rows = matrix_rows(matrix)
+        linear = rows[:3, :3]
+        center = linear @ self.center + rows[:3, 3]
+        extents = np.abs(linear) @ self.extents
+        return BoundingBox(center - extents, center + extents)
+    
+    def __repr__(self):
+        return f"BoundingBox({self.minimum.tolist()}, {self.maximum.tolist()})"
+
+
+class BoundingSphere:
+    """Sphere given by its center and radius."""
+    
+    def __init__(self, center, radius):
+        self.center = np.asarray(center, dtype=np.float32)
+        self.radius = float(radius)
+    
+    @classmethod
+    def from_points(cls, points):
+        """Sphere around an (n, 3) array of points, centered on their bounding box."""
+        points = np.asarray(points, dtype=np.float32).reshape(-1, 3)
+        center = (points.min(axis=0) + points.max(axis=0)) * 0.5
+        return cls(center, np.sqrt(((points - center) ** 2).sum(axis=1).max()))
+    
+    def transformed(self, matrix):
+        """Sphere around this sphere after an affine transform; the radius grows with the largest scale."""
+        rows = matrix_rows(matrix)
+        linear = rows[:3, :3]
+        scale = np.sqrt((linear * linear).sum(axis=0)).max()
+        return BoundingSphere(linear @ self.center + rows[:3, 3], self.radius * scale)
+    
+    def __repr__(self):
+        return f"BoundingSphere({self.center.tolist()}, {self.radius})"
+
+
+class Frustum:
+    """The six planes of a view frustum, pointing inwards, as rows of (a, b, c, d).
+    
+    A point p is inside a plane when a*x + b*y + c*z + d >= 0. Every test
+    is conservative: a volume crossing the frustum boundary counts as
+    visible. The drawn/culled counters record the results of is_visible and
+    visible_boxes, so a frustum built each frame counts that frame's objects.
+    """
+    
+    def __init__(self, planes):
+        self.planes = np.asarray(planes, dtype=np.float32)
+        self.drawn = 0
+        self.culled = 0
+    
+    @classmethod
+    def from_matrix(cls, view_projection):
+        """Extract the planes from a projection * view matrix (Gribb-Hartmann)."""
+        rows = matrix_rows(view_projection).astype(np.float64)
+        planes = np.array([
+            rows[3] + rows[0],  # Left
+            rows[3] - rows[0],  # Right
+            rows[3] + rows[1],  # Bottom
+            rows[3] - rows[1],  # Top
+            rows[3] + rows[2],  # Near
+            rows[3] - rows[2],  # Far
+        ])
+        planes /= np.linalg.norm(planes[:, :3], axis=1, keepdims=True)
+        return cls(planes)
+    
+    def intersects_sphere(self, sphere):
+        distances = self.planes[:, :3] @ sphere.center + self.planes[:, 3]
+        return bool((distances >= -sphere.radius).all())
+    
+    def intersects_box(self, box):
+        center, extents = box.center, box.extents
+        # Distance of the box corner furthest along each plane normal
+        distances = self.planes[:, :3] @ center + self.planes[:, 3] + np.abs(self.planes[:, :3]) @ extents
+        return bool((distances >= 0).all())
+    
+    def is_visible(self, bounds):
+        """Test a BoundingBox or BoundingSphere and count the result; None is always visible."""
+        if bounds is None:
+            visible = True
+        elif isinstance(bounds, BoundingSphere):
+            visible = self.intersects_sphere(bounds)
+        else:
+            visible = self.intersects_box(bounds)
+        if visible:
+            self.drawn += 1
+        else:
+            self.culled += 1
+        return visible
+    
+    def visible_boxes(self, centers, extents):
+        """Test many boxes at once from (n, 3) centers and extents; returns a boolean mask."""
+        distances = centers @ self.planes[:, :3].T + self.planes[:, 3] + extents @ np.abs(self.planes[:, :3]).T
+        visible = (distances >= 0).all(axis=1)
+        self.count(visible)
+        return visible
+    
+    def count(self, visible):
+        """Add a visibility mask to the counters, e.g. one from an earlier frame that is still valid."""
+        drawn = int(visible.sum())
+        self.drawn += drawn
+        self.culled += len(visible) - drawn
@@ -0,0 +1,293 @@
+"""
+Procedural textures computed as NumPy array kernels.
+
+Each generator returns a height x width x channels uint8 array laid out
+like the images the objects used to build pixel by pixel (row 0 first), so
+it can be handed straight to Texture(image=...) or saved as a PNG. For
+clouds, smoke and the ship hull the output at the default sizes is
+identical to the original per-pixel loops; other sizes sample the same
+patterns at a different resolution. Of the file textures, grass, road, rock
+and snow are random and take a seed, while water and concrete are fixed
+patterns that do not. Features grow with the resolution, so a larger bake
+is a sharper copy of the same pattern rather than a busier one.
+"""
+
+import inspect
+import os
+import numpy as np
+from PIL import Image, ImageFilter
+from rendering.mesh_cache import source_hash
+from utils.atomic_write import atomic_write
+
+
+def _reference_grid(width, height, reference):
+    """Column and row positions of every pixel on a reference x reference grid."""
+    ref_x = np.arange(width) * reference // width
+    ref_y = np.arange(height)[:, None] * reference // height
+    return ref_x, ref_y
+
+
+def _scatter(rng, count, width, height):
+    """Random top-left pixel positions for count features."""
+    return rng.integers(0, width, count), rng.integers(0, height, count)
+
+
+def _stamp_squares(data, x, y, sizes, colors):
+    """Paint a size x size square per feature with its top-left corner at (x, y).
+    
+    Where squares overlap, which one ends up on top is not defined.
+    """
+    if len(x) == 0:
+        return
+    height, width = data.shape[:2]
+    sizes = np.broadcast_to(sizes, x.shape)
+    colors = np.broadcast_to(colors, x.shape + (data.shape[2],))
+    for dx in range(sizes.max()):
+        for dy in range(sizes.max()):
+            inside = (dx < sizes) & (dy < sizes) & (x + dx < width) & (y + dy < height)
+            data[y[inside] + dy, x[inside] + dx] = colors[inside]
+
+
+def cloud_pixels(width=256, height=256, octaves=4):
+    """White RGBA cloud texture whose alpha is sine-hash fractal noise."""
+    x = np.arange(width, dtype=np.float64) / width
+    y = np.arange(height, dtype=np.float64)[:, None] / height
+    
+    noise = np.zeros((height, width), dtype=np.float64)
+    frequency = 1.0
+    amplitude = 1.0
+    max_amplitude = 0.0
+    for _ in range(octaves):
+        # Sine-based pseudo-random noise, same operation order as the scalar version
+        noise_val = np.sin((x * frequency) * 12.9898 + (y * frequency) * 78.233) * 43758.5453
+        noise_val = noise_val - np.floor(noise_val)
+        
+        # Smooth interpolation
+        noise_val = noise_val * noise_val * (3.0 - 2.0 * noise_val)
+        
+        noise += noise_val * amplitude
+        max_amplitude += amplitude
+        
+        frequency *= 2.0
+        amplitude *= 0.5
+    
+    noise = noise / max_amplitude
+    
+    data = np.full((height, width, 4), 255, dtype=np.uint8)
+    data[..., 3] = (255 * np.maximum(0, noise - 0.3)).astype(np.uint8)
+    return data
+
+
+def smoke_pixels(width=128, height=128):
+    """Light gray RGBA smoke puff with a quadratic radial alpha falloff."""
+    center_x, center_y = width / 2, height / 2
+    max_dist = np.sqrt((width / 2) ** 2 + (height / 2) ** 2)
+    
+    dx = np.arange(width, dtype=np.float64) - center_x
+    dy = np.arange(height, dtype=np.float64)[:, None] - center_y
+    dist = np.sqrt(dx * dx + dy * dy)
+    falloff = np.maximum(0, 1.0 - (dist / max_dist))
+    
+    data = np.full((height, width, 4), 220, dtype=np.uint8)
+    data[..., 3] = (255 * falloff * falloff).astype(np.uint8)
+    return data
+
+
+def ship_hull_pixels(width=256, height=256):
+    """RGB ship hull: white paint, a band of dark windows and a wood trim line.
+    
+    The layout is defined on a 256x256 grid and scaled to the requested size.
+    """
+    ref_x, ref_y = _reference_grid(width, height, 256)
+    
+    data = np.empty((height, width, 3), dtype=np.uint8)
+    data[:] = (240, 240, 240)  # White hull
+    
+    # Windows (dark blue glass), spaced every 30 reference pixels
+    windows = (ref_y >= 80) & (ref_y < 140) & ((ref_x // 30) % 2 == 0)
+    data[windows] = (20, 20, 40)
+    
+    # Wood trim at the bottom
+    trim = (ref_y >= 230) & (ref_y < 240)
+    data[np.broadcast_to(trim, (height, width))] = (139, 69, 19)
+    return data
+
+
+def grass_pixels(width=256, height=256, seed=0):
+    """Green RGB grass with short vertical blades and dark spots."""
+    rng = np.random.default_rng(seed)
+    scale = max(1, round(min(width, height) / 256))
+    data = np.empty((height, width, 3), dtype=np.uint8)
+    data[:] = (100, 200, 100)
+    
+    # Grass blades: vertical strokes of random length
+    x, y = _scatter(rng, 500, width, height)
+    lengths = rng.integers(5, 16, 500)
+    colors = np.where(rng.random(500)[:, None] > 0.5, (80, 180, 80), (120, 220, 120))
+    for step in range(lengths.max()):
+        blade = step < lengths
+        _stamp_squares(data, x[blade], y[blade] + step * scale, scale, colors[blade])
+    
+    # Dark spots
+    x, y = _scatter(rng, 100, width, height)
+    _stamp_squares(data, x, y, scale, (60, 140, 60))
+    return data
+
+
+def road_pixels(width=256, height=256, seed=0):
+    """Gray RGB asphalt with faint lengthwise lines and random spots."""
+    rng = np.random.default_rng(seed)
+    scale = max(1, round(min(width, height) / 256))
+    ref_x, _ = _reference_grid(width, height, 256)
+    data = np.empty((height, width, 3), dtype=np.uint8)
+    data[:] = (80, 80, 80)
+    data[:, ref_x % 20 == 0] = (120, 120, 120)
+    
+    x, y = _scatter(rng, 200, width, height)
+    colors = np.where(rng.random(200)[:, None] > 0.5, (100, 100, 100), (60, 60, 60))
+    _stamp_squares(data, x, y, scale, colors)
+    return data
+
+
+def water_pixels(width=256, height=256):
+    """Blue RGB water made of a checkered pattern of small tiles."""
+    ref_x, ref_y = _reference_grid(width, height, 256)
+    data = np.empty((height, width, 3), dtype=np.uint8)
+    data[:] = (80, 130, 255)
+    
+    # 9x9 tiles on a 10 pixel grid; the gaps keep the base color
+    tile = (ref_x % 10 <= 8) & (ref_y % 10 <= 8)
+    light = (ref_x // 10 * 10 + ref_y // 10 * 10) % 20 == 0
+    data[tile & light] = (100, 150, 255)
+    data[tile & ~light] = (60, 110, 240)
+    return data
+
+
+def concrete_pixels(width=256, height=256):
+    """Light gray RGB concrete with a square grid of joints."""
+    ref_x, ref_y = _reference_grid(width, height, 256)
+    data = np.empty((height, width, 3), dtype=np.uint8)
+    data[:] = (180, 180, 180)
+    data[(ref_x % 15 == 0) | (ref_y % 15 == 0)] = (160, 160, 160)
+    return data
+
+
+def rock_pixels(width=512, height=512, seed=0):
+    """Blurred RGB rock: gray speckles, mineral deposits and thin cracks."""
+    rng = np.random.default_rng(seed)
+    scale = max(1, round(min(width, height) / 512))
+    data = np.empty((height, width, 3), dtype=np.uint8)
+    data[:] = (120, 120, 120)
+    
+    # Speckles in one of the base grays, some turned brown or green
+    base_colors = np.array([(100, 100, 100), (130, 130, 130), (80, 80, 80), (150, 150, 150)])
+    x, y = _scatter(rng, 10000, width, height)
+    colors = base_colors[rng.integers(0, len(base_colors), 10000)]
+    brown = rng.random(10000) < 0.1
+    green = ~brown & (rng.random(10000) < 0.05)
+    colors[brown] = (140, 120, 100)
+    colors[green] = (100, 140, 120)
+    _stamp_squares(data, x, y, rng.integers(1, 4, 10000) * scale, colors)
+    
+    # Cracks: horizontal lines that wander up and down by a pixel per step
+    x, y = _scatter(rng, 50, width, height)
+    lengths = rng.integers(10, 31, 50)
+    for step in range(lengths.max()):
+        crack = step < lengths
+        crack_y = y[crack] + rng.integers(-1, 2, crack.sum()) * scale
+        inside = crack_y >= 0
+        _stamp_squares(data, x[crack][inside] + step * scale, crack_y[inside], scale, (60, 60, 60))
+    
+    # Blur for a more natural look
+    image = Image.fromarray(data).filter(ImageFilter.GaussianBlur(scale))
+    return np.asarray(image, dtype=np.uint8)
+
+
+def snow_pixels(width=256, height=256, seed=0):
+    """Bluish white RGB snow with brighter and darker flecks."""
+    rng = np.random.default_rng(seed)
+    scale = max(1, round(min(width, height) / 256))
+    data = np.empty((height, width, 3), dtype=np.uint8)
+    data[:] = (240, 240, 255)
+    
+    x, y = _scatter(rng, 2000, width, height)
+    colors = np.where(rng.random(2000)[:, None] < 0.3, (255, 255, 255), (230, 230, 245))
+    _stamp_squares(data, x, y, scale, colors)
+    return data
+
+
+class ProceduralTextures:
+    """Named procedural textures, optionally cached on disk as .npy files."""
+    
+    # name -> (generator, default width, default height)
+    GENERATORS = {
+        "cloud": (cloud_pixels, 256, 256),
+        "smoke": (smoke_pixels, 128, 128),
+        "ship_hull": (ship_hull_pixels, 256, 256),
+        "grass": (grass_pixels, 256, 256),
+        "road": (road_pixels, 256, 256),
+        "water": (water_pixels, 256, 256),
+        "concrete": (concrete_pixels, 256, 256),
+        "rock": (rock_pixels, 512, 512),
+        "snow": (snow_pixels, 256, 256),
+    }
+    # Directory for baked textures; None bakes in memory every time
+    cache_dir = None
+    hits = 0
+    misses = 0
+    
+    @classmethod
+    def takes_seed(cls, name):
+        """Whether the named generator is random and accepts a seed."""
+        generator = cls.GENERATORS[name][0]
+        return "seed" in inspect.signature(generator).parameters
+    
+    @classmethod
+    def generate(cls, name, width=None, height=None, seed=None):
+        """Run the named generator; width/height default to the size the objects have always used."""
+        if name not in cls.GENERATORS:
+            raise Exception(f"Unknown procedural texture: {name}")
+        generator, default_width, default_height = cls.GENERATORS[name]
+        if seed is None:
+            return generator(width or default_width, height or default_height)
+        if not cls.takes_seed(name):
+            raise Exception(f"Procedural texture {name} does not take a seed")
+        return generator(width or default_width, height or default_height, seed=seed)
+    
+    @classmethod
+    def cache_path(cls, name, width, height, seed=None, cache_dir=None):
+        """Cache file of a bake, named after the generator's source hash so editing a kernel bakes again."""
+        seed_suffix = "" if seed is None else f"-s{seed}"
+        kernel = source_hash(cls.GENERATORS[name][0])[:12]
+        return os.path.join(cache_dir or cls.cache_dir,
+                            f"{name}-{width}x{height}{seed_suffix}-{kernel}.npy")
+    
+    @classmethod
+    def bake(cls, name, width=None, height=None, seed=None, cache_dir=None):
+        """Return the pixels of a named texture, from the disk cache when possible."""
+        if name not in cls.GENERATORS:
+            raise Exception(f"Unknown procedural texture: {name}")
+        _, default_width, default_height = cls.GENERATORS[name]
+        width = width or default_width
+        height = height or default_height
+        
+        cache_dir = cache_dir or cls.cache_dir
+        if cache_dir is None:
+            return cls.generate(name, width, height, seed)
+        
+        path = cls.cache_path(name, width, height, seed, cache_dir)
+        try:
+            pixels = np.load(path)
+            cls.hits += 1
+            return pixels
+        except (OSError, ValueError):
+            pass
+        
+        pixels = cls.generate(name, width, height, seed)
+        cls.misses += 1
+        try:
+            with atomic_write(path) as file:
+                np.save(file, pixels)
+        except OSError as e:
+            print(f"⚠️  Could not cache procedural texture {name}: {e}")
+        return pixels
@@ -5,14 +5,25 @@ Utility functions for common transformations and matrix operations.
 import numpy as np
 import glm
 
+def matrix_bytes(matrix):
+    """Return the raw column-major float32 bytes of a glm matrix or numpy array.
+    
+    glm matrices already store their elements column-major, which is the
+    layout glUniformMatrix4fv expects with transpose=GL_FALSE, so their
+    storage is copied out in one call instead of element by element. The
+    bytes can be passed straight to GL and double as a cache key.
+    """
+    if isinstance(matrix, bytes):
+        return matrix
+    if isinstance(matrix, np.ndarray):
+        if matrix.dtype != np.float32:
+            matrix = matrix.astype(np.float32)
+        return matrix.tobytes()
+    return matrix.to_bytes()
+
 def glm_to_array(matrix):
     """Convert glm matrix to numpy array for PyOpenGL."""
-    # Manual conversion - extract each element from the glm matrix
-    arr = np.zeros(16, dtype=np.float32)
-    for i in range(4):
-        for j in range(4):
-            arr[i*4 + j] = matrix[i][j]
-    return arr
+    return np.frombuffer(matrix_bytes(matrix), dtype=np.float32)
 
 def create_model_matrix(position=(0, 0, 0), rotation=(0, 0, 0), scale=(1, 1, 1)):
     """Create model matrix with position, rotation, and scale."""
@@ -30,7 +41,8 @@ def create_model_matrix(position=(0, 0, 0), rotation=(0, 0, 0), scale=(1, 1, 1))
     # Scale
     model = glm.scale(model, glm.vec3(scale))
     
-    return glm_to_array(model)
+    # Returned as glm; Shader.set_mat4 uploads its storage directly
+    return model
 
 def create_view_matrix(camera_pos, camera_front, camera_up):
     """Create view matrix for camera."""
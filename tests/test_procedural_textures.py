@@ -0,0 +1,154 @@
+"""
+Golden tests: the NumPy texture kernels against the per-pixel loops they replaced.
+
+The reference generators below are the original loops from clouds.py,
+smoke.py and ship.py, kept verbatim (including the smoke loop's unused
+intensity term), so any change to a kernel's output shows up byte for byte.
+"""
+
+import math
+import os
+import sys
+
+import numpy as np
+from PIL import Image
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from rendering.mesh_cache import source_hash
+from utils.procedural_textures import ProceduralTextures, cloud_pixels, ship_hull_pixels, smoke_pixels
+
+
+def reference_cloud_texture():
+    """Original generate_cloud_texture from objects/clouds.py."""
+    width, height = 256, 256
+    data = np.zeros((height, width, 4), dtype=np.uint8)
+    
+    # Create cloud-like noise pattern
+    for y in range(height):
+        for x in range(width):
+            # Multiple layers of noise for natural cloud look
+            noise = 0.0
+            frequency = 1.0
+            amplitude = 1.0
+            max_amplitude = 0.0
+            
+            for i in range(4):
+                # Sine-based pseudo-random noise
+                nx = (x / width) * frequency
+                ny = (y / height) * frequency
+                
+                noise_val = math.sin(nx * 12.9898 + ny * 78.233) * 43758.5453
+                noise_val = noise_val - math.floor(noise_val)
+                
+                # Smooth interpolation
+                noise_val = noise_val * noise_val * (3.0 - 2.0 * noise_val)
+                
+                noise += noise_val * amplitude
+                max_amplitude += amplitude
+                
+                frequency *= 2.0
+                amplitude *= 0.5
+            
+            noise = noise / max_amplitude
+            
+            # Convert to cloud color (white/light gray)
+            intensity = int(255 * max(0, noise - 0.3))
+            
+            data[y, x] = [255, 255, 255, intensity]
+    
+    image = Image.fromarray(data, 'RGBA')
+    return image
+
+
+def reference_smoke_texture():
+    """Original generate_smoke_texture from objects/smoke.py."""
+    width, height = 128, 128
+    data = np.zeros((height, width, 4), dtype=np.uint8)
+    
+    # Create smoke-like radial gradient
+    center_x, center_y = width / 2, height / 2
+    max_dist = math.sqrt((width/2)**2 + (height/2)**2)
+    
+    for y in range(height):
+        for x in range(width):
+            # Distance from center
+            dx = x - center_x
+            dy = y - center_y
+            dist = math.sqrt(dx*dx + dy*dy)
+            
+            # Create radial falloff for smoke puff
+            falloff = max(0, 1.0 - (dist / max_dist))
+            
+            # Add some noise variation
+            noise = math.sin(x * 0.1) * math.cos(y * 0.1) * 0.3 + 0.7
+            
+            # Smoke color (light gray/white)
+            intensity = int(200 * falloff * noise)
+            alpha = int(255 * falloff * falloff)  # Quadratic falloff for alpha
+            
+            data[y, x] = [220, 220, 220, alpha]
+    
+    image = Image.fromarray(data, 'RGBA')
+    return image
+
+
+def reference_ship_texture():
+    """Original Ship._create_ship_texture from objects/ship.py."""
+    width, height = 256, 256
+    img = Image.new('RGB', (width, height), (240, 240, 240))  # White hull
+    pixels = img.load()
+    
+    # Draw windows (dark blue glass)
+    for y in range(80, 140):
+        for x in range(width):
+            if (x // 30) % 2 == 0:  # Spaced windows
+                pixels[x, y] = (20, 20, 40)  # Dark blue
+    
+    # Add wood trim at bottom
+    for y in range(230, 240):
+        for x in range(width):
+            pixels[x, y] = (139, 69, 19)  # Wood brown
+    
+    return img
+
+
+def assert_identical(pixels, reference):
+    reference = np.asarray(reference)
+    assert pixels.dtype == np.uint8
+    assert pixels.shape == reference.shape
+    assert pixels.tobytes() == reference.tobytes()
+
+
+def test_cloud_matches_loop():
+    assert_identical(cloud_pixels(), reference_cloud_texture())
+
+
+def test_smoke_matches_loop():
+    assert_identical(smoke_pixels(), reference_smoke_texture())
+
+
+def test_ship_hull_matches_loop():
+    assert_identical(ship_hull_pixels(), reference_ship_texture())
+
+
+def test_generate_defaults_match_loops():
+    """ProceduralTextures.generate at the default sizes is what the objects upload."""
+    assert_identical(ProceduralTextures.generate("cloud"), reference_cloud_texture())
+    assert_identical(ProceduralTextures.generate("smoke"), reference_smoke_texture())
+    assert_identical(ProceduralTextures.generate("ship_hull"), reference_ship_texture())
+
+
+def test_fixed_patterns_take_no_seed():
+    assert not ProceduralTextures.takes_seed("water")
+    assert not ProceduralTextures.takes_seed("concrete")
+    assert ProceduralTextures.takes_seed("grass")
+
+
+def test_cache_path_follows_kernel_source(tmp_path):
+    path = ProceduralTextures.cache_path("rock", 64, 64, 3, str(tmp_path))
+    assert os.path.basename(path) == f"rock-64x64-s3-{source_hash(ProceduralTextures.GENERATORS['rock'][0])[:12]}.npy"
+    
+    pixels = ProceduralTextures.bake("rock", 64, 64, 3, str(tmp_path))
+    assert os.path.exists(path)
+    assert ProceduralTextures.bake("rock", 64, 64, 3, str(tmp_path)).tobytes() == pixels.tobytes()